@@ -0,0 +1,206 @@
+# async_views.py
+"""
+Versões assíncronas (async def) das leituras e do enfileiramento de
+importações, usadas quando a aplicação roda sob ASGI (ASYNC_VIEWS, ativado
+pelo backend/asgi.py; veja api/urls.py).
+
+Usam o ORM e o cache assíncronos do Django, com a mesma validação,
+paginação e serialização das views do DRF em views.py, então uma requisição
+esperando o banco não ocupa uma thread do servidor. O DRF não executa views
+assíncronas: autenticação (JWT), respostas de erro no formato do DRF e
+renderização (orjson) ficam no decorator async_api_view. A API navegável do
+DRF não está disponível nestas rotas.
+"""
+import json
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException, MethodNotAllowed, NotAuthenticated, NotFound, ParseError
+
+from base.authentication import CachedJWTAuthentication
+from base.indicators import aget_cached_indicators
+from base.jobs import aenqueue_import
+from base.models import ASTEROID_FIELDS, Asteroid, CloseApproach, ImportJob
+from base.routers import replica_reads
+from base.windows import aget_cached_window_indicators
+
+from . import views
+from .pagination import KeysetPagination
+from .renderers import FastJSONRenderer, serialized
+from .serializers import (
+    AsteroidBatchSerializer, AsteroidFilterSerializer, AsteroidValuesSerializer, CloseApproachFilterSerializer,
+    CloseApproachListSerializer, ImportJobSerializer, IndicatorsWindowSerializer,
+)
+
+# Atributos da view do DRF equivalente lidos pelo drf-spectacular (cls, initkwargs)
+# e pelo resolver (view_class): a documentação e os rótulos das métricas
+# ficam iguais nos dois modos.
+DRF_VIEW_ATTRIBUTES = ('cls', 'initkwargs', 'view_class', 'view_initkwargs')
+
+_authenticator = CachedJWTAuthentication()
+_renderer = FastJSONRenderer()
+
+
+def render(data, status_code=status.HTTP_200_OK):
+    return HttpResponse(_renderer.render(data), status=status_code, content_type='application/json')
+
+
+def error_response(request, exc):
+    """Resposta de uma APIException, no mesmo formato do exception handler do DRF."""
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+    response = render(data, exc.status_code)
+    if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+        response['WWW-Authenticate'] = _authenticator.authenticate_header(request)
+    return response
+
+
+def async_api_view(methods, drf_view):
+    """
+    Decorator das views assíncronas: aceita apenas `methods`, exige um token
+    JWT válido (request.user e request.auth) e converte APIException em
+    resposta. `drf_view` é a view do DRF com o mesmo contrato.
+    """
+    def decorator(func):
+        async def view(request, *args, **kwargs):
+            try:
+                if request.method not in methods:
+                    raise MethodNotAllowed(request.method)
+                authenticated = await _authenticator.aauthenticate(request)
+                if authenticated is None:
+                    raise NotAuthenticated()
+                request.user, request.auth = authenticated
+                return await func(request, *args, **kwargs)
+            except APIException as exc:
+                return error_response(request, exc)
+
+        view.__name__ = func.__name__
+        view.__qualname__ = func.__qualname__
+        view.__doc__ = func.__doc__
+        for name in DRF_VIEW_ATTRIBUTES:
+            setattr(view, name, getattr(drf_view, name))
+        # Autenticação apenas por token, como nas views do DRF
+        return csrf_exempt(view)
+    return decorator
+
+
+@async_api_view(['GET'], views.getData)
+@replica_reads
+async def getData(request):
+    filters = AsteroidFilterSerializer(data=request.GET)
+    if not filters.is_valid():
+        return render({"error": "Parâmetros de filtro inválidos.", "details": filters.errors},
+                      status.HTTP_400_BAD_REQUEST)
+    items = filters.filter_queryset(Asteroid.objects.all())
+
+    fields = views.parse_fields_param(request) or ASTEROID_FIELDS
+    paginator = KeysetPagination(ordering=filters.get_ordering())
+    # Os campos da ordenação são necessários para montar os cursores
+    ordering_fields = [name.lstrip('-') for name in paginator.ordering if name.lstrip('-') not in fields]
+
+    page = await paginator.apaginate_queryset(items.values(*fields, *ordering_fields), request)
+    serializer = AsteroidValuesSerializer(page, many=True, fields=fields)
+    return render(paginator.get_paginated_data(serialized(serializer)))
+
+
+async def asteroid_details(ids):
+    """Mesmo caminho de views.asteroid_details, com o ORM assíncrono."""
+    asteroids = [asteroid async for asteroid in views.asteroid_details_queryset(ids)]
+    return views.serialize_asteroid_details(asteroids, ids)
+
+
+@async_api_view(['GET'], views.getAsteroidInfo)
+@replica_reads
+async def getAsteroidInfo(request, id):
+    results, missing = await asteroid_details([id])
+    if missing:
+        raise NotFound("Não encontrado.")
+    return render(results[0])
+
+
+@async_api_view(['GET', 'POST'], views.getAsteroidBatch)
+@replica_reads
+async def getAsteroidBatch(request):
+    batch = AsteroidBatchSerializer(data=_request_data(request) if request.method == 'POST' else request.GET)
+    if not batch.is_valid():
+        return render({"error": "Parâmetros inválidos.", "details": batch.errors}, status.HTTP_400_BAD_REQUEST)
+    results, missing = await asteroid_details(batch.validated_data['ids'])
+    return render({"results": results, "missing_ids": missing})
+
+
+@async_api_view(['GET'], views.getCloseApproaches)
+@replica_reads
+async def getCloseApproaches(request):
+    filters = CloseApproachFilterSerializer(data=request.GET)
+    if not filters.is_valid():
+        return render({"error": "Parâmetros de filtro inválidos.", "details": filters.errors},
+                      status.HTTP_400_BAD_REQUEST)
+    items = filters.filter_queryset(CloseApproach.objects.select_related('asteroid__neo'))
+
+    paginator = KeysetPagination(ordering=('approach_at', 'id'))
+    page = await paginator.apaginate_queryset(items, request)
+    return render(paginator.get_paginated_data(serialized(CloseApproachListSerializer(page, many=True))))
+
+
+@async_api_view(['GET'], views.getIndicators)
+@replica_reads
+async def getIndicators(request):
+    window = IndicatorsWindowSerializer(data=request.GET)
+    if not window.is_valid():
+        return render({"error": "Parâmetros do intervalo inválidos.", "details": window.errors},
+                      status.HTTP_400_BAD_REQUEST)
+    if window.validated_data:
+        entry = await aget_cached_window_indicators(window.validated_data.get('start_date'),
+                                                    window.validated_data.get('end_date'))
+    else:
+        entry = await aget_cached_indicators()
+    not_modified = get_conditional_response(request, etag=entry['etag'], last_modified=entry['last_modified'])
+    response = not_modified or render(entry['data'])
+    response['ETag'] = entry['etag']
+    response['Last-Modified'] = http_date(entry['last_modified'])
+    # O cliente pode guardar a resposta, mas deve revalidar (If-None-Match) a cada uso
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def _request_data(request):
+    if request.content_type == 'application/json':
+        try:
+            return json.loads(request.body or b'{}')
+        except ValueError as e:
+            raise ParseError(f"JSON parse error - {e}")
+    return request.POST
+
+
+@async_api_view(['POST'], views.importData)
+async def importData(request):
+    serializer = views.ImportDataSerializer(data=_request_data(request))
+    if not serializer.is_valid():
+        return render({"error": "Formato de data inválido. Use YYYY-MM-DD.", "details": serializer.errors},
+                      status.HTTP_400_BAD_REQUEST)
+
+    job = await aenqueue_import(
+        serializer.validated_data['start_date'],
+        serializer.validated_data['end_date'],
+        requested_by=request.user,
+    )
+    return render(
+        {
+            "message": "Importação enfileirada.",
+            "job_id": job.pk,
+            "status": job.status,
+            "status_url": request.build_absolute_uri(f"/importar/{job.pk}/"),
+        },
+        status.HTTP_202_ACCEPTED,
+    )
+
+
+@async_api_view(['GET'], views.getImportJob)
+async def getImportJob(request, job_id):
+    job = await ImportJob.objects.filter(pk=job_id).afirst()
+    if job is None:
+        # Mesma mensagem do get_object_or_404 da view síncrona
+        raise NotFound(f"No {ImportJob._meta.object_name} matches the given query.")
+    return render(serialized(ImportJobSerializer(job)))
@@ -0,0 +1,74 @@
+# export.py
+"""
+Exportação da tabela de asteroides em NDJSON ou CSV.
+
+As linhas são lidas com um cursor do lado do servidor (`.iterator()` sobre
+`values_list`, sem instanciar modelos nem serializers) e enviadas em blocos
+por uma StreamingHttpResponse, então a memória do worker fica constante,
+independente do tamanho da tabela.
+"""
+import csv
+import io
+import json
+
+from django.conf import settings
+
+from base.models import ASTEROID_FIELDS
+
+EXPORT_FIELDS = ASTEROID_FIELDS
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+def _rows(queryset):
+    if not queryset.ordered:
+        queryset = queryset.order_by('imported_date', 'id')
+    return (
+        queryset
+        .values_list(*EXPORT_FIELDS)
+        .iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+    )
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def stream_ndjson(queryset):
+    date_index = EXPORT_FIELDS.index('imported_date')
+    for batch in _batches(_rows(queryset), settings.EXPORT_CHUNK_SIZE):
+        lines = []
+        for row in batch:
+            row = list(row)
+            row[date_index] = row[date_index].isoformat()
+            lines.append(json.dumps(dict(zip(EXPORT_FIELDS, row))))
+        yield '\n'.join(lines) + '\n'
+
+
+def stream_csv(queryset):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for batch in _batches(_rows(queryset), settings.EXPORT_CHUNK_SIZE):
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+STREAMS = {
+    'ndjson': stream_ndjson,
+    'csv': stream_csv,
+}
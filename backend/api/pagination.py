@@ -0,0 +1,162 @@
+# pagination.py
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination:
+    """
+    Paginação por chave (keyset/cursor) sobre uma ordenação única e estável.
+
+    Em vez de OFFSET, cada página continua a partir dos valores da última linha
+    da página anterior: WHERE a >= x AND (a > x OR (a = x AND b > y))
+    ORDER BY a, b LIMIT n, o equivalente a (a, b) > (x, y) que também vale
+    para ordenações com sentidos mistos. O limite sozinho na primeira coluna
+    (a >= x) é o que permite ao banco começar a varredura do índice da
+    ordenação na posição do cursor, então o custo de qualquer página é o de uma
+    busca no índice. Os cursores são opacos: base64 de um JSON com a ordenação,
+    a posição e o sentido.
+
+    Aceita requisições do DRF ou do Django (views assíncronas, com
+    apaginate_queryset e get_paginated_data).
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = "Cursor inválido."
+
+    def __init__(self, ordering=('imported_date', 'id')):
+        self.ordering = tuple(ordering)
+        self.page_size = settings.ASTEROIDS_PAGE_SIZE
+        self.max_page_size = settings.ASTEROIDS_MAX_PAGE_SIZE
+
+    # Cursores
+
+    def encode_cursor(self, position, reverse=False):
+        payload = json.dumps({'o': self.ordering, 'p': position, 'r': reverse}, separators=(',', ':'), default=str)
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.GET.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)))
+            ordering, position, reverse = tuple(payload['o']), payload['p'], bool(payload['r'])
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        # Um cursor só vale para a ordenação em que foi gerado
+        if ordering != self.ordering or not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def get_page_size(self, request):
+        value = request.GET.get(self.page_size_query_param)
+        if value is None:
+            return self.page_size
+        try:
+            page_size = int(value)
+        except ValueError:
+            page_size = 0
+        if not 1 <= page_size <= self.max_page_size:
+            raise ValidationError({self.page_size_query_param: f"Use um inteiro entre 1 e {self.max_page_size}."})
+        return page_size
+
+    # Consulta
+
+    def _field(self, queryset, name):
+        name = name.lstrip('-')
+        # Anotações (como os campos do NearEarthObject em Asteroid.objects) usam o campo de origem
+        if name in queryset.query.annotations:
+            return queryset.query.annotations[name].output_field
+        return queryset.model._meta.get_field(name)
+
+    def _after(self, queryset, position, reverse):
+        """
+        Filtro para as linhas estritamente depois (ou antes, se reverse) da
+        posição: a comparação lexicográfica, mais o limite inclusivo na
+        primeira coluna, que o índice usa como ponto de partida.
+        """
+        condition = Q()
+        equal = Q()
+        bound = None
+        for name, raw in zip(self.ordering, position):
+            field = self._field(queryset, name)
+            value = field.to_python(raw)
+            descending = name.startswith('-') != reverse
+            lookup = 'lt' if descending else 'gt'
+            name = name.lstrip('-')
+            if bound is None:
+                bound = Q(**{f'{name}__{lookup}e': value})
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return bound & condition
+
+    def _position(self, row):
+        # Aceita instâncias do modelo ou dicionários de .values()
+        if isinstance(row, dict):
+            return [row[name.lstrip('-')] for name in self.ordering]
+        return [getattr(row, name.lstrip('-')) for name in self.ordering]
+
+    def _page_queryset(self, queryset, request):
+        """Consulta da página (uma linha a mais, para saber se há próxima) e o estado para _page()."""
+        self.request = request
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(name[1:] if name.startswith('-') else f'-{name}' for name in ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            try:
+                queryset = queryset.filter(self._after(queryset, position, reverse))
+            except (DjangoValidationError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+        return queryset[:page_size + 1], (page_size, position, reverse)
+
+    def _page(self, rows, page_size, position, reverse):
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        self.next_cursor = self.previous_cursor = None
+        if rows:
+            if has_more or reverse:
+                self.next_cursor = self.encode_cursor(self._position(rows[-1]))
+            if (has_more and reverse) or (position is not None and not reverse):
+                self.previous_cursor = self.encode_cursor(self._position(rows[0]), reverse=True)
+        return rows
+
+    def paginate_queryset(self, queryset, request):
+        queryset, state = self._page_queryset(queryset, request)
+        return self._page(list(queryset), *state)
+
+    async def apaginate_queryset(self, queryset, request):
+        queryset, state = self._page_queryset(queryset, request)
+        return self._page([row async for row in queryset], *state)
+
+    # Resposta
+
+    def _link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_data(self, data):
+        return {
+            'next': self._link(self.next_cursor),
+            'previous': self._link(self.previous_cursor),
+            'results': data,
+        }
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
@@ -0,0 +1,34 @@
+# renderers.py
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from base.metrics import timed
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson está no requirements.txt
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer que usa o orjson (serialização em C) nos endpoints de leitura
+    com listas grandes. Tipos que o orjson não conhece (Decimal, lazy strings
+    etc.) caem no encoder do DRF. Sem o orjson, comporta-se como o JSONRenderer.
+
+    O tempo de codificação entra na fase 'render' da requisição (Server-Timing),
+    tanto nas views síncronas do DRF quanto nas assíncronas, que chamam o
+    renderer diretamente.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed('render'):
+            if orjson is None or data is None:
+                return super().render(data, accepted_media_type, renderer_context)
+            return orjson.dumps(data, default=JSONEncoder().default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def serialized(serializer):
+    """`serializer.data`, com o tempo de serialização somado à fase 'render'."""
+    with timed('render'):
+        return serializer.data
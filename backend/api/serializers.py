@@ -1,11 +1,390 @@
+from datetime import date, timedelta
+from typing import Optional
 from rest_framework import serializers
 from base.models import *
+from base.histograms import HISTOGRAM_FIELDS, MAX_BINS
+from base.leaderboards import LEADERBOARD_METRICS, MAX_K
+from base.windows import MAX_ROLLING_WINDOW, MAX_SERIES_DAYS
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import models
+from django.utils import timezone
 
 class AsteroidSerializer(serializers.ModelSerializer):
+    """
+    Aceita `fields` (lista de nomes) para devolver apenas parte dos campos,
+    como em AsteroidSerializer(items, many=True, fields=['id', 'name']).
+    Os campos do NearEarthObject vêm das anotações de Asteroid.objects.
+    """
+    neo_reference_id = serializers.CharField(read_only=True, allow_null=True)
+    name = serializers.CharField(read_only=True)
+    estimated_diameter_min_meters = serializers.FloatField(read_only=True)
+    estimated_diameter_max_meters = serializers.FloatField(read_only=True)
+    absolute_magnitude_h = serializers.FloatField(read_only=True)
+    is_potentially_hazardous_asteroid = serializers.BooleanField(read_only=True)
+    is_sentry_object = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        model = Asteroid
+        fields = ASTEROID_FIELDS
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+class CloseApproachSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CloseApproach
+        fields = ('id', 'approach_at', 'miss_distance_km', 'relative_velocity_km_per_second', 'orbiting_body')
+
+class AsteroidDetailSerializer(AsteroidSerializer):
+    """Asteroide com todas as aproximações (use com prefetch_related('close_approaches'))."""
+    close_approaches = CloseApproachSerializer(many=True, read_only=True)
+
+    class Meta(AsteroidSerializer.Meta):
+        fields = ASTEROID_FIELDS + ['close_approaches']
+
+class AsteroidBatchSerializer(serializers.Serializer):
+    """Ids de GET/POST /asteroides/. Na query string: `ids=1,2,3` (ou `ids` repetido)."""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False,
+        help_text="Ids dos asteroides, na ordem desejada (no máximo ASTEROID_BATCH_MAX_IDS).",
+    )
+
+    def to_internal_value(self, data):
+        if hasattr(data, 'getlist'):
+            data = {'ids': [part for value in data.getlist('ids') for part in value.split(',') if part.strip()]}
+        return super().to_internal_value(data)
+
+    def validate_ids(self, value):
+        if len(value) > settings.ASTEROID_BATCH_MAX_IDS:
+            raise serializers.ValidationError(f"No máximo {settings.ASTEROID_BATCH_MAX_IDS} ids por requisição.")
+        # Ids repetidos são resolvidos uma vez, na primeira posição
+        return list(dict.fromkeys(value))
+
+class AsteroidBatchResultSerializer(serializers.Serializer):
+    """Formato da resposta de GET/POST /asteroides/ (usado apenas na documentação)."""
+    results = AsteroidDetailSerializer(many=True, help_text="Asteroides encontrados, na ordem dos ids pedidos.")
+    missing_ids = serializers.ListField(child=serializers.IntegerField(), help_text="Ids pedidos que não existem.")
+
+class AsteroidValuesSerializer:
+    """
+    Caminho rápido, somente leitura, para asteroides: trabalha com os
+    dicionários de `.values()`, sem instanciar modelos nem passar pelos campos
+    do serializer. Tem a mesma interface de leitura do AsteroidSerializer
+    (`many`, `fields` e `.data`) e aceita um queryset ou linhas já lidas com
+    `.values()`. As datas ficam como `date` e são convertidas pelo renderer.
+    Para escrita continue usando o AsteroidSerializer.
+    """
+    all_fields = ASTEROID_FIELDS
+
+    def __init__(self, instance, many=False, fields=None):
+        self.instance = instance
+        self.many = many
+        self.fields = list(fields) if fields is not None else self.all_fields
+
+    @property
+    def data(self):
+        rows = self.instance
+        if isinstance(rows, models.QuerySet):
+            rows = rows.values(*self.fields)
+            return list(rows) if self.many else rows.get()
+        if not self.many:
+            return {name: rows[name] for name in self.fields}
+        if rows and list(rows[0]) == self.fields:
+            return list(rows)
+        return [{name: row[name] for name in self.fields} for row in rows]
+
+class AsteroidImportSerializer(serializers.Serializer):
+    """
+    Validação das linhas vindas do feed da NASA (campos do NearEarthObject e
+    da observação do dia). A unicidade é resolvida pelos upserts em lote.
+    """
+    neo_reference_id = serializers.CharField(max_length=20)
+    name = serializers.CharField(max_length=255)
+    estimated_diameter_min_meters = serializers.FloatField()
+    estimated_diameter_max_meters = serializers.FloatField()
+    relative_velocity_km_per_second = serializers.FloatField()
+    absolute_magnitude_h = serializers.FloatField()
+    is_potentially_hazardous_asteroid = serializers.BooleanField()
+    is_sentry_object = serializers.BooleanField()
+    imported_date = serializers.DateField()
+
+class AsteroidFilterSerializer(serializers.Serializer):
+    """
+    Filtros e ordenação da listagem e da exportação de asteroides (query string).
+    Cada filtro tem um índice correspondente em base.models.Asteroid ou
+    base.models.NearEarthObject.
+    """
+    ORDERING_FIELDS = [
+        'imported_date',
+        'relative_velocity_km_per_second',
+        'estimated_diameter_max_meters',
+        'absolute_magnitude_h',
+    ]
+    # parâmetro -> (campo, lookup)
+    RANGE_FILTERS = {
+        'start_date': ('imported_date', 'gte'),
+        'end_date': ('imported_date', 'lte'),
+        'min_velocity': ('relative_velocity_km_per_second', 'gte'),
+        'max_velocity': ('relative_velocity_km_per_second', 'lte'),
+        'min_diameter': ('estimated_diameter_max_meters', 'gte'),
+        'max_diameter': ('estimated_diameter_max_meters', 'lte'),
+        'min_magnitude': ('absolute_magnitude_h', 'gte'),
+        'max_magnitude': ('absolute_magnitude_h', 'lte'),
+    }
+
+    imported_date = serializers.DateField(required=False, help_text="Data de importação exata (YYYY-MM-DD).")
+    start_date = serializers.DateField(required=False, help_text="Data de importação inicial, inclusive (YYYY-MM-DD).")
+    end_date = serializers.DateField(required=False, help_text="Data de importação final, inclusive (YYYY-MM-DD).")
+    hazardous = serializers.BooleanField(required=False, allow_null=True, default=None, help_text="Apenas asteroides potencialmente perigosos (true) ou não perigosos (false).")
+    sentry = serializers.BooleanField(required=False, allow_null=True, default=None, help_text="Apenas objetos monitorados pelo Sentry (true) ou não monitorados (false).")
+    min_velocity = serializers.FloatField(required=False, help_text="Velocidade relativa mínima (km/s).")
+    max_velocity = serializers.FloatField(required=False, help_text="Velocidade relativa máxima (km/s).")
+    min_diameter = serializers.FloatField(required=False, help_text="Diâmetro estimado máximo, limite inferior (metros).")
+    max_diameter = serializers.FloatField(required=False, help_text="Diâmetro estimado máximo, limite superior (metros).")
+    min_magnitude = serializers.FloatField(required=False, help_text="Magnitude absoluta (H) mínima.")
+    max_magnitude = serializers.FloatField(required=False, help_text="Magnitude absoluta (H) máxima.")
+    ordering = serializers.ChoiceField(
+        choices=ORDERING_FIELDS + [f'-{name}' for name in ORDERING_FIELDS],
+        default='imported_date',
+        help_text="Campo de ordenação; prefixe com '-' para ordem decrescente. O id desempata."
+    )
+
+    def validate(self, attrs):
+        for low, high in (('start_date', 'end_date'), ('min_velocity', 'max_velocity'),
+                          ('min_diameter', 'max_diameter'), ('min_magnitude', 'max_magnitude')):
+            if low in attrs and high in attrs and attrs[low] > attrs[high]:
+                raise serializers.ValidationError({high: f"Deve ser maior ou igual a '{low}'."})
+        return attrs
+
+    def get_ordering(self):
+        """Ordenação total usada pela paginação: o campo pedido mais o id."""
+        field = self.validated_data['ordering']
+        return (field, '-id' if field.startswith('-') else 'id')
+
+    def filter_queryset(self, queryset):
+        params = self.validated_data
+        if 'imported_date' in params:
+            queryset = queryset.filter(imported_date=params['imported_date'])
+        for param, (field, lookup) in self.RANGE_FILTERS.items():
+            if param in params:
+                queryset = queryset.filter(**{f'{field}__{lookup}': params[param]})
+        if params.get('hazardous') is not None:
+            queryset = queryset.filter(is_potentially_hazardous_asteroid=params['hazardous'])
+        if params.get('sentry') is not None:
+            queryset = queryset.filter(is_sentry_object=params['sentry'])
+        return queryset
+
+class HistogramParamsSerializer(AsteroidFilterSerializer):
+    """Parâmetros de GET /indicadores/histograma/: o campo, as faixas e os mesmos filtros da listagem."""
+    DEFAULT_BINS = 20
+
+    ordering = None
+    field = serializers.ChoiceField(
+        choices=HISTOGRAM_FIELDS,
+        default='relative_velocity_km_per_second',
+        help_text="Campo numérico do histograma."
+    )
+    bins = serializers.IntegerField(
+        required=False, min_value=1, max_value=MAX_BINS,
+        help_text=f"Quantidade de faixas de mesma largura (padrão {DEFAULT_BINS}, máximo {MAX_BINS}). Não pode ser usado com 'width'."
+    )
+    width = serializers.FloatField(
+        required=False, min_value=0, help_text="Largura de cada faixa, na unidade do campo. Não pode ser usado com 'bins'."
+    )
+    min_value = serializers.FloatField(required=False, help_text="Início da primeira faixa (padrão: menor valor do campo).")
+    max_value = serializers.FloatField(required=False, help_text="Fim da última faixa (padrão: maior valor do campo).")
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        if 'bins' in attrs and 'width' in attrs:
+            raise serializers.ValidationError("Informe 'bins' ou 'width', não ambos.")
+        if attrs.get('width') == 0:
+            raise serializers.ValidationError({'width': "Deve ser maior que zero."})
+        if 'min_value' in attrs and 'max_value' in attrs and attrs['min_value'] > attrs['max_value']:
+            raise serializers.ValidationError({'max_value': "Deve ser maior ou igual a 'min_value'."})
+        if 'width' not in attrs:
+            attrs.setdefault('bins', self.DEFAULT_BINS)
+        return attrs
+
+class HistogramBucketSerializer(serializers.Serializer):
+    lower = serializers.FloatField()
+    upper = serializers.FloatField()
+    count = serializers.IntegerField()
+
+class HistogramSerializer(serializers.Serializer):
+    field = serializers.CharField()
+    count = serializers.IntegerField()
+    min = serializers.FloatField(allow_null=True)
+    max = serializers.FloatField(allow_null=True)
+    bucket_width = serializers.FloatField(allow_null=True)
+    buckets = HistogramBucketSerializer(many=True)
+    percentiles = serializers.DictField(child=serializers.FloatField(allow_null=True), help_text="p50, p90, p95 e p99 do campo.")
+
+class LeaderboardParamsSerializer(AsteroidFilterSerializer):
+    """Parâmetros de GET /indicadores/ranking/: a métrica, a direção, K e os mesmos filtros da listagem."""
+    ordering = None
+    metric = serializers.ChoiceField(
+        choices=list(LEADERBOARD_METRICS),
+        help_text="velocity (velocidade relativa), diameter (diâmetro estimado máximo) ou magnitude (magnitude absoluta H; menor é mais brilhante)."
+    )
+    order = serializers.ChoiceField(
+        choices=['desc', 'asc'], default='desc',
+        help_text="desc: maiores valores primeiro (mais rápidos, maiores); asc: menores (mais lentos, menores, mais brilhantes)."
+    )
+    k = serializers.IntegerField(default=20, min_value=1, max_value=MAX_K, help_text=f"Tamanho do ranking (máximo {MAX_K}).")
+    distinct = serializers.BooleanField(
+        default=False, help_text="Lista cada objeto uma vez, mesmo que ele tenha sido observado em vários dias."
+    )
+
+class LeaderboardEntrySerializer(AsteroidSerializer):
+    rank = serializers.IntegerField(help_text="Posição no ranking, a partir de 1.")
+    value = serializers.FloatField(help_text="Valor da métrica.")
+
+    class Meta(AsteroidSerializer.Meta):
+        fields = ['rank', 'value'] + ASTEROID_FIELDS
+
+class LeaderboardSerializer(serializers.Serializer):
+    """Formato da resposta de GET /indicadores/ranking/ (usado apenas na documentação)."""
+    metric = serializers.CharField()
+    field = serializers.CharField(help_text="Campo do asteroide usado na métrica.")
+    order = serializers.CharField()
+    k = serializers.IntegerField()
+    distinct = serializers.BooleanField()
+    results = LeaderboardEntrySerializer(many=True)
+
+class IndicatorsWindowSerializer(serializers.Serializer):
+    """
+    Intervalo de datas de GET /indicadores/ (query string): start_date/end_date
+    (qualquer um pode ficar em aberto) ou os últimos `days` dias até hoje.
+    Sem nenhum deles, os indicadores são da base inteira.
+    """
+    start_date = serializers.DateField(required=False, help_text="Data de importação inicial, inclusive (YYYY-MM-DD).")
+    end_date = serializers.DateField(required=False, help_text="Data de importação final, inclusive (YYYY-MM-DD). Padrão: hoje.")
+    days = serializers.IntegerField(
+        required=False, min_value=1, max_value=MAX_SERIES_DAYS,
+        help_text="Últimos N dias, incluindo hoje (ex.: 7, 30, 90). Não pode ser usado com start_date/end_date."
+    )
+
+    def validate(self, attrs):
+        if 'days' in attrs:
+            if 'start_date' in attrs or 'end_date' in attrs:
+                raise serializers.ValidationError("Informe 'days' ou 'start_date'/'end_date', não ambos.")
+            attrs['end_date'] = date.today()
+            attrs['start_date'] = attrs['end_date'] - timedelta(days=attrs.pop('days') - 1)
+        if 'start_date' in attrs and 'end_date' in attrs and attrs['start_date'] > attrs['end_date']:
+            raise serializers.ValidationError({'end_date': "Deve ser maior ou igual a 'start_date'."})
+        return attrs
+
+class RollingSeriesParamsSerializer(IndicatorsWindowSerializer):
+    """Parâmetros de GET /indicadores/serie/: o tamanho da janela móvel e o intervalo da série."""
+    DEFAULT_DAYS = 90
+
+    window = serializers.IntegerField(
+        default=7, min_value=1, max_value=MAX_ROLLING_WINDOW,
+        help_text=f"Dias da janela móvel terminada em cada ponto (padrão 7, máximo {MAX_ROLLING_WINDOW})."
+    )
+
+    def validate(self, attrs):
+        if not {'days', 'start_date', 'end_date'} & set(attrs):
+            attrs['days'] = self.DEFAULT_DAYS
+        attrs = super().validate(attrs)
+        attrs.setdefault('end_date', date.today())
+        attrs.setdefault('start_date', attrs['end_date'] - timedelta(days=self.DEFAULT_DAYS - 1))
+        if (attrs['end_date'] - attrs['start_date']).days >= MAX_SERIES_DAYS:
+            raise serializers.ValidationError(f"A série pode ter no máximo {MAX_SERIES_DAYS} dias.")
+        return attrs
+
+class RollingPointSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    asteroid_count = serializers.IntegerField(help_text="Asteroides importados no dia.")
+    total_asteroids = serializers.IntegerField(help_text="Asteroides na janela terminada no dia.")
+    hazardous_asteroids = serializers.IntegerField(help_text="Asteroides potencialmente perigosos na janela.")
+    avg_asteroids_per_day = serializers.FloatField(help_text="Média de asteroides por dia com dados na janela.")
+    avg_velocity_km_per_second = serializers.FloatField(allow_null=True)
+    avg_diameter_meters = serializers.FloatField(allow_null=True)
+
+class RollingSeriesSerializer(serializers.Serializer):
+    """Formato da resposta de GET /indicadores/serie/ (usado apenas na documentação)."""
+    window = serializers.IntegerField()
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    results = RollingPointSerializer(many=True)
+
+class AsteroidPageSerializer(serializers.Serializer):
+    """Formato da resposta paginada de GET / (usado apenas na documentação)."""
+    next = serializers.URLField(allow_null=True, help_text="URL da próxima página (null na última).")
+    previous = serializers.URLField(allow_null=True, help_text="URL da página anterior (null na primeira).")
+    results = AsteroidSerializer(many=True)
+
+class CloseApproachAsteroidSerializer(serializers.ModelSerializer):
+    neo_reference_id = serializers.CharField(source='neo.neo_reference_id', read_only=True, allow_null=True)
+    name = serializers.CharField(source='neo.name', read_only=True)
+    estimated_diameter_max_meters = serializers.FloatField(source='neo.estimated_diameter_max_meters', read_only=True)
+    is_potentially_hazardous_asteroid = serializers.BooleanField(source='neo.is_potentially_hazardous_asteroid', read_only=True)
+
     class Meta:
         model = Asteroid
-        fields = '__all__'
+        fields = ('id', 'neo_reference_id', 'name', 'estimated_diameter_max_meters', 'is_potentially_hazardous_asteroid')
+
+class CloseApproachListSerializer(CloseApproachSerializer):
+    """Aproximação com um resumo do asteroide (use com select_related('asteroid__neo'))."""
+    asteroid = CloseApproachAsteroidSerializer(read_only=True)
+
+    class Meta(CloseApproachSerializer.Meta):
+        fields = CloseApproachSerializer.Meta.fields + ('asteroid',)
+
+class CloseApproachFilterSerializer(serializers.Serializer):
+    """Filtros de GET /aproximacoes/; cada um é atendido pelos índices de base.models.CloseApproach."""
+    start = serializers.DateTimeField(
+        input_formats=['iso-8601', '%Y-%m-%d'],
+        help_text="Início da janela, inclusive (YYYY-MM-DD ou data e hora ISO 8601, UTC se sem fuso)."
+    )
+    end = serializers.DateTimeField(
+        input_formats=['iso-8601', '%Y-%m-%d'],
+        help_text="Fim da janela, exclusive (YYYY-MM-DD ou data e hora ISO 8601)."
+    )
+    max_distance_km = serializers.FloatField(required=False, min_value=0, help_text="Apenas aproximações a menos desta distância (km).")
+    orbiting_body = serializers.CharField(required=False, help_text="Corpo orbitado (por exemplo, Earth).")
+    hazardous = serializers.BooleanField(required=False, allow_null=True, default=None, help_text="Apenas asteroides potencialmente perigosos (true) ou não perigosos (false).")
+
+    def validate(self, attrs):
+        if attrs['end'] <= attrs['start']:
+            raise serializers.ValidationError({'end': "Deve ser posterior a 'start'."})
+        return attrs
+
+    def filter_queryset(self, queryset):
+        params = self.validated_data
+        queryset = queryset.filter(approach_at__gte=params['start'], approach_at__lt=params['end'])
+        if 'max_distance_km' in params:
+            queryset = queryset.filter(miss_distance_km__lt=params['max_distance_km'])
+        if params.get('orbiting_body'):
+            queryset = queryset.filter(orbiting_body=params['orbiting_body'])
+        if params.get('hazardous') is not None:
+            queryset = queryset.filter(asteroid__neo__is_potentially_hazardous_asteroid=params['hazardous'])
+        return queryset
+
+class CloseApproachPageSerializer(serializers.Serializer):
+    """Formato da resposta paginada de GET /aproximacoes/ (usado apenas na documentação)."""
+    next = serializers.URLField(allow_null=True, help_text="URL da próxima página (null na última).")
+    previous = serializers.URLField(allow_null=True, help_text="URL da página anterior (null na primeira).")
+    results = CloseApproachListSerializer(many=True)
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    duration_seconds = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ImportJob
+        fields = ('id', 'status', 'start_date', 'end_date', 'days_total', 'days_done',
+                  'created_at', 'started_at', 'finished_at', 'duration_seconds', 'result', 'error')
+
+    def get_duration_seconds(self, obj) -> Optional[float]:
+        if obj.started_at is None:
+            return None
+        return round(((obj.finished_at or timezone.now()) - obj.started_at).total_seconds(), 3)
 
 # Usuário atual do Django
 User = get_user_model()
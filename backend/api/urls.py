@@ -1,11 +1,30 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
-urlpatterns = [
-    path('', views.getData),
-    path('importar/', views.importData),
-    path('indicadores/', views.getIndicators),
-    path('asteroide/<int:id>/', views.getAsteroidInfo), 
-    
-    path('register/', views.UserRegisterView.as_view(), name='user-register'),
-]
\ No newline at end of file
+
+def api_urlpatterns(read_views):
+    """Rotas da API; `read_views` é o módulo com as leituras e o enfileiramento (views ou async_views)."""
+    return [
+        path('', read_views.getData),
+        path('exportar/', views.exportData),
+        path('importar/', read_views.importData),
+        path('importar/<int:job_id>/', read_views.getImportJob),
+        path('indicadores/', read_views.getIndicators),
+        path('indicadores/histograma/', views.getHistogram),
+        path('indicadores/ranking/', views.getLeaderboard),
+        path('indicadores/serie/', views.getRollingSeries),
+        path('asteroide/<int:id>/', read_views.getAsteroidInfo),
+        path('asteroides/', read_views.getAsteroidBatch),
+        path('aproximacoes/', read_views.getCloseApproaches),
+
+        path('register/', views.UserRegisterView.as_view(), name='user-register'),
+    ]
+
+
+if settings.ASYNC_VIEWS:
+    # Sob ASGI: leituras e enfileiramento sem ocupar uma thread por requisição
+    from . import async_views
+    urlpatterns = api_urlpatterns(async_views)
+else:
+    urlpatterns = api_urlpatterns(views)
@@ -2,15 +2,28 @@
 from rest_framework.response import Response
 from rest_framework.decorators import api_view
 from rest_framework import status, generics
-import requests, os
 from datetime import date, datetime
+from django.conf import settings
 from base.models import *
+from base.jobs import enqueue_import
+from base.indicators import get_cached_indicators
+from base.histograms import get_cached_histogram
+from base.leaderboards import get_cached_leaderboard
+from base.windows import get_cached_window_indicators, get_prefix_sums, rolling_series
+from base.routers import replica_reads
 from .serializers import *
-from django.db.models import Avg, Max, Min, Count
-from rest_framework.decorators import api_view, permission_classes
+from .pagination import KeysetPagination
+from .renderers import FastJSONRenderer, serialized
+from .export import CONTENT_TYPES, STREAMS
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.contrib.auth import get_user_model
+from django.db import router
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 import logging
 
 # Importações para DRF Spectacular
@@ -26,61 +39,149 @@ class ImportDataSerializer(serializers.Serializer):
         help_text="Data para importar os asteroides no formato YYYY-MM-DD. Se não for fornecida, a data atual será usada.",
         allow_null=True
     )
+    start_date = serializers.DateField(
+        required=False,
+        help_text="Data inicial do intervalo a importar (YYYY-MM-DD). Substitui 'import_date'.",
+        allow_null=True
+    )
+    end_date = serializers.DateField(
+        required=False,
+        help_text="Data final do intervalo a importar (YYYY-MM-DD). Se não for fornecida, apenas a data inicial é importada.",
+        allow_null=True
+    )
+
+    def validate(self, attrs):
+        start_date = attrs.get('start_date') or attrs.get('import_date') or date.today()
+        end_date = attrs.get('end_date') or start_date
+        if end_date < start_date:
+            raise serializers.ValidationError("A data final deve ser igual ou posterior à data inicial.")
+        if (end_date - start_date).days + 1 > settings.NASA_IMPORT_MAX_DAYS:
+            raise serializers.ValidationError(f"O intervalo não pode ter mais de {settings.NASA_IMPORT_MAX_DAYS} dias.")
+        return {'start_date': start_date, 'end_date': end_date}
+
+def parse_fields_param(request):
+    """Lê o parâmetro `fields` (lista separada por vírgulas). Retorna None se ausente."""
+    fields_str = request.GET.get('fields')
+    if not fields_str:
+        return None
+    fields = [name.strip() for name in fields_str.split(',') if name.strip()]
+    invalid = [name for name in fields if name not in ASTEROID_FIELDS]
+    if invalid:
+        raise serializers.ValidationError({"fields": f"Campos inválidos: {', '.join(invalid)}. Disponíveis: {', '.join(ASTEROID_FIELDS)}."})
+    return fields
+
+def asteroid_details_queryset(ids):
+    """Asteroides `ids` com as aproximações: um `id__in` (mais um para as aproximações)."""
+    return Asteroid.objects.prefetch_related('close_approaches').filter(id__in=ids)
+
+def serialize_asteroid_details(asteroids, ids):
+    """Detalhes na ordem de `ids`. Retorna (resultados, ids não encontrados)."""
+    by_id = {asteroid.pk: asteroid for asteroid in asteroids}
+    results = serialized(AsteroidDetailSerializer([by_id[pk] for pk in ids if pk in by_id], many=True))
+    return results, [pk for pk in ids if pk not in by_id]
+
+def asteroid_details(ids):
+    """Caminho comum de GET /asteroide/{id}/ e de GET/POST /asteroides/."""
+    return serialize_asteroid_details(asteroid_details_queryset(ids), ids)
 
 @extend_schema(
     parameters=[
+        AsteroidFilterSerializer,
         OpenApiParameter(
-            name='imported_date',
-            type=OpenApiTypes.DATE,
+            name='cursor',
+            type=OpenApiTypes.STR,
             location=OpenApiParameter.QUERY,
             required=False,
-            description='Filtra os asteroides pela data de importação (formato YYYY-MM-DD).',
+            description='Cursor opaco da página, obtido dos campos `next`/`previous` da resposta anterior.',
+        ),
+        OpenApiParameter(
+            name='page_size',
+            type=OpenApiTypes.INT,
+            location=OpenApiParameter.QUERY,
+            required=False,
+            description=f'Quantidade de asteroides por página (padrão {settings.ASTEROIDS_PAGE_SIZE}, máximo {settings.ASTEROIDS_MAX_PAGE_SIZE}).',
+        ),
+        OpenApiParameter(
+            name='fields',
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            required=False,
+            description='Campos a retornar, separados por vírgula. Se omitido, todos os campos são retornados.',
             examples=[
                 OpenApiExample(
-                    'Filtrar por data específica',
-                    value='2025-07-29',
+                    'Apenas id, nome e velocidade',
+                    value='id,name,relative_velocity_km_per_second',
                     parameter_only=True
                 ),
-                OpenApiExample(
-                    'Sem filtro de data (retorna todos)',
-                    value='',
-                    parameter_only=True
-                )
             ]
         ),
     ],
+    responses=AsteroidPageSerializer,
     summary="Lista todos os asteroides",
-    description="Retorna uma lista de todos os asteroides cadastrados, com opção de filtrar por data de importação."
+    description="Retorna os asteroides cadastrados em páginas (paginação por cursor), com filtros por data de importação, "
+                "periculosidade, Sentry, velocidade, diâmetro e magnitude, ordenação configurável e escolha dos campos retornados."
 )
 @api_view(['GET'])
+@renderer_classes([FastJSONRenderer, BrowsableAPIRenderer])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def getData(request):
     """
-    Retorna uma lista de todos os asteroides cadastrados na base de dados.
-    Permite filtrar por data de importação via parâmetro 'imported_date'.
+    Retorna os asteroides cadastrados na base de dados, paginados por cursor
+    sobre (ordering, id). Os filtros são validados por AsteroidFilterSerializer
+    e os campos podem ser escolhidos via 'fields'.
     """
-    items = Asteroid.objects.all()
-    imported_date_str = request.GET.get('imported_date')
-    if imported_date_str:
-        try:
-            filter_date = date.fromisoformat(imported_date_str)
-            items = items.filter(imported_date=filter_date)
-        except ValueError:
-            return Response(
-                {"error": "Formato de data inválido para o filtro. Use YYYY-MM-DD."},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        except Exception as e:
-            return Response(
-                {"error": "Erro interno do servidor ao aplicar filtro de data."},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-    serializer = AsteroidSerializer(items, many=True)
-    return Response(serializer.data)
+    filters = AsteroidFilterSerializer(data=request.GET)
+    if not filters.is_valid():
+        return Response(
+            {"error": "Parâmetros de filtro inválidos.", "details": filters.errors},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    items = filters.filter_queryset(Asteroid.objects.all())
+
+    fields = parse_fields_param(request) or ASTEROID_FIELDS
+    paginator = KeysetPagination(ordering=filters.get_ordering())
+    # Os campos da ordenação são necessários para montar os cursores
+    ordering_fields = [name.lstrip('-') for name in paginator.ordering if name.lstrip('-') not in fields]
+
+    page = paginator.paginate_queryset(items.values(*fields, *ordering_fields), request)
+    serializer = AsteroidValuesSerializer(page, many=True, fields=fields)
+    return paginator.get_paginated_response(serialized(serializer))
+
+class ExportFilterSerializer(AsteroidFilterSerializer):
+    output_format = serializers.ChoiceField(
+        choices=list(STREAMS),
+        default='ndjson',
+        help_text="Formato do arquivo: 'ndjson' (um objeto JSON por linha) ou 'csv'."
+    )
 
 @extend_schema(
+    parameters=[ExportFilterSerializer],
+    responses={(200, 'application/x-ndjson'): OpenApiTypes.STR, (200, 'text/csv'): OpenApiTypes.STR},
+    summary="Exporta os asteroides em NDJSON ou CSV",
+    description="Envia a tabela de asteroides (com os mesmos filtros e ordenação da listagem) em streaming, "
+                "sem montar a resposta inteira em memória."
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@replica_reads
+def exportData(request):
+    filters = ExportFilterSerializer(data=request.GET)
+    filters.is_valid(raise_exception=True)
+    params = filters.validated_data
+    items = filters.filter_queryset(Asteroid.objects.all()).order_by(*filters.get_ordering())
+    # O streaming lê o banco depois que a view retorna: o alias é escolhido agora
+    items = items.using(router.db_for_read(Asteroid))
+
+    output_format = params['output_format']
+    response = StreamingHttpResponse(STREAMS[output_format](items), content_type=CONTENT_TYPES[output_format])
+    response['Content-Disposition'] = f'attachment; filename="asteroides-{date.today():%Y%m%d}.{output_format}"'
+    return response
+
+@extend_schema(
+    responses=AsteroidDetailSerializer,
     summary="Obtém informações de um asteroide",
-    description="Retorna os detalhes de um asteroide específico usando seu ID.",
+    description="Retorna os detalhes de um asteroide específico usando seu ID, com todas as suas aproximações.",
     parameters=[
         OpenApiParameter(
             name='id',
@@ -98,27 +199,112 @@ def getData(request):
     ]
 )
 @api_view(['GET'])
+@renderer_classes([FastJSONRenderer, BrowsableAPIRenderer])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def getAsteroidInfo(request, id):
     try:
-        asteroid = Asteroid.objects.get(id=id)
-        serializer = AsteroidSerializer(asteroid)
-        return Response(serializer.data)
-    except Asteroid.DoesNotExist:
-        return Response({"detail": "Não encontrado."}, status=status.HTTP_404_NOT_FOUND)
+        results, missing = asteroid_details([id])
+        if missing:
+            return Response({"detail": "Não encontrado."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(results[0])
     except Exception as e:
         return Response({"detail": "Erro interno do servidor."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@extend_schema(
+    methods=['GET'],
+    parameters=[
+        OpenApiParameter(
+            name='ids',
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            required=True,
+            description='Ids separados por vírgula (ou o parâmetro repetido), no máximo ASTEROID_BATCH_MAX_IDS.',
+            examples=[OpenApiExample('Três asteroides', value='12,7,31', parameter_only=True)],
+        ),
+    ],
+    responses=AsteroidBatchResultSerializer,
+    summary="Obtém informações de vários asteroides",
+    description=(
+        "Retorna os detalhes (com as aproximações) de vários asteroides em uma requisição, na ordem "
+        "dos ids pedidos, e os ids inexistentes em `missing_ids`. Ids repetidos aparecem uma vez."
+    ),
+)
+@extend_schema(
+    methods=['POST'],
+    request=AsteroidBatchSerializer,
+    responses=AsteroidBatchResultSerializer,
+    summary="Obtém informações de vários asteroides (ids no corpo)",
+    description="Como GET /asteroides/, com os ids no corpo: {\"ids\": [12, 7, 31]}.",
+)
+@api_view(['GET', 'POST'])
+@renderer_classes([FastJSONRenderer, BrowsableAPIRenderer])
+@permission_classes([IsAuthenticated])
+@replica_reads
+def getAsteroidBatch(request):
+    batch = AsteroidBatchSerializer(data=request.data if request.method == 'POST' else request.GET)
+    if not batch.is_valid():
+        return Response({"error": "Parâmetros inválidos.", "details": batch.errors}, status=status.HTTP_400_BAD_REQUEST)
+    results, missing = asteroid_details(batch.validated_data['ids'])
+    return Response({"results": results, "missing_ids": missing})
+
+@extend_schema(
+    parameters=[
+        CloseApproachFilterSerializer,
+        OpenApiParameter(
+            name='cursor',
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            required=False,
+            description='Cursor opaco da página, obtido dos campos `next`/`previous` da resposta anterior.',
+        ),
+        OpenApiParameter(
+            name='page_size',
+            type=OpenApiTypes.INT,
+            location=OpenApiParameter.QUERY,
+            required=False,
+            description=f'Quantidade de aproximações por página (padrão {settings.ASTEROIDS_PAGE_SIZE}, máximo {settings.ASTEROIDS_MAX_PAGE_SIZE}).',
+        ),
+    ],
+    responses=CloseApproachPageSerializer,
+    summary="Lista as aproximações em uma janela de tempo",
+    description="Retorna as aproximações entre `start` e `end` (em ordem cronológica, paginadas por cursor), "
+                "opcionalmente apenas as mais próximas que `max_distance_km`, com um resumo de cada asteroide."
+)
+@api_view(['GET'])
+@renderer_classes([FastJSONRenderer, BrowsableAPIRenderer])
+@permission_classes([IsAuthenticated])
+@replica_reads
+def getCloseApproaches(request):
+    filters = CloseApproachFilterSerializer(data=request.GET)
+    if not filters.is_valid():
+        return Response(
+            {"error": "Parâmetros de filtro inválidos.", "details": filters.errors},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    items = filters.filter_queryset(CloseApproach.objects.select_related('asteroid__neo'))
+
+    paginator = KeysetPagination(ordering=('approach_at', 'id'))
+    page = paginator.paginate_queryset(items, request)
+    return paginator.get_paginated_response(serialized(CloseApproachListSerializer(page, many=True)))
+
 @extend_schema(
     request=ImportDataSerializer,
+    responses={202: ImportJobSerializer},
     summary="Importa dados de asteroides da API da NASA",
-    description="Importa dados de asteroides para uma data específica ou para a data atual, se nenhuma for fornecida.",
+    description="Enfileira a importação de asteroides para uma data específica, um intervalo de datas (buscado em janelas de 7 dias) ou para a data atual, se nenhuma for fornecida. "
+                "A importação é executada pelo worker (`manage.py import_worker`); acompanhe o andamento em `/importar/{job_id}/`.",
     examples=[
         OpenApiExample(
             'Importar dados para uma data específica',
             value={'import_date': '2025-07-29'},
             request_only=True
         ),
+        OpenApiExample(
+            'Importar dados para um intervalo de datas',
+            value={'start_date': '2025-07-01', 'end_date': '2025-07-31'},
+            request_only=True
+        ),
         OpenApiExample(
             'Importar dados para a data atual (sem especificar data)',
             value={},
@@ -129,155 +315,140 @@ def getAsteroidInfo(request, id):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def importData(request):
-    import_date_str = request.data.get('import_date')
-
-    if import_date_str:
-        try:
-            target_date = date.fromisoformat(import_date_str)
-            current_date_str = import_date_str
-        except ValueError:
-            return Response(
-                {"error": "Formato de data inválido. Use YYYY-MM-DD."},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-    else:
-        target_date = date.today()
-        current_date_str = target_date.strftime('%Y-%m-%d')
-
-    nasa_api_key = os.environ.get('NASA_API_KEY')
-    nasa_api_url = f"https://api.nasa.gov/neo/rest/v1/feed?start_date={target_date}&end_date={target_date}&api_key={nasa_api_key}"
-
-    try:
-        response = requests.get(nasa_api_url)
-        response.raise_for_status()
-        data = response.json()
-    except requests.exceptions.RequestException as e:
-        return Response({"error": f"Erro ao conectar ou receber dados da API da NASA: {e}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-    near_earth_objects_for_today = data.get('near_earth_objects', {}).get(current_date_str, [])
-
-    imported_asteroids_count = 0
-    errors = []
-
-    for neo in near_earth_objects_for_today:
-        name = neo.get('name')
-        absolute_magnitude_h = neo.get('absolute_magnitude_h')
-        is_potentially_hazardous_asteroid = neo.get('is_potentially_hazardous_asteroid')
-        is_sentry_object = neo.get('is_sentry_object')
-
-        estimated_diameter_data = neo.get('estimated_diameter', {}).get('meters', {})
-        estimated_diameter_min_meters = estimated_diameter_data.get('estimated_diameter_min')
-        estimated_diameter_max_meters = estimated_diameter_data.get('estimated_diameter_max')
-
-        close_approach_data = neo.get('close_approach_data', [])
-        relative_velocity_km_per_second = None
-
-        if close_approach_data:
-            first_approach = close_approach_data[0]
-            velocity_str = first_approach.get('relative_velocity', {}).get('kilometers_per_second')
-            if velocity_str:
-                relative_velocity_km_per_second = float(velocity_str)
-
-        if all([name, estimated_diameter_min_meters is not None, estimated_diameter_max_meters is not None,
-                        relative_velocity_km_per_second is not None, absolute_magnitude_h is not None,
-                        is_potentially_hazardous_asteroid is not None, is_sentry_object is not None]):
-            
-            asteroid_data = {
-                'name': name,
-                'estimated_diameter_min_meters': estimated_diameter_min_meters,
-                'estimated_diameter_max_meters': estimated_diameter_max_meters,
-                'relative_velocity_km_per_second': relative_velocity_km_per_second,
-                'absolute_magnitude_h': absolute_magnitude_h,
-                'is_potentially_hazardous_asteroid': is_potentially_hazardous_asteroid,
-                'is_sentry_object': is_sentry_object,
-                'imported_date': target_date
-            }
-
-            serializer = AsteroidSerializer(data=asteroid_data)
-            if serializer.is_valid():
-                serializer.save()
-                imported_asteroids_count += 1
-            else:
-                errors.append({"name": name, "errors": serializer.errors})
-        else:
-            errors.append({"name": name if name else "Unknown Asteroid", "message": "Dados incompletos ou inválidos para este asteroide."})
-
-    if errors:
+    serializer = ImportDataSerializer(data=request.data)
+    if not serializer.is_valid():
         return Response(
-            {"message": f"{imported_asteroids_count} asteroides importados com sucesso, mas ocorreram erros para alguns:", "errors": errors},
-            status=status.HTTP_207_MULTI_STATUS
+            {"error": "Formato de data inválido. Use YYYY-MM-DD.", "details": serializer.errors},
+            status=status.HTTP_400_BAD_REQUEST
         )
+
+    job = enqueue_import(
+        serializer.validated_data['start_date'],
+        serializer.validated_data['end_date'],
+        requested_by=request.user,
+    )
     return Response(
-        {"message": f"{imported_asteroids_count} asteroides importados com sucesso!"},
-        status=status.HTTP_201_CREATED
+        {
+            "message": "Importação enfileirada.",
+            "job_id": job.pk,
+            "status": job.status,
+            "status_url": request.build_absolute_uri(f"/importar/{job.pk}/"),
+        },
+        status=status.HTTP_202_ACCEPTED
     )
 
+@extend_schema(
+    responses=ImportJobSerializer,
+    summary="Consulta o andamento de uma importação",
+    description="Retorna o status, o progresso (dias processados), os tempos e o resultado ou erro de um job de importação. "
+                "O resultado traz, por dia, as quantidades inseridas, atualizadas e ignoradas e os erros encontrados.",
+)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
-def getIndicators(request):
-    asteroids = Asteroid.objects.all()
+def getImportJob(request, job_id):
+    job = get_object_or_404(ImportJob, pk=job_id)
+    return Response(serialized(ImportJobSerializer(job)))
 
-    total_asteroids = asteroids.count()
-
-    if total_asteroids == 0:
-        return Response({
-            "message": "Nenhum asteroide encontrado na base de dados para gerar indicadores.",
-            "total_asteroids": 0,
-            "unique_asteroids_by_name": 0,
-            "unique_potentially_hazardous_asteroids": 0
-        }, status=status.HTTP_200_OK)
-
-    unique_asteroids_by_name = asteroids.values('name').distinct().count()
-    avg_velocity = asteroids.aggregate(Avg('relative_velocity_km_per_second'))['relative_velocity_km_per_second__avg']
-    max_velocity_obj = asteroids.order_by('-relative_velocity_km_per_second').first()
-    max_velocity_data = {
-        'velocity_km_s': max_velocity_obj.relative_velocity_km_per_second,
-        'name': max_velocity_obj.name
-    } if max_velocity_obj else None
-    min_velocity_obj = asteroids.order_by('relative_velocity_km_per_second').first()
-    min_velocity_data = {
-        'velocity_km_s': min_velocity_obj.relative_velocity_km_per_second,
-        'name': min_velocity_obj.name
-    } if min_velocity_obj else None
-    avg_min_diameter = asteroids.aggregate(Avg('estimated_diameter_min_meters'))['estimated_diameter_min_meters__avg']
-    avg_max_diameter = asteroids.aggregate(Avg('estimated_diameter_max_meters'))['estimated_diameter_max_meters__avg']
-    avg_diameter = (avg_min_diameter + avg_max_diameter) / 2 if avg_min_diameter is not None and avg_max_diameter is not None else None
-    max_estimated_diameter_obj = asteroids.order_by('-estimated_diameter_max_meters').first()
-    max_diameter_data = {
-        'diameter_meters': max_estimated_diameter_obj.estimated_diameter_max_meters,
-        'name': max_estimated_diameter_obj.name
-    } if max_estimated_diameter_obj else None
-    min_estimated_diameter_obj = asteroids.order_by('estimated_diameter_min_meters').first()
-    min_diameter_data = {
-        'diameter_meters': min_estimated_diameter_obj.estimated_diameter_min_meters,
-        'name': min_estimated_diameter_obj.name
-    } if min_estimated_diameter_obj else None
-    asteroids_by_date = asteroids.values('imported_date').annotate(count=Count('id')).order_by('imported_date')
-    
-    asteroids_by_date_formatted = {
-        item['imported_date'].strftime('%Y-%m-%d'): item['count']
-        for item in asteroids_by_date
-    }
+@extend_schema(
+    parameters=[IndicatorsWindowSerializer],
+    responses=OpenApiTypes.OBJECT,
+    summary="Indicadores do dashboard",
+    description="Retorna totais, médias, extremos e a quantidade de asteroides por dia, da base inteira ou de um intervalo "
+                "(start_date/end_date ou os últimos `days` dias). Os totais de um intervalo saem de somas de prefixo dos "
+                "agregados diários; as contagens de objetos únicos aparecem apenas na base inteira. Responde com ETag e "
+                "Last-Modified (304 com If-None-Match).",
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@replica_reads
+def getIndicators(request):
+    window = IndicatorsWindowSerializer(data=request.GET)
+    if not window.is_valid():
+        return Response(
+            {"error": "Parâmetros do intervalo inválidos.", "details": window.errors},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if window.validated_data:
+        entry = get_cached_window_indicators(window.validated_data.get('start_date'), window.validated_data.get('end_date'))
+    else:
+        entry = get_cached_indicators()
+    not_modified = get_conditional_response(request, etag=entry['etag'], last_modified=entry['last_modified'])
+    response = not_modified or Response(entry['data'], status=status.HTTP_200_OK)
+    response['ETag'] = entry['etag']
+    response['Last-Modified'] = http_date(entry['last_modified'])
+    # O cliente pode guardar a resposta, mas deve revalidar (If-None-Match) a cada uso
+    response['Cache-Control'] = 'private, no-cache'
+    return response
 
-    num_unique_dates = asteroids.values('imported_date').distinct().count()
-    avg_asteroids_per_day = total_asteroids / num_unique_dates if num_unique_dates > 0 else 0
-    unique_potentially_hazardous_asteroids = asteroids.filter(is_potentially_hazardous_asteroid=True).values('name').distinct().count()
+@extend_schema(
+    parameters=[HistogramParamsSerializer],
+    responses=HistogramSerializer,
+    summary="Histograma de um campo dos asteroides",
+    description="Retorna apenas as faixas (contagem por faixa) e os percentis p50/p90/p95/p99 de velocidade, diâmetro ou magnitude, "
+                "calculados no banco, com os mesmos filtros da listagem (intervalo de datas, periculosidade etc.).",
+)
+@api_view(['GET'])
+@renderer_classes([FastJSONRenderer, BrowsableAPIRenderer])
+@permission_classes([IsAuthenticated])
+@replica_reads
+def getHistogram(request):
+    params = HistogramParamsSerializer(data=request.GET)
+    if not params.is_valid():
+        return Response(
+            {"error": "Parâmetros do histograma inválidos.", "details": params.errors},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    items = params.filter_queryset(Asteroid.objects.all())
+    return Response(get_cached_histogram(items, params.validated_data))
 
-    response_data = {
-        "total_asteroids": total_asteroids,
-        "unique_asteroids_by_name": unique_asteroids_by_name,
-        "unique_potentially_hazardous_asteroids": unique_potentially_hazardous_asteroids,
-        "avg_asteroids_per_day": round(avg_asteroids_per_day, 2),
-        "avg_velocity_km_per_second": round(avg_velocity, 2) if avg_velocity else None,
-        "max_velocity": max_velocity_data,
-        "min_velocity": min_velocity_data,
-        "avg_diameter_meters": round(avg_diameter, 2) if avg_diameter else None,
-        "max_estimated_diameter": max_diameter_data,
-        "min_estimated_diameter": min_diameter_data,
-        "asteroids_by_date": asteroids_by_date_formatted,
-    }
+@extend_schema(
+    parameters=[LeaderboardParamsSerializer],
+    responses=LeaderboardSerializer,
+    summary="Ranking (top-K) dos asteroides",
+    description="Retorna os K asteroides mais rápidos, maiores ou mais brilhantes (ou o inverso, com order=asc), "
+                "com os mesmos filtros da listagem (intervalo de datas, periculosidade etc.). Cada ranking é uma "
+                "leitura de índice, sem ordenar a tabela; com distinct=true cada objeto aparece uma vez.",
+)
+@api_view(['GET'])
+@renderer_classes([FastJSONRenderer, BrowsableAPIRenderer])
+@permission_classes([IsAuthenticated])
+@replica_reads
+def getLeaderboard(request):
+    params = LeaderboardParamsSerializer(data=request.GET)
+    if not params.is_valid():
+        return Response(
+            {"error": "Parâmetros do ranking inválidos.", "details": params.errors},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    items = params.filter_queryset(Asteroid.objects.all())
+    return Response(get_cached_leaderboard(items, params.validated_data))
 
-    return Response(response_data, status=status.HTTP_200_OK)
+@extend_schema(
+    parameters=[RollingSeriesParamsSerializer],
+    responses=RollingSeriesSerializer,
+    summary="Série de médias móveis por dia",
+    description="Retorna, para cada dia do intervalo (padrão: os últimos 90 dias), os asteroides do dia e os totais e médias "
+                "da janela móvel de `window` dias terminada nele, para gráficos de tendência. Cada ponto custa duas "
+                "consultas às somas de prefixo dos agregados diários, independente do tamanho da janela.",
+)
+@api_view(['GET'])
+@renderer_classes([FastJSONRenderer, BrowsableAPIRenderer])
+@permission_classes([IsAuthenticated])
+@replica_reads
+def getRollingSeries(request):
+    params = RollingSeriesParamsSerializer(data=request.GET)
+    if not params.is_valid():
+        return Response(
+            {"error": "Parâmetros da série inválidos.", "details": params.errors},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    start, end, window = (params.validated_data[name] for name in ('start_date', 'end_date', 'window'))
+    return Response({
+        "window": window,
+        "start_date": start,
+        "end_date": end,
+        "results": rolling_series(get_prefix_sums(), start, end, window),
+    })
 
 User = get_user_model()
 
@@ -12,5 +12,10 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+# Sob ASGI as leituras usam as views assíncronas (api/async_views.py)
+os.environ.setdefault('ASYNC_VIEWS', '1')
+# Cada requisição assíncrona usa suas próprias threads: conexões persistentes
+# não seriam reaproveitadas, então ficam desligadas (use um pooler como o PgBouncer)
+os.environ.setdefault('DATABASE_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
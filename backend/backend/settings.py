@@ -1,6 +1,6 @@
 from pathlib import Path
 from dotenv import load_dotenv
-from datetime import timedelta
+from datetime import date, timedelta
 import os
 from django.core.exceptions import ImproperlyConfigured
 
@@ -28,11 +28,98 @@ DATABASES = {
         'PASSWORD': os.environ.get('DATABASE_PASSWORD', 'postgres123'),
         'HOST': os.environ.get('DATABASE_HOST', 'db'),
         'PORT': os.environ.get('DATABASE_PORT', '5432'),
+        # Conexões persistentes: cada processo reaproveita a conexão por até
+        # DATABASE_CONN_MAX_AGE segundos (0: uma por requisição, como sob ASGI;
+        # veja backend/asgi.py), verificando-a antes de reutilizar
+        'CONN_MAX_AGE': int(os.environ.get('DATABASE_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Réplica de leitura opcional (base/routers.py): recebe as leituras das views
+# @replica_reads. Nos testes ela espelha o banco de teste do primário (TEST
+# MIRROR); apontar DATABASE_REPLICA_HOST para o próprio primário basta para
+# testar o roteamento localmente.
+if os.environ.get('DATABASE_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ.get('DATABASE_REPLICA_NAME', DATABASES['default']['NAME']),
+        'USER': os.environ.get('DATABASE_REPLICA_USER', DATABASES['default']['USER']),
+        'PASSWORD': os.environ.get('DATABASE_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+        'HOST': os.environ['DATABASE_REPLICA_HOST'],
+        'PORT': os.environ.get('DATABASE_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['base.routers.ReplicaRouter']
+# Envia as leituras das views @replica_reads à réplica configurada. O executor de
+# testes (base.test_runner) desliga: as classes que não são de roteamento rodam
+# só no 'default', que a réplica espelhada não enxerga dentro da transação do teste
+DATABASE_REPLICA_READS = bool(int(os.environ.get('DATABASE_REPLICA_READS', 1)))
+TEST_RUNNER = 'base.test_runner.TestRunner'
+# Segundos em que as leituras ficam no primário após uma importação (atraso máximo esperado da réplica)
+REPLICA_PIN_SECONDS = float(os.environ.get('REPLICA_PIN_SECONDS', 5))
+
+# Cache. O LocMemCache é por processo; para que o worker de importação
+# invalide o cache dos processos web, use o FileBasedCache com um diretório
+# compartilhado (CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache
+# e CACHE_LOCATION=/var/tmp/django_cache).
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'nasa-app'),
+    }
+}
+
+# Tempo máximo (s) que um payload de indicadores fica no cache, mesmo sem importação
+INDICATORS_CACHE_TIMEOUT = int(os.environ.get('INDICATORS_CACHE_TIMEOUT', 300))
+
+# Paginação da listagem de asteroides (GET /)
+ASTEROIDS_PAGE_SIZE = int(os.environ.get('ASTEROIDS_PAGE_SIZE', 100))
+ASTEROIDS_MAX_PAGE_SIZE = int(os.environ.get('ASTEROIDS_MAX_PAGE_SIZE', 1000))
+# Máximo de ids por requisição em GET/POST /asteroides/ (detalhes em lote)
+ASTEROID_BATCH_MAX_IDS = int(os.environ.get('ASTEROID_BATCH_MAX_IDS', 300))
+
+# Exportação (GET /exportar/): linhas lidas do banco por vez no cursor do servidor
+EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', 2000))
+
 # Acessar a chave NASA_API_KEY
 NASA_API_KEY = os.environ.get('NASA_API_KEY')
+NASA_API_URL = os.environ.get('NASA_API_URL', 'https://api.nasa.gov/neo/rest/v1/feed')
+
+# Cliente da API da NASA (base/nasa.py): timeouts (s), novas tentativas e
+# tokens da cota por hora que nunca são usados pelas importações
+NASA_API_CONNECT_TIMEOUT = float(os.environ.get('NASA_API_CONNECT_TIMEOUT', 5))
+NASA_API_READ_TIMEOUT = float(os.environ.get('NASA_API_READ_TIMEOUT', 30))
+NASA_API_MAX_RETRIES = int(os.environ.get('NASA_API_MAX_RETRIES', 4))
+NASA_API_BACKOFF_BASE = float(os.environ.get('NASA_API_BACKOFF_BASE', 1))
+NASA_API_BACKOFF_MAX = float(os.environ.get('NASA_API_BACKOFF_MAX', 60))
+NASA_API_RATE_LIMIT_RESERVE = int(os.environ.get('NASA_API_RATE_LIMIT_RESERVE', 5))
+
+# Importação: janelas de 7 dias buscadas em paralelo
+NASA_IMPORT_MAX_WORKERS = int(os.environ.get('NASA_IMPORT_MAX_WORKERS', 4))
+NASA_IMPORT_MAX_DAYS = int(os.environ.get('NASA_IMPORT_MAX_DAYS', 366))
+# O worker busca as janelas com o cliente assíncrono (httpx), em uma só thread
+NASA_IMPORT_ASYNC = bool(int(os.environ.get('NASA_IMPORT_ASYNC', 0)))
+
+# Jobs de importação em execução sem progresso por IMPORT_JOB_LEASE_SECONDS
+# (o worker morreu) voltam para a fila; depois de IMPORT_JOB_MAX_ATTEMPTS
+# tentativas, são marcados como falhos
+IMPORT_JOB_LEASE_SECONDS = int(os.environ.get('IMPORT_JOB_LEASE_SECONDS', 600))
+IMPORT_JOB_MAX_ATTEMPTS = int(os.environ.get('IMPORT_JOB_MAX_ATTEMPTS', 3))
+
+# Cache em disco do feed bruto da NASA (base/feed_cache.py)
+NASA_FEED_CACHE_DIR = os.environ.get('NASA_FEED_CACHE_DIR', str(BASE_DIR / '.nasa_feed_cache'))
+NASA_FEED_CACHE_TODAY_TTL = int(os.environ.get('NASA_FEED_CACHE_TODAY_TTL', 900))
+# Modo offline: importa apenas do cache, sem acessar a API da NASA
+NASA_FEED_OFFLINE = bool(int(os.environ.get('NASA_FEED_OFFLINE', 0)))
+
+# Sincronização contínua (manage.py sync_asteroids, base/sync.py): intervalo
+# entre ciclos (s), dias recentes buscados de novo a cada ciclo e o primeiro
+# dia considerado na busca de lacunas (padrão: a primeira data importada)
+NASA_SYNC_INTERVAL = float(os.environ.get('NASA_SYNC_INTERVAL', 3600))
+NASA_SYNC_REFRESH_DAYS = int(os.environ.get('NASA_SYNC_REFRESH_DAYS', 3))
+NASA_SYNC_START_DATE = date.fromisoformat(os.environ['NASA_SYNC_START_DATE']) if os.environ.get('NASA_SYNC_START_DATE') else None
 
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -56,6 +143,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'base.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -68,6 +156,14 @@ MIDDLEWARE = [
 
 CORS_ORIGIN_ALLOW_ALL = True
 
+# Envia as medidas de cada requisição no cabeçalho Server-Timing (os
+# histogramas em /metrics são coletados de qualquer forma)
+SERVER_TIMING_HEADER = bool(int(os.environ.get('SERVER_TIMING_HEADER', 1)))
+
+# Views assíncronas (api/async_views.py) para as leituras e o enfileiramento de
+# importações. Ativadas por padrão pelo backend/asgi.py; sob WSGI ficam as views do DRF.
+ASYNC_VIEWS = bool(int(os.environ.get('ASYNC_VIEWS', 0)))
+
 ROOT_URLCONF = 'backend.urls'
 
 TEMPLATES = [
@@ -128,12 +224,16 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'base.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated', # Exigir autenticação por padrão
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer', # Também mede a renderização (Server-Timing)
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 }
 
 SPECTACULAR_SETTINGS = {
@@ -148,8 +248,22 @@ SPECTACULAR_SETTINGS = {
         'filter': True,
     },
     'COMPONENT_SPLIT_REQUEST': True,
+    # Registra as extensões do projeto só quando o esquema é gerado (base/schema.py)
+    'DEFAULT_GENERATOR_CLASS': 'base.schema.SchemaGenerator',
 }
 
+# Esquema OpenAPI pré-gerado por `manage.py build_schema` (openapi.yaml e
+# openapi.json), servido por /api/schema/ com cache HTTP de
+# OPENAPI_SCHEMA_MAX_AGE segundos. Sem os arquivos, o esquema é gerado a cada requisição.
+OPENAPI_SCHEMA_DIR = Path(os.environ.get('OPENAPI_SCHEMA_DIR', BASE_DIR / 'openapi'))
+OPENAPI_SCHEMA_MAX_AGE = int(os.environ.get('OPENAPI_SCHEMA_MAX_AGE', 86400))
+
+# Como a autenticação JWT resolve request.user (base.authentication):
+# 'cache' (User guardado no cache por JWT_USER_CACHE_TIMEOUT segundos),
+# 'stateless' (TokenUser montado do token, sem banco) ou 'database' (uma consulta por requisição)
+JWT_USER_RESOLUTION = os.environ.get('JWT_USER_RESOLUTION', 'cache')
+JWT_USER_CACHE_TIMEOUT = int(os.environ.get('JWT_USER_CACHE_TIMEOUT', 60))
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60), # Tempo de vida do token de acesso
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),   # Tempo de vida do token de refresh
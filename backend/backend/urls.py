@@ -21,20 +21,22 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
     TokenVerifyView,
 )
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
+
+from base.views import metrics, redoc, schema, swagger_ui
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('api.urls')),
     path('status/', include('health_check.urls')),
+    path('metrics', metrics, name='metrics'),
 
     # URLs para Autenticação JWT
     path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('token/verify/', TokenVerifyView.as_view(), name='token_verify'),
 
-    # URLs para documentação
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('api/schema/swagger-ui/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
-    path('api/schema/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
+    # URLs para documentação (o esquema vem do arquivo gerado por `manage.py build_schema`)
+    path('api/schema/', schema, name='schema'),
+    path('api/schema/swagger-ui/', swagger_ui, name='swagger-ui'),
+    path('api/schema/redoc/', redoc, name='redoc'),
 ]
@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class BaseConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'base'
+
+    def ready(self):
+        from django.db import connections
+        from django.db.backends.signals import connection_created
+
+        # Conecta os sinais que invalidam o cache de usuários da autenticação JWT
+        from . import authentication  # noqa: F401
+        from .metrics import install_db_wrapper
+
+        # Consultas e tempo no banco por requisição, em todas as conexões (inclusive as já abertas)
+        connection_created.connect(install_db_wrapper)
+        for connection in connections.all(initialized_only=True):
+            install_db_wrapper(connection=connection)
@@ -0,0 +1,110 @@
+# authentication.py
+"""
+Autenticação JWT sem consulta ao banco a cada requisição.
+
+O JWTAuthentication do simplejwt busca o User pelo id do token em toda
+requisição. CachedJWTAuthentication guarda o usuário no cache do Django por
+JWT_USER_CACHE_TIMEOUT segundos, conforme JWT_USER_RESOLUTION:
+
+- 'cache' (padrão): usuário lido do cache; só a primeira requisição (ou a
+  primeira após expirar/invalidar) consulta o banco;
+- 'stateless': nenhuma consulta; request.user é um TokenUser montado a partir
+  das claims do token (sem is_active nem troca de senha verificados);
+- 'database': comportamento original do simplejwt.
+
+aauthenticate() faz o mesmo para as views assíncronas (api/async_views.py).
+
+Salvar ou remover um usuário (desativação, troca de senha) apaga a entrada do
+cache. Com o LocMemCache isso só vale para o processo que salvou; nos demais
+a entrada expira em JWT_USER_CACHE_TIMEOUT segundos, a menos que o cache seja
+compartilhado (veja CACHES em settings.py). Alterações com QuerySet.update()
+não disparam sinais e também dependem da expiração.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication, JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+def user_cache_key(user_id):
+    return f'jwt-user:{user_id}'
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def _user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+    def _check_user(self, user, validated_token):
+        # Mesmas verificações do simplejwt, feitas também sobre o usuário do cache
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and \
+                validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
+
+    def get_user(self, validated_token):
+        mode = settings.JWT_USER_RESOLUTION
+        if mode == 'stateless':
+            return JWTStatelessUserAuthentication.get_user(self, validated_token)
+        if mode != 'cache':
+            return super().get_user(validated_token)
+
+        user_id = self._user_id(validated_token)
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            try:
+                user = self.user_model.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+            cache.set(key, user, settings.JWT_USER_CACHE_TIMEOUT)
+        return self._check_user(user, validated_token)
+
+    # Views assíncronas (api/async_views.py), fora do DRF
+
+    async def aauthenticate(self, request):
+        """Como authenticate(), com o cache e o ORM assíncronos. Retorna (user, token) ou None."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        mode = settings.JWT_USER_RESOLUTION
+        if mode == 'stateless':
+            return JWTStatelessUserAuthentication.get_user(self, validated_token)
+
+        user_id = self._user_id(validated_token)
+        key = user_cache_key(user_id)
+        user = await cache.aget(key) if mode == 'cache' else None
+        if user is None:
+            try:
+                user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+            if mode == 'cache':
+                await cache.aset(key, user, settings.JWT_USER_CACHE_TIMEOUT)
+        return self._check_user(user, validated_token)
+
+
+@receiver([post_save, post_delete], sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_user(sender, instance, **kwargs):
+    key = user_cache_key(getattr(instance, api_settings.USER_ID_FIELD))
+    cache.delete(key)
+    # De novo após o commit: uma requisição concorrente pode ter lido (e
+    # guardado) a linha antiga antes de a transação terminar
+    transaction.on_commit(lambda: cache.delete(key))
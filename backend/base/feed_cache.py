@@ -0,0 +1,146 @@
+# feed_cache.py
+"""
+Cache em disco do feed bruto da NASA, por dia.
+
+O conteúdo de cada dia (a lista `near_earth_objects[dia]`) é gravado uma vez
+em `objects/<sha256[:2]>/<sha256>.json` (endereçado pelo conteúdo: dias
+iguais compartilham o arquivo) e `index/<dia>.json` aponta para ele com a
+data da busca. Um dia buscado depois de terminado nunca muda na NASA e fica
+no cache para sempre; o dia corrente (ou futuro) expira após
+NASA_FEED_CACHE_TODAY_TTL segundos.
+
+No modo offline (NASA_FEED_OFFLINE ou `import_asteroids --offline`) as
+importações usam apenas o cache, sem acessar a rede.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from django.conf import settings
+
+
+class FeedCache:
+    def __init__(self, root=None, today_ttl=None):
+        self.root = Path(root or settings.NASA_FEED_CACHE_DIR)
+        self.today_ttl = settings.NASA_FEED_CACHE_TODAY_TTL if today_ttl is None else today_ttl
+        self.objects_dir = self.root / 'objects'
+        self.index_dir = self.root / 'index'
+
+    # Arquivos
+
+    def _write_atomic(self, path, data):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _object_path(self, digest):
+        return self.objects_dir / digest[:2] / f'{digest}.json'
+
+    def _index_path(self, day):
+        return self.index_dir / f'{day.isoformat()}.json'
+
+    def _read_index(self, day):
+        try:
+            return json.loads(self._index_path(day).read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    # Dias
+
+    def is_fresh(self, day, entry, offline=False):
+        fetched_at = datetime.fromtimestamp(entry['fetched_at'], tz=timezone.utc)
+        if offline or fetched_at.date() > day:
+            return True
+        return time.time() - entry['fetched_at'] < self.today_ttl
+
+    def get_day(self, day, offline=False):
+        entry = self._read_index(day)
+        if entry is None or not self.is_fresh(day, entry, offline):
+            return None
+        try:
+            return json.loads(self._object_path(entry['sha256']).read_bytes())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def put_day(self, day, neos):
+        body = json.dumps(neos, sort_keys=True, separators=(',', ':')).encode()
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            self._write_atomic(path, body)
+        entry = {'sha256': digest, 'size': len(body), 'fetched_at': time.time()}
+        self._write_atomic(self._index_path(day), json.dumps(entry).encode())
+
+    # Janelas do feed
+
+    def put_window(self, start_date, end_date, near_earth_objects):
+        day = start_date
+        while day <= end_date:
+            self.put_day(day, near_earth_objects.get(day.isoformat(), []))
+            day += timedelta(days=1)
+
+    # Tamanho e remoção
+
+    def _index_entries(self):
+        for path in self.index_dir.glob('*.json'):
+            try:
+                yield path, json.loads(path.read_text())
+            except ValueError:
+                continue
+
+    def stats(self):
+        objects = list(self.objects_dir.glob('*/*.json'))
+        return {
+            'days': sum(1 for _ in self.index_dir.glob('*.json')),
+            'objects': len(objects),
+            'bytes': sum(path.stat().st_size for path in objects),
+        }
+
+    def collect_garbage(self):
+        """Remove objetos que nenhum dia referencia. Retorna os bytes liberados."""
+        referenced = {entry['sha256'] for _, entry in self._index_entries()}
+        freed = 0
+        for path in self.objects_dir.glob('*/*.json'):
+            if path.stem not in referenced:
+                freed += path.stat().st_size
+                path.unlink()
+        return freed
+
+    def evict(self, max_bytes=None, older_than=None):
+        """
+        Remove dias buscados há mais de `older_than` (timedelta) e, se ainda
+        passar de `max_bytes`, os dias buscados há mais tempo até caber.
+        Retorna a quantidade de dias removidos.
+        """
+        entries = sorted(self._index_entries(), key=lambda item: item[1]['fetched_at'])
+        removed = 0
+        if older_than is not None:
+            cutoff = time.time() - older_than.total_seconds()
+            for path, entry in [item for item in entries if item[1]['fetched_at'] < cutoff]:
+                path.unlink()
+                removed += 1
+            entries = [item for item in entries if item[1]['fetched_at'] >= cutoff]
+        self.collect_garbage()
+
+        if max_bytes is not None:
+            # Objetos compartilhados só liberam espaço quando o último dia que os usa sai
+            refs = {}
+            for _, entry in entries:
+                refs[entry['sha256']] = refs.get(entry['sha256'], 0) + 1
+            total = self.stats()['bytes']
+            for path, entry in entries:
+                if total <= max_bytes:
+                    break
+                path.unlink()
+                removed += 1
+                refs[entry['sha256']] -= 1
+                if refs[entry['sha256']] == 0:
+                    total -= entry['size']
+            self.collect_garbage()
+        return removed
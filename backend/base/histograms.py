@@ -0,0 +1,179 @@
+# histograms.py
+"""
+Histogramas e percentis de um campo numérico dos asteroides
+(GET /indicadores/histograma/), calculados no banco.
+
+No PostgreSQL tudo sai de uma única consulta: os limites, os percentis
+(percentile_cont) e a contagem por faixa sobre a mesma CTE.
+Nos demais bancos os valores do campo são lidos uma vez e agrupados com NumPy.
+As faixas são semiabertas [início, fim), exceto a última, que inclui o fim.
+Os dois caminhos usam a mesma regra e a mesma conta, para devolverem as
+mesmas contagens: a faixa de v é floor((v - início) / largura), com o fim da
+última faixa incluído nela; valores fora de [início da primeira, fim da
+última] (com `width`, quando o número de faixas é limitado a MAX_BINS) não
+entram em nenhuma faixa, mas contam em `count` e nos percentis.
+"""
+import hashlib
+import json
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from .indicators import indicators_version
+
+HISTOGRAM_FIELDS = [
+    'relative_velocity_km_per_second',
+    'estimated_diameter_min_meters',
+    'estimated_diameter_max_meters',
+    'absolute_magnitude_h',
+]
+PERCENTILES = (50, 90, 95, 99)
+MAX_BINS = 200
+
+
+def _bin_count(low, high, bins, width):
+    if width:
+        return min(max(math.ceil((high - low) / width), 1), MAX_BINS)
+    return bins
+
+
+def _payload(field, count, low, high, bin_edges, counts, percentiles):
+    if not count:
+        return {'field': field, 'count': 0, 'min': None, 'max': None, 'bucket_width': None,
+                'buckets': [], 'percentiles': {f'p{q}': None for q in PERCENTILES}}
+    return {
+        'field': field,
+        'count': count,
+        'min': low,
+        'max': high,
+        'bucket_width': bin_edges[1] - bin_edges[0],
+        'buckets': [
+            {'lower': bin_edges[i], 'upper': bin_edges[i + 1], 'count': counts[i]}
+            for i in range(len(counts))
+        ],
+        'percentiles': {f'p{q}': value for q, value in zip(PERCENTILES, percentiles)},
+    }
+
+
+def _edges(low, high, bins, width):
+    if width:
+        return [low + i * width for i in range(bins + 1)]
+    if high == low:
+        high = low + 1
+    step = (high - low) / bins
+    return [low + i * step for i in range(bins)] + [high]
+
+
+def _histogram_numpy(queryset, field, bins, width, low, high):
+    # Só fora do PostgreSQL: o NumPy não é carregado na partida dos workers
+    import numpy as np
+
+    values = np.fromiter(queryset.values_list(field, flat=True).iterator(chunk_size=settings.EXPORT_CHUNK_SIZE), dtype=float)
+    if not values.size:
+        return _payload(field, 0, None, None, None, None, None)
+    data_low = float(values.min()) if low is None else low
+    data_high = float(values.max()) if high is None else high
+    bins = _bin_count(data_low, data_high, bins, width)
+    edges = _edges(data_low, data_high, bins, width)
+    step = width or (edges[-1] - edges[0]) / bins
+    inside = values[(values >= edges[0]) & (values <= edges[-1])]
+    buckets = np.minimum(np.floor((inside - edges[0]) / step).astype(int), bins - 1)
+    counts = np.bincount(buckets, minlength=bins)
+    percentiles = np.percentile(values, PERCENTILES)
+    return _payload(field, int(values.size), data_low, data_high, edges,
+                    [int(c) for c in counts], [float(p) for p in percentiles])
+
+
+def _histogram_postgres(queryset, field, bins, width, low, high):
+    inner_sql, inner_params = queryset.values_list(field).query.sql_with_params()
+    # A conexão do queryset (o primário ou a réplica, pelo roteador)
+    connection = connections[queryset.db]
+    quoted = connection.ops.quote_name
+    fractions = ', '.join(str(q / 100) for q in PERCENTILES)
+    # Com `width`, o fim da última faixa é low + n * width; com `bins`, é o máximo.
+    # A faixa é calculada como em _histogram_numpy (e não com width_bucket, que
+    # arredonda de outro jeito nas bordas): 0 a nbins - 1, com o fim na última.
+    sql = f"""
+        WITH filtered AS MATERIALIZED (
+            SELECT {quoted(field)} AS v FROM ({inner_sql}) AS q
+        ),
+        bounds AS (
+            SELECT count(*) AS n,
+                   COALESCE(%s, min(v)) AS lo,
+                   COALESCE(%s, max(v)) AS hi,
+                   percentile_cont(ARRAY[{fractions}]) WITHIN GROUP (ORDER BY v) AS pct
+            FROM filtered
+        ),
+        shape AS (
+            SELECT n, lo, hi, pct,
+                   CASE WHEN %s::float8 IS NULL THEN %s
+                        ELSE LEAST(GREATEST(CEIL((hi - lo) / %s::float8)::int, 1), {MAX_BINS}) END AS nbins
+            FROM bounds
+        ),
+        edges AS (
+            SELECT *, CASE WHEN %s::float8 IS NOT NULL THEN lo + nbins * %s::float8
+                           WHEN hi > lo THEN hi ELSE lo + 1 END AS top
+            FROM shape
+        ),
+        steps AS (
+            SELECT *, COALESCE(%s::float8, (top - lo) / nbins) AS step
+            FROM edges
+        )
+        SELECT e.n, e.lo, e.hi, e.pct, e.nbins, b.bucket, b.cnt
+        FROM steps e
+        LEFT JOIN LATERAL (
+            SELECT LEAST(FLOOR((f.v - e.lo) / e.step)::int, e.nbins - 1) AS bucket, count(*) AS cnt
+            FROM filtered f
+            WHERE e.n > 0 AND f.v BETWEEN e.lo AND e.top
+            GROUP BY 1
+        ) b ON true
+    """
+    params = (*inner_params, low, high, width, bins, width, width, width, width)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    count, data_low, data_high, percentiles, nbins = rows[0][:5]
+    if not count:
+        return _payload(field, 0, None, None, None, None, None)
+    counts = [0] * nbins
+    for *_, bucket, bucket_count in rows:
+        if bucket is not None:
+            counts[bucket] = bucket_count
+    return _payload(field, count, data_low, data_high, _edges(data_low, data_high, nbins, width), counts, percentiles)
+
+
+def _selection(queryset, field, low, high):
+    queryset = queryset.filter(**{f'{field}__isnull': False})
+    if low is not None:
+        queryset = queryset.filter(**{f'{field}__gte': low})
+    if high is not None:
+        queryset = queryset.filter(**{f'{field}__lte': high})
+    return queryset
+
+
+def compute_histogram(queryset, field, bins=None, width=None, low=None, high=None):
+    """
+    Histograma de `field` sobre o queryset (já filtrado): `bins` faixas iguais
+    ou faixas de largura `width`, entre `low`/`high` (padrão: mínimo e máximo).
+    """
+    queryset = _selection(queryset, field, low, high)
+    if connections[queryset.db].vendor == 'postgresql':
+        return _histogram_postgres(queryset, field, bins, width, low, high)
+    return _histogram_numpy(queryset, field, bins, width, low, high)
+
+
+def get_cached_histogram(queryset, params):
+    """compute_histogram no cache, sob a versão atual dos indicadores (invalidada a cada importação)."""
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+    key = f'histogram:{indicators_version()}:{digest}'
+    data = cache.get(key)
+    if data is None:
+        data = compute_histogram(
+            queryset, params['field'], bins=params.get('bins'), width=params.get('width'),
+            low=params.get('min_value'), high=params.get('max_value'),
+        )
+        cache.set(key, data, settings.INDICATORS_CACHE_TIMEOUT)
+    return data
@@ -0,0 +1,393 @@
+# importer.py
+"""
+Importação de asteroides a partir do feed da NASA.
+
+Os dias já presentes no cache em disco do feed são importados sem rede; os
+demais são divididos em janelas de até 7 dias, buscadas em paralelo (com
+número limitado de workers e sessão HTTP compartilhada) e persistidas à
+medida que chegam. aimport_range faz o mesmo com um cliente HTTP assíncrono.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, time, timedelta, timezone
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from .models import NEO_FIELDS, Asteroid, CloseApproach, NearEarthObject
+from .feed_cache import FeedCache
+from .indicators import bump_indicators_version
+from .rollups import refresh_daily_stats
+from .routers import pin_primary
+from .nasa import AsyncNasaClient, NasaFeedError, feed_windows, get_client
+
+
+def parse_neo(neo, imported_date):
+    """
+    Extrai os campos de um asteroide (objeto e observação do dia) de um objeto
+    do feed da NASA.
+    Retorna None se algum campo obrigatório estiver ausente.
+    """
+    neo_reference_id = neo.get('neo_reference_id') or neo.get('id')
+    name = neo.get('name')
+    absolute_magnitude_h = neo.get('absolute_magnitude_h')
+    is_potentially_hazardous_asteroid = neo.get('is_potentially_hazardous_asteroid')
+    is_sentry_object = neo.get('is_sentry_object')
+
+    estimated_diameter_data = neo.get('estimated_diameter', {}).get('meters', {})
+    estimated_diameter_min_meters = estimated_diameter_data.get('estimated_diameter_min')
+    estimated_diameter_max_meters = estimated_diameter_data.get('estimated_diameter_max')
+
+    close_approach_data = neo.get('close_approach_data', [])
+    relative_velocity_km_per_second = None
+
+    if close_approach_data:
+        first_approach = close_approach_data[0]
+        velocity_str = first_approach.get('relative_velocity', {}).get('kilometers_per_second')
+        if velocity_str:
+            relative_velocity_km_per_second = float(velocity_str)
+
+    if not all([neo_reference_id, name, estimated_diameter_min_meters is not None, estimated_diameter_max_meters is not None,
+                relative_velocity_km_per_second is not None, absolute_magnitude_h is not None,
+                is_potentially_hazardous_asteroid is not None, is_sentry_object is not None]):
+        return None
+
+    return {
+        'neo_reference_id': neo_reference_id,
+        'name': name,
+        'estimated_diameter_min_meters': estimated_diameter_min_meters,
+        'estimated_diameter_max_meters': estimated_diameter_max_meters,
+        'relative_velocity_km_per_second': relative_velocity_km_per_second,
+        'absolute_magnitude_h': absolute_magnitude_h,
+        'is_potentially_hazardous_asteroid': is_potentially_hazardous_asteroid,
+        'is_sentry_object': is_sentry_object,
+        'imported_date': imported_date,
+    }
+
+
+def _approach_datetime(approach):
+    epoch_ms = approach.get('epoch_date_close_approach')
+    if epoch_ms is not None:
+        return datetime.fromtimestamp(epoch_ms / 1000, tz=timezone.utc)
+    try:
+        return datetime.strptime(approach['close_approach_date_full'], '%Y-%b-%d %H:%M').replace(tzinfo=timezone.utc)
+    except (KeyError, ValueError):
+        pass
+    try:
+        return datetime.combine(datetime.fromisoformat(approach['close_approach_date']).date(), time(), tzinfo=timezone.utc)
+    except (KeyError, ValueError):
+        return None
+
+
+def parse_close_approaches(neo):
+    """
+    Extrai todas as aproximações de close_approach_data (campos do modelo
+    CloseApproach, sem o asteroide). Entradas incompletas são descartadas.
+    """
+    approaches = {}
+    for approach in neo.get('close_approach_data', []):
+        try:
+            miss_distance_km = float(approach['miss_distance']['kilometers'])
+            relative_velocity_km_per_second = float(approach['relative_velocity']['kilometers_per_second'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        approach_at = _approach_datetime(approach)
+        if approach_at is None:
+            continue
+        approaches[approach_at] = {
+            'approach_at': approach_at,
+            'miss_distance_km': miss_distance_km,
+            'relative_velocity_km_per_second': relative_velocity_km_per_second,
+            'orbiting_body': approach.get('orbiting_body') or '',
+        }
+    return list(approaches.values())
+
+
+# Campos atualizados quando o objeto já existe (propriedades mais recentes da NASA)
+NEO_UPDATE_FIELDS = [name for name in NEO_FIELDS if name != 'neo_reference_id']
+# Campos atualizados quando a observação já existe para o dia (reimportação)
+UPSERT_UPDATE_FIELDS = ['relative_velocity_km_per_second']
+CLOSE_APPROACH_UPDATE_FIELDS = ['miss_distance_km', 'relative_velocity_km_per_second', 'orbiting_body']
+
+
+def import_day(imported_date, neos):
+    """
+    Persiste os asteroides de um dia com três upserts em lote: os objetos
+    (NearEarthObject), as observações do dia (Asteroid) e todas as suas
+    aproximações (CloseApproach).
+
+    Retorna um dicionário com as quantidades inseridas, atualizadas e
+    ignoradas e a lista de erros de validação.
+    """
+    # Import local para evitar ciclo: api.serializers importa base.models
+    from api.serializers import AsteroidImportSerializer
+
+    validator = AsteroidImportSerializer()
+    rows = {}
+    approaches = {}
+    skipped = 0
+    errors = []
+
+    for neo in neos:
+        asteroid_data = parse_neo(neo, imported_date)
+        if asteroid_data is None:
+            errors.append({"name": neo.get('name') or "Unknown Asteroid", "message": "Dados incompletos ou inválidos para este asteroide."})
+            continue
+        try:
+            validated = validator.run_validation(asteroid_data)
+        except ValidationError as e:
+            errors.append({"name": asteroid_data['name'], "errors": e.detail})
+            continue
+        if validated['neo_reference_id'] in rows:
+            # O mesmo objeto repetido no feed do dia: vale a última ocorrência
+            skipped += 1
+        rows[validated['neo_reference_id']] = validated
+        approaches[validated['neo_reference_id']] = parse_close_approaches(neo)
+
+    skipped += len(errors)
+    result = {"inserted": 0, "updated": 0, "skipped": skipped, "errors": errors}
+    if not rows:
+        return result
+
+    with transaction.atomic():
+        neos = NearEarthObject.objects.bulk_create(
+            [NearEarthObject(**{name: data[name] for name in NEO_FIELDS}) for data in rows.values()],
+            update_conflicts=True,
+            unique_fields=['neo_reference_id'],
+            update_fields=NEO_UPDATE_FIELDS,
+        )
+        neo_ids = {neo.neo_reference_id: neo.pk for neo in neos}
+        if None in neo_ids.values():
+            # Bancos que não devolvem a chave no upsert
+            neo_ids = dict(
+                NearEarthObject.objects.filter(neo_reference_id__in=rows.keys()).values_list('neo_reference_id', 'id')
+            )
+
+        existing = set(
+            Asteroid.objects
+            .filter(imported_date=imported_date, neo_id__in=neo_ids.values())
+            .values_list('neo_id', flat=True)
+        )
+        asteroids = Asteroid.objects.bulk_create(
+            [
+                Asteroid(neo_id=neo_ids[neo_reference_id], imported_date=imported_date,
+                         relative_velocity_km_per_second=data['relative_velocity_km_per_second'])
+                for neo_reference_id, data in rows.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['neo', 'imported_date'],
+            update_fields=UPSERT_UPDATE_FIELDS,
+        )
+        ids = {asteroid.neo_id: asteroid.pk for asteroid in asteroids}
+        if None in ids.values():
+            ids = dict(
+                Asteroid.objects
+                .filter(imported_date=imported_date, neo_id__in=neo_ids.values())
+                .values_list('neo_id', 'id')
+            )
+        CloseApproach.objects.bulk_create(
+            [
+                CloseApproach(asteroid_id=ids[neo_ids[neo_reference_id]], **approach)
+                for neo_reference_id, neo_approaches in approaches.items()
+                for approach in neo_approaches
+            ],
+            update_conflicts=True,
+            unique_fields=['asteroid', 'approach_at'],
+            update_fields=CLOSE_APPROACH_UPDATE_FIELDS,
+        )
+        refresh_daily_stats([imported_date])
+        transaction.on_commit(bump_indicators_version)
+        # Leituras no primário até a réplica receber esta importação
+        transaction.on_commit(pin_primary)
+
+    result["updated"] = len(existing)
+    result["inserted"] = len(rows) - len(existing)
+    return result
+
+
+def _days(start_date, end_date):
+    return [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+
+
+def date_runs(days):
+    """Agrupa dias em ordem crescente em sequências contínuas: [(início, fim), ...]."""
+    runs = []
+    run_start = previous = None
+    for day in days:
+        if previous is None or day != previous + timedelta(days=1):
+            if run_start is not None:
+                runs.append((run_start, previous))
+            run_start = day
+        previous = day
+    if run_start is not None:
+        runs.append((run_start, previous))
+    return runs
+
+
+def _missing_windows(missing_days):
+    """Divide cada sequência contínua de dias ausentes do cache em janelas do feed."""
+    return [window for run_start, run_end in date_runs(missing_days) for window in feed_windows(run_start, run_end)]
+
+
+def _fetch_and_cache(client, cache, window_start, window_end):
+    near_earth_objects = client.get_feed(window_start, window_end)
+    cache.put_window(window_start, window_end, near_earth_objects)
+    return near_earth_objects
+
+
+API_STATS_KEYS = ("calls", "requests", "retries", "failures", "latency_ms_total", "throttled_ms_total")
+
+
+def _import_cached_days(start_date, end_date, offline, progress, refresh=False):
+    """
+    Primeira etapa de import_range/aimport_range: importa os dias que já estão
+    no cache do feed (nenhum com `refresh`, exceto offline). Retorna (days,
+    days_done, janelas a buscar na NASA).
+    """
+    cache = FeedCache()
+    days_done = 0
+    days = {
+        day.isoformat(): {"inserted": 0, "updated": 0, "skipped": 0, "errors": []}
+        for day in _days(start_date, end_date)
+    }
+
+    missing_days = []
+    for day in _days(start_date, end_date):
+        neos = None if refresh and not offline else cache.get_day(day, offline=offline)
+        if neos is None:
+            missing_days.append(day)
+            continue
+        days[day.isoformat()] = import_day(day, neos)
+        days_done += 1
+    if progress and days_done:
+        progress(days_done)
+
+    if offline:
+        for day in missing_days:
+            days[day.isoformat()]["errors"].append({"message": "Feed deste dia não está no cache (modo offline)."})
+        missing_days = []
+    return days, days_done, _missing_windows(missing_days)
+
+
+def _import_window(days, window_start, window_end, near_earth_objects=None, error=None):
+    """Grava os dias de uma janela buscada (ou registra o erro em cada um). Retorna a quantidade de dias."""
+    for day in _days(window_start, window_end):
+        if error is not None:
+            days[day.isoformat()]["errors"].append({"message": str(error)})
+        else:
+            days[day.isoformat()] = import_day(day, near_earth_objects.get(day.isoformat(), []))
+    return (window_end - window_start).days + 1
+
+
+def day_failed(day_result):
+    """
+    Indica se o dia não foi importado (feed não obtido da NASA nem do cache).
+    Os erros de validação de um asteroide trazem o nome dele; os do feed, não.
+    """
+    return any('name' not in error for error in day_result['errors'])
+
+
+def _summary(days, api_stats):
+    totals = {
+        key: sum(day[key] for day in days.values())
+        for key in ("inserted", "updated", "skipped")
+    }
+    return {
+        "imported": totals["inserted"] + totals["updated"],
+        **totals,
+        "has_errors": any(day["errors"] for day in days.values()),
+        "nasa_api": api_stats,
+        "days": days,
+    }
+
+
+def import_range(start_date, end_date, max_workers=None, progress=None, offline=None, refresh=False):
+    """
+    Importa todos os dias de [start_date, end_date].
+
+    Dias presentes no cache do feed (base.feed_cache) são importados direto do
+    disco; os demais são buscados na NASA em janelas de até 7 dias. Com
+    `offline` (padrão: NASA_FEED_OFFLINE) a rede não é usada e os dias fora do
+    cache são reportados como erro. Com `refresh` todos os dias são buscados de
+    novo na NASA (revisões de dias recentes) e o cache é sobrescrito.
+
+    Se informado, `progress(days_done)` é chamado após cada janela processada.
+
+    Retorna um resumo com os totais inseridos, atualizados e ignorados, os
+    contadores das chamadas à NASA feitas nesta importação e, para cada dia,
+    as mesmas quantidades e os erros encontrados.
+    """
+    max_workers = max_workers or settings.NASA_IMPORT_MAX_WORKERS
+    offline = settings.NASA_FEED_OFFLINE if offline is None else offline
+    days, days_done, windows = _import_cached_days(start_date, end_date, offline, progress, refresh)
+
+    api_stats = {}
+    if windows:
+        cache = FeedCache()
+        client = get_client()
+        stats_before = client.stats()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(windows))) as executor:
+            futures = {
+                executor.submit(_fetch_and_cache, client, cache, window_start, window_end): (window_start, window_end)
+                for window_start, window_end in windows
+            }
+            # Cada janela é gravada assim que chega; as escritas ficam na thread
+            # principal para não abrir uma conexão com o banco por worker.
+            for future in as_completed(futures):
+                window_start, window_end = futures[future]
+                try:
+                    near_earth_objects = future.result()
+                except NasaFeedError as e:
+                    days_done += _import_window(days, window_start, window_end, error=e)
+                else:
+                    days_done += _import_window(days, window_start, window_end, near_earth_objects)
+                if progress:
+                    progress(days_done)
+
+        stats_after = client.stats()
+        api_stats = {key: stats_after[key] - stats_before[key] for key in API_STATS_KEYS}
+
+    return _summary(days, api_stats)
+
+
+async def aimport_range(start_date, end_date, max_workers=None, progress=None, offline=None, refresh=False):
+    """
+    Versão assíncrona de import_range, com o mesmo resultado: as janelas são
+    buscadas concorrentemente pelo AsyncNasaClient (até `max_workers` ao mesmo
+    tempo) em uma única thread, e as escritas no banco e no cache em disco
+    rodam, uma janela por vez, na thread síncrona de origem (sync_to_async).
+    """
+    max_workers = max_workers or settings.NASA_IMPORT_MAX_WORKERS
+    offline = settings.NASA_FEED_OFFLINE if offline is None else offline
+    progress = sync_to_async(progress) if progress else None
+    days, days_done, windows = await sync_to_async(_import_cached_days)(start_date, end_date, offline, None, refresh)
+    if progress and days_done:
+        await progress(days_done)
+
+    api_stats = {}
+    if windows:
+        cache = FeedCache()
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def fetch(client, window_start, window_end):
+            async with semaphore:
+                try:
+                    near_earth_objects = await client.get_feed(window_start, window_end)
+                except NasaFeedError as e:
+                    return window_start, window_end, None, e
+            await sync_to_async(cache.put_window)(window_start, window_end, near_earth_objects)
+            return window_start, window_end, near_earth_objects, None
+
+        # Mesma cota (token bucket) do cliente síncrono do processo
+        async with AsyncNasaClient(pool_size=max_workers, rate_limiter=get_client().rate_limiter) as client:
+            for task in asyncio.as_completed([fetch(client, *window) for window in windows]):
+                window_start, window_end, near_earth_objects, error = await task
+                days_done += await sync_to_async(_import_window)(days, window_start, window_end, near_earth_objects, error)
+                if progress:
+                    await progress(days_done)
+            stats = client.stats()
+        api_stats = {key: stats[key] for key in API_STATS_KEYS}
+
+    return _summary(days, api_stats)
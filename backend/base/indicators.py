@@ -0,0 +1,149 @@
+# indicators.py
+"""
+Cálculo dos indicadores exibidos no dashboard (GET /indicadores/).
+
+Contagens, médias, extremos e a distribuição por dia saem da tabela de
+agregados diários (DailyAsteroidStats), então o custo cresce com o número de
+dias e não com o número de asteroides. As contagens de objetos únicos são
+contagens da tabela NearEarthObject (uma linha por objeto), restritas aos
+objetos com ao menos uma observação.
+
+O payload fica no cache do Django sob uma chave versionada; cada importação
+bem-sucedida troca a versão (bump_indicators_version), o que invalida o
+payload anterior em todos os processos que compartilham o cache.
+"""
+import hashlib
+import json
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Exists, OuterRef, Q
+
+from .models import Asteroid, DailyAsteroidStats, NearEarthObject
+
+EMPTY_INDICATORS = {
+    "message": "Nenhum asteroide encontrado na base de dados para gerar indicadores.",
+    "total_asteroids": 0,
+    "unique_asteroids_by_name": 0,
+    "unique_potentially_hazardous_asteroids": 0,
+}
+
+
+def _extreme(days, value_field, name_field, value_key, pick):
+    day = pick(days, key=lambda d: d[value_field])
+    return {value_key: day[value_field], 'name': day[name_field]}
+
+
+def _days_queryset():
+    return DailyAsteroidStats.objects.filter(asteroid_count__gt=0).order_by('imported_date').values()
+
+
+UNIQUE_COUNTS = {
+    'unique_asteroids_by_name': Count('id'),
+    'unique_potentially_hazardous_asteroids': Count('id', filter=Q(is_potentially_hazardous_asteroid=True)),
+}
+
+
+def _observed_neos():
+    # Objetos sem observação (p. ex. cujas observações foram removidas) não entram nas contagens
+    return NearEarthObject.objects.filter(Exists(Asteroid.objects.filter(neo=OuterRef('pk'))))
+
+
+def compute_indicators():
+    days = list(_days_queryset())
+    if not days:
+        return dict(EMPTY_INDICATORS)
+    return _indicators(days, _observed_neos().aggregate(**UNIQUE_COUNTS))
+
+
+async def acompute_indicators():
+    """compute_indicators com o ORM assíncrono."""
+    days = [day async for day in _days_queryset()]
+    if not days:
+        return dict(EMPTY_INDICATORS)
+    return _indicators(days, await _observed_neos().aaggregate(**UNIQUE_COUNTS))
+
+
+def _indicators(days, unique):
+    total_asteroids = sum(day['asteroid_count'] for day in days)
+
+    avg_velocity = sum(day['sum_velocity_km_per_second'] for day in days) / total_asteroids
+    avg_min_diameter = sum(day['sum_diameter_min_meters'] for day in days) / total_asteroids
+    avg_max_diameter = sum(day['sum_diameter_max_meters'] for day in days) / total_asteroids
+    avg_diameter = (avg_min_diameter + avg_max_diameter) / 2
+    avg_asteroids_per_day = total_asteroids / len(days)
+
+    return {
+        "total_asteroids": total_asteroids,
+        "unique_asteroids_by_name": unique['unique_asteroids_by_name'],
+        "unique_potentially_hazardous_asteroids": unique['unique_potentially_hazardous_asteroids'],
+        "avg_asteroids_per_day": round(avg_asteroids_per_day, 2),
+        "avg_velocity_km_per_second": round(avg_velocity, 2) if avg_velocity else None,
+        "max_velocity": _extreme(days, 'max_velocity_km_per_second', 'max_velocity_name', 'velocity_km_s', max),
+        "min_velocity": _extreme(days, 'min_velocity_km_per_second', 'min_velocity_name', 'velocity_km_s', min),
+        "avg_diameter_meters": round(avg_diameter, 2) if avg_diameter else None,
+        "max_estimated_diameter": _extreme(days, 'max_diameter_meters', 'max_diameter_name', 'diameter_meters', max),
+        "min_estimated_diameter": _extreme(days, 'min_diameter_meters', 'min_diameter_name', 'diameter_meters', min),
+        "asteroids_by_date": {
+            day['imported_date'].strftime('%Y-%m-%d'): day['asteroid_count']
+            for day in days
+        },
+    }
+
+
+INDICATORS_VERSION_KEY = 'indicators:version'
+
+
+def bump_indicators_version():
+    cache.set(INDICATORS_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def indicators_version():
+    version = cache.get(INDICATORS_VERSION_KEY)
+    if version is None:
+        cache.add(INDICATORS_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(INDICATORS_VERSION_KEY)
+    return version
+
+
+async def aindicators_version():
+    version = await cache.aget(INDICATORS_VERSION_KEY)
+    if version is None:
+        await cache.aadd(INDICATORS_VERSION_KEY, uuid.uuid4().hex, None)
+        version = await cache.aget(INDICATORS_VERSION_KEY)
+    return version
+
+
+def _entry(data):
+    body = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True).encode()
+    return {
+        'data': data,
+        'etag': f'"{hashlib.sha1(body).hexdigest()}"',
+        'last_modified': int(time.time()),
+    }
+
+
+def get_cached_indicators():
+    """
+    Retorna {'data', 'etag', 'last_modified'} para a versão atual, calculando
+    (e guardando no cache) os indicadores apenas se ainda não estiverem lá.
+    """
+    key = f'indicators:{indicators_version()}'
+    entry = cache.get(key)
+    if entry is None:
+        entry = _entry(compute_indicators())
+        cache.set(key, entry, settings.INDICATORS_CACHE_TIMEOUT)
+    return entry
+
+
+async def aget_cached_indicators():
+    """get_cached_indicators para as views assíncronas."""
+    key = f'indicators:{await aindicators_version()}'
+    entry = await cache.aget(key)
+    if entry is None:
+        entry = _entry(await acompute_indicators())
+        await cache.aset(key, entry, settings.INDICATORS_CACHE_TIMEOUT)
+    return entry
@@ -0,0 +1,167 @@
+# jobs.py
+"""
+Fila de importações baseada no banco de dados.
+
+POST /importar/ apenas cria um ImportJob pendente; o comando `import_worker`
+reivindica os jobs com SELECT ... FOR UPDATE SKIP LOCKED (vários workers podem
+rodar em paralelo sem pegar o mesmo job) e executa a importação, com
+import_range ou, se NASA_IMPORT_ASYNC, com aimport_range (cliente HTTP assíncrono).
+
+Enquanto importa, o worker renova heartbeat_at a cada terço do lease, em uma
+thread própria (inclusive durante as esperas pela cota da API e os backoffs,
+que podem passar do lease). Um job em execução sem sinal há mais de
+IMPORT_JOB_LEASE_SECONDS (o worker morreu no meio) volta a ser
+reivindicado, até IMPORT_JOB_MAX_ATTEMPTS tentativas; depois disso é marcado
+como falho. Reimportar os dias já gravados é seguro: a importação é idempotente.
+"""
+import logging
+import os
+import socket
+import threading
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ImportJob
+
+logger = logging.getLogger(__name__)
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _job_fields(start_date, end_date, requested_by):
+    return {
+        'start_date': start_date,
+        'end_date': end_date,
+        'days_total': (end_date - start_date).days + 1,
+        # Pelo id: com JWT_USER_RESOLUTION=stateless o usuário é um TokenUser, não um User
+        'requested_by_id': requested_by.pk if requested_by and requested_by.is_authenticated else None,
+    }
+
+
+def enqueue_import(start_date, end_date, requested_by=None):
+    return ImportJob.objects.create(**_job_fields(start_date, end_date, requested_by))
+
+
+async def aenqueue_import(start_date, end_date, requested_by=None):
+    return await ImportJob.objects.acreate(**_job_fields(start_date, end_date, requested_by))
+
+
+def _claimable_jobs(now):
+    # Pendentes ou em execução com o lease vencido (worker que morreu sem gravar o resultado)
+    expired = now - timedelta(seconds=settings.IMPORT_JOB_LEASE_SECONDS)
+    return ImportJob.objects.filter(
+        Q(status=ImportJob.PENDING)
+        | (Q(status=ImportJob.RUNNING) & (Q(heartbeat_at__lt=expired) | Q(heartbeat_at__isnull=True)))
+    )
+
+
+def claim_next_job(worker=None):
+    """
+    Marca o job pendente (ou abandonado) mais antigo como em execução e o
+    retorna (ou None). Jobs abandonados que já esgotaram as tentativas são
+    marcados como falhos.
+    """
+    while True:
+        with transaction.atomic():
+            now = timezone.now()
+            job = (
+                _claimable_jobs(now)
+                .select_for_update(skip_locked=True)
+                .order_by('created_at', 'id')
+                .first()
+            )
+            if job is None:
+                return None
+            if job.attempts >= settings.IMPORT_JOB_MAX_ATTEMPTS:
+                logger.warning("Job %s abandonado por %s após %s tentativas", job.pk, job.worker, job.attempts)
+                job.status = ImportJob.FAILED
+                job.error = (f"O worker {job.worker} parou de responder e o job esgotou as "
+                             f"{job.attempts} tentativas.")
+                job.finished_at = now
+                job.save(update_fields=['status', 'error', 'finished_at'])
+                continue
+            if job.status == ImportJob.RUNNING:
+                logger.warning("Job %s abandonado por %s; reivindicando de novo", job.pk, job.worker)
+            job.status = ImportJob.RUNNING
+            job.worker = worker or worker_name()
+            job.started_at = job.heartbeat_at = now
+            job.attempts += 1
+            job.save(update_fields=['status', 'worker', 'started_at', 'heartbeat_at', 'attempts'])
+        return job
+
+
+@contextmanager
+def _heartbeat(claim):
+    """Renova heartbeat_at do job a cada terço do lease enquanto o bloco executa."""
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(settings.IMPORT_JOB_LEASE_SECONDS / 3):
+                try:
+                    if not claim.update(heartbeat_at=timezone.now()):
+                        break  # o job foi reivindicado por outro worker
+                except DatabaseError:
+                    # Falha passageira do banco: tenta de novo na próxima batida
+                    logger.warning("Falha ao renovar o heartbeat do job", exc_info=True)
+                    connections[claim.db].close_if_unusable_or_obsolete()
+        finally:
+            # Conexões abertas por esta thread
+            connections.close_all()
+
+    thread = threading.Thread(target=beat, name='import-job-heartbeat', daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_job(job):
+    """Executa um job já reivindicado e grava o resultado (ou o erro)."""
+    # Só enquanto esta tentativa for a dona do job: se o lease venceu e outro
+    # worker o reivindicou, as gravações desta são ignoradas
+    claim = ImportJob.objects.filter(pk=job.pk, status=ImportJob.RUNNING, attempts=job.attempts)
+
+    def progress(days_done):
+        claim.update(days_done=days_done, heartbeat_at=timezone.now())
+
+    # Só o worker importa: as views que enfileiram não carregam o importador
+    # nem os clientes HTTP da NASA (requests/httpx)
+    from .importer import aimport_range, import_range
+
+    try:
+        run = async_to_sync(aimport_range) if settings.NASA_IMPORT_ASYNC else import_range
+        with _heartbeat(claim):
+            summary = run(job.start_date, job.end_date, progress=progress)
+    except Exception:
+        logger.exception("Falha na importação do job %s", job.pk)
+        job.status = ImportJob.FAILED
+        job.error = traceback.format_exc()
+    else:
+        job.status = ImportJob.SUCCEEDED
+        job.result = summary
+        job.days_done = job.days_total
+    job.finished_at = timezone.now()
+    if not claim.update(status=job.status, error=job.error, result=job.result,
+                        days_done=job.days_done, finished_at=job.finished_at):
+        logger.warning("Job %s foi reivindicado por outro worker; resultado descartado", job.pk)
+    return job
+
+
+def process_next_job(worker=None):
+    """Reivindica e executa um job. Retorna o job processado ou None se a fila estiver vazia."""
+    job = claim_next_job(worker)
+    if job is not None:
+        run_job(job)
+    return job
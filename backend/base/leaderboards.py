@@ -0,0 +1,118 @@
+# leaderboards.py
+"""
+Rankings (top-K) dos asteroides por um campo (GET /indicadores/ranking/).
+
+Cada ranking percorre um índice já na ordem pedida e para após K linhas, sem
+ordenar a tabela:
+
+- velocidade: asteroid_velocity_idx (velocidade, id, data, objeto), que também
+  cobre o filtro por data e o join com o NearEarthObject;
+- diâmetro e magnitude: neo_diameter_idx/neo_magnitude_idx (campo, id) do
+  NearEarthObject, com as observações de cada objeto buscadas pela restrição
+  única (neo, imported_date).
+
+O desempate (id) segue a direção do campo, então a ordem decrescente é a
+leitura do índice de trás para a frente e não precisa de um índice próprio.
+
+Com `distinct`, cada objeto aparece uma vez: na velocidade, com a observação
+de maior (ou menor) valor; no diâmetro e na magnitude, que são do objeto, com
+a observação mais recente.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from .indicators import indicators_version
+from .models import ASTEROID_FIELDS, Asteroid, NearEarthObject
+
+# métrica -> campo
+LEADERBOARD_METRICS = {
+    'velocity': 'relative_velocity_km_per_second',
+    'diameter': 'estimated_diameter_max_meters',
+    'magnitude': 'absolute_magnitude_h',
+}
+# Métricas do NearEarthObject (iguais em todas as observações de um objeto)
+NEO_METRICS = {'diameter', 'magnitude'}
+MAX_K = 100
+
+
+def _ordering(descending, *fields):
+    return [f'-{name}' if descending else name for name in fields]
+
+
+def _distinct_observations(queryset, k):
+    """Primeira observação de cada objeto na ordem do queryset, até `k` objetos."""
+    rows = []
+    seen = set()
+    # O cursor lê o índice aos poucos e observações repetidas de um objeto são
+    # puladas. Dentro de uma transação o cursor do PostgreSQL não é WITH HOLD,
+    # que leria o resultado inteiro antes da primeira linha. A transação é a da
+    # conexão que executa a consulta (a réplica, pelo roteador, nas views de leitura).
+    with transaction.atomic(using=queryset.db):
+        for row in queryset.values('neo_id', *ASTEROID_FIELDS).iterator(chunk_size=max(2 * k, 100)):
+            neo_id = row.pop('neo_id')
+            if neo_id not in seen:
+                seen.add(neo_id)
+                rows.append(row)
+                if len(rows) == k:
+                    break
+    return rows
+
+
+def _distinct_objects(queryset, field, k, descending):
+    """Os `k` objetos com observações no queryset, pela ordem do índice do objeto, com a observação mais recente."""
+    latest = queryset.filter(neo_id=OuterRef('pk')).order_by('-imported_date', '-id').values('id')[:1]
+    ids = list(
+        NearEarthObject.objects
+        .filter(id__in=queryset.values('neo_id'))
+        .order_by(*_ordering(descending, field, 'id'))
+        .annotate(observation_id=Subquery(latest))
+        .values_list('observation_id', flat=True)[:k]
+    )
+    rows = {row['id']: row for row in Asteroid.objects.filter(id__in=ids).values(*ASTEROID_FIELDS)}
+    return [rows[pk] for pk in ids]
+
+
+def compute_leaderboard(queryset, metric, k=20, descending=True, distinct=False):
+    """
+    As `k` observações de `queryset` (já filtrado) com maior (ou menor, se não
+    `descending`) valor de `metric`. Retorna as linhas com ASTEROID_FIELDS, a
+    posição (`rank`) e o valor do campo (`value`).
+    """
+    field = LEADERBOARD_METRICS[metric]
+    if metric in NEO_METRICS:
+        if distinct:
+            rows = _distinct_objects(queryset, field, k, descending)
+        else:
+            # Mesma ordem do índice do objeto: as observações de um objeto ficam juntas
+            ordered = queryset.order_by(*_ordering(descending, field, 'neo_id', 'id'))
+            rows = list(ordered.values(*ASTEROID_FIELDS)[:k])
+    else:
+        ordered = queryset.order_by(*_ordering(descending, field, 'id'))
+        rows = _distinct_observations(ordered, k) if distinct else list(ordered.values(*ASTEROID_FIELDS)[:k])
+    return [{'rank': rank, 'value': row[field], **row} for rank, row in enumerate(rows, 1)]
+
+
+def get_cached_leaderboard(queryset, params):
+    """compute_leaderboard no cache, sob a versão atual dos indicadores (invalidada a cada importação)."""
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+    key = f'leaderboard:{indicators_version()}:{digest}'
+    data = cache.get(key)
+    if data is None:
+        data = {
+            'metric': params['metric'],
+            'field': LEADERBOARD_METRICS[params['metric']],
+            'order': params['order'],
+            'k': params['k'],
+            'distinct': params['distinct'],
+            'results': compute_leaderboard(
+                queryset, params['metric'], k=params['k'],
+                descending=params['order'] == 'desc', distinct=params['distinct'],
+            ),
+        }
+        cache.set(key, data, settings.INDICATORS_CACHE_TIMEOUT)
+    return data
@@ -0,0 +1,34 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from base.views import SCHEMA_FILES
+
+
+class Command(BaseCommand):
+    help = ("Gera o esquema OpenAPI em OPENAPI_SCHEMA_DIR (openapi.yaml e openapi.json), "
+            "servido por /api/schema/ sem introspecção das views a cada requisição.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output-dir', help="Diretório de saída. Padrão: OPENAPI_SCHEMA_DIR.")
+        parser.add_argument('--fail-on-warn', action='store_true',
+                            help="Falha se a geração emitir avisos ou erros.")
+
+    def handle(self, *args, **options):
+        from drf_spectacular.drainage import GENERATOR_STATS
+        from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+        from drf_spectacular.settings import spectacular_settings
+
+        schema = spectacular_settings.DEFAULT_GENERATOR_CLASS().get_schema(request=None, public=True)
+        GENERATOR_STATS.emit_summary()
+        if options['fail_on_warn'] and GENERATOR_STATS:
+            raise CommandError("A geração do esquema emitiu avisos ou erros.")
+
+        renderers = {'yaml': OpenApiYamlRenderer, 'json': OpenApiJsonRenderer}
+        output_dir = Path(options['output_dir'] or settings.OPENAPI_SCHEMA_DIR)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for name, (filename, _) in SCHEMA_FILES.items():
+            path = output_dir / filename
+            path.write_bytes(renderers[name]().render(schema, renderer_context={}))
+            self.stdout.write(f"Esquema gravado em {path}.")
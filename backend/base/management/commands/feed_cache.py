@@ -0,0 +1,50 @@
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from base.feed_cache import FeedCache
+
+SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+
+def _parse_size(value):
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)\s*([KMG]?)B?', value.strip().upper())
+    if not match:
+        raise CommandError(f"Tamanho inválido: {value}. Use, por exemplo, 500M ou 2G.")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+
+def _format_size(size):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.1f} {unit}" if unit != 'B' else f"{size} B"
+        size /= 1024
+
+
+class Command(BaseCommand):
+    help = "Mostra o tamanho do cache em disco do feed da NASA e remove entradas antigas."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-size', help="Remove os dias buscados há mais tempo até o cache caber neste tamanho (ex.: 500M).")
+        parser.add_argument('--older-than', type=int, metavar='DIAS', help="Remove os dias buscados há mais de DIAS dias.")
+        parser.add_argument('--clear', action='store_true', help="Esvazia o cache.")
+
+    def handle(self, *args, **options):
+        cache = FeedCache()
+
+        if options['clear']:
+            removed = cache.evict(max_bytes=0)
+        elif options['max_size'] or options['older_than'] is not None:
+            removed = cache.evict(
+                max_bytes=_parse_size(options['max_size']) if options['max_size'] else None,
+                older_than=timedelta(days=options['older_than']) if options['older_than'] is not None else None,
+            )
+        else:
+            removed = None
+
+        if removed is not None:
+            self.stdout.write(self.style.SUCCESS(f"{removed} dias removidos do cache."))
+
+        stats = cache.stats()
+        self.stdout.write(f"{cache.root}: {stats['days']} dias, {stats['objects']} arquivos, {_format_size(stats['bytes'])}")
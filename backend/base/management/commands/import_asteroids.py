@@ -0,0 +1,45 @@
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from base.importer import import_range
+
+
+def _parse_date(value):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f"Data inválida: {value}. Use YYYY-MM-DD.")
+
+
+class Command(BaseCommand):
+    help = "Importa asteroides da API da NASA para um intervalo de datas."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start-date', help="Data inicial (YYYY-MM-DD). Padrão: hoje.")
+        parser.add_argument('--end-date', help="Data final (YYYY-MM-DD). Padrão: a data inicial.")
+        parser.add_argument('--workers', type=int, default=settings.NASA_IMPORT_MAX_WORKERS,
+                            help="Número máximo de requisições simultâneas à NASA.")
+        parser.add_argument('--offline', action='store_true', default=None,
+                            help="Importa apenas do cache em disco do feed, sem acessar a API da NASA.")
+
+    def handle(self, *args, **options):
+        start_date = _parse_date(options['start_date']) if options['start_date'] else date.today()
+        end_date = _parse_date(options['end_date']) if options['end_date'] else start_date
+        if end_date < start_date:
+            raise CommandError("A data final deve ser igual ou posterior à data inicial.")
+
+        summary = import_range(start_date, end_date, max_workers=options['workers'], offline=options['offline'])
+
+        for day, result in summary['days'].items():
+            line = f"{day}: {result['inserted']} inseridos, {result['updated']} atualizados, {result['skipped']} ignorados"
+            if result['errors']:
+                self.stdout.write(self.style.WARNING(f"{line}, {len(result['errors'])} erros"))
+            else:
+                self.stdout.write(line)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{summary['imported']} asteroides importados "
+            f"({summary['inserted']} inseridos, {summary['updated']} atualizados, {summary['skipped']} ignorados)."
+        ))
@@ -0,0 +1,36 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+
+from base.jobs import process_next_job, worker_name
+from base.routers import close_stale_connections
+
+
+class Command(BaseCommand):
+    help = "Processa a fila de importações (ImportJob) criada por POST /importar/."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll-interval', type=float, default=2.0,
+                            help="Segundos de espera quando a fila está vazia.")
+        parser.add_argument('--once', action='store_true',
+                            help="Processa os jobs pendentes e encerra quando a fila esvaziar.")
+
+    def handle(self, *args, **options):
+        stop = threading.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, lambda *_: stop.set())
+
+        worker = worker_name()
+        self.stdout.write(f"Worker {worker} aguardando jobs de importação...")
+
+        while not stop.is_set():
+            # Como no fim de uma requisição: descarta conexões velhas (CONN_MAX_AGE) ou quebradas
+            close_stale_connections()
+            job = process_next_job(worker)
+            if job is None:
+                if options['once']:
+                    break
+                stop.wait(options['poll_interval'])
+                continue
+            self.stdout.write(f"Job {job.pk} ({job.start_date} a {job.end_date}): {job.status}")
@@ -0,0 +1,30 @@
+import threading
+
+from django.core.management.base import BaseCommand
+
+from base.nasa_stub import NasaStubServer
+
+
+class Command(BaseCommand):
+    help = "Executa o servidor local que imita o feed da NASA (para importações de teste e benchmarks)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8001)
+        parser.add_argument('--neos-per-day', type=int, default=15, help="Asteroides gerados por dia. Padrão: 15.")
+        parser.add_argument('--rate-limit', type=int, default=1000, help="Valor de X-RateLimit-Limit. Padrão: 1000.")
+
+    def handle(self, *args, **options):
+        stub = NasaStubServer(
+            neos_per_day=options['neos_per_day'], rate_limit=options['rate_limit'],
+            host=options['host'], port=options['port'],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Feed da NASA simulado em {stub.url}"))
+        self.stdout.write(f"Use NASA_API_URL={stub.url} para importar dele. Ctrl+C encerra.")
+        stub.start()
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            stub.stop()
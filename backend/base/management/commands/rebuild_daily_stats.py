@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from base.indicators import bump_indicators_version
+from base.rollups import rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = "Reconstrói a tabela de agregados diários (DailyAsteroidStats) a partir dos asteroides."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            stats = rebuild_daily_stats()
+        bump_indicators_version()
+        self.stdout.write(self.style.SUCCESS(f"Agregados reconstruídos para {len(stats)} dias."))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from base.indicators import bump_indicators_version
+from base.seeding import clear_synthetic, seed_asteroids
+
+MIN_COUNT = 10_000
+MAX_COUNT = 10_000_000
+
+
+class Command(BaseCommand):
+    help = "Insere asteroides sintéticos (para benchmarks) distribuídos pelos últimos dias."
+
+    def add_arguments(self, parser):
+        parser.add_argument('count', type=int, help=f"Quantidade de asteroides ({MIN_COUNT} a {MAX_COUNT}).")
+        parser.add_argument('--days', type=int, default=365, help="Quantidade de dias até hoje. Padrão: 365.")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Linhas por INSERT.")
+        parser.add_argument('--seed', type=int, default=42, help="Semente do gerador (mesma semente, mesmos dados).")
+        parser.add_argument('--clear', action='store_true', help="Remove os asteroides sintéticos antes de inserir.")
+        parser.add_argument('--force', action='store_true', help="Aceita quantidades fora do intervalo recomendado.")
+
+    def handle(self, *args, **options):
+        count = options['count']
+        if not options['force'] and not MIN_COUNT <= count <= MAX_COUNT:
+            raise CommandError(f"A quantidade deve estar entre {MIN_COUNT} e {MAX_COUNT} (use --force para ignorar).")
+        if count <= 0 or options['days'] <= 0:
+            raise CommandError("A quantidade e o número de dias devem ser positivos.")
+
+        if options['clear']:
+            self.stdout.write(f"{clear_synthetic()} asteroides sintéticos removidos.")
+
+        def progress(inserted):
+            self.stdout.write(f"{inserted}/{count} inseridos")
+
+        inserted = seed_asteroids(
+            count, days=options['days'], batch_size=options['batch_size'], seed=options['seed'], progress=progress,
+        )
+        bump_indicators_version()
+        self.stdout.write(self.style.SUCCESS(f"{inserted} asteroides sintéticos inseridos em {options['days']} dias."))
@@ -0,0 +1,69 @@
+import logging
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from base.routers import close_stale_connections
+from base.sync import get_state, run_cycle
+
+from .import_asteroids import _parse_date
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = ("Sincroniza continuamente o feed da NASA: dias novos após a marca d'água, "
+            "revisões dos últimos dias e lacunas em imported_date.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=settings.NASA_SYNC_INTERVAL,
+                            help="Segundos de espera entre um ciclo e o próximo.")
+        parser.add_argument('--refresh-days', type=int, default=settings.NASA_SYNC_REFRESH_DAYS,
+                            help="Dias recentes (incluindo hoje) buscados de novo na NASA a cada ciclo.")
+        parser.add_argument('--start-date',
+                            help="Primeiro dia sincronizado (YYYY-MM-DD). Padrão: NASA_SYNC_START_DATE "
+                                 "ou a primeira data importada.")
+        parser.add_argument('--max-days', type=int, default=settings.NASA_IMPORT_MAX_DAYS,
+                            help="Máximo de dias importados por ciclo.")
+        parser.add_argument('--workers', type=int, default=settings.NASA_IMPORT_MAX_WORKERS,
+                            help="Número máximo de requisições simultâneas à NASA.")
+        parser.add_argument('--once', action='store_true', help="Executa um único ciclo e encerra.")
+
+    def handle(self, *args, **options):
+        stop = threading.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, lambda *_: stop.set())
+
+        start_date = _parse_date(options['start_date']) if options['start_date'] else None
+        state = get_state()
+        self.stdout.write(f"Sincronização iniciada (marca d'água: {state.watermark or 'nenhuma'}).")
+
+        while not stop.is_set():
+            close_stale_connections()
+            try:
+                summary = run_cycle(
+                    refresh_days=options['refresh_days'], start_date=start_date, max_days=options['max_days'],
+                    max_workers=options['workers'], should_stop=stop.is_set,
+                )
+            except Exception:
+                # O erro fica no SyncState; o próximo ciclo tenta de novo
+                logger.exception("Falha no ciclo de sincronização")
+                self.stderr.write("Falha no ciclo de sincronização; nova tentativa no próximo ciclo.")
+            else:
+                line = (
+                    f"Ciclo: {summary['new_days']} dias novos, {summary['refreshed_days']} buscados de novo, "
+                    f"{summary['gap_days']} lacunas; {summary['imported']} asteroides importados "
+                    f"({summary['inserted']} inseridos, {summary['updated']} atualizados). "
+                    f"Marca d'água: {summary['watermark']}."
+                )
+                if summary['failed_days']:
+                    self.stdout.write(self.style.WARNING(f"{line} Dias com erro: {', '.join(summary['failed_days'])}."))
+                else:
+                    self.stdout.write(line)
+            if options['once']:
+                break
+            stop.wait(options['interval'])
+
+        self.stdout.write("Sincronização encerrada.")
@@ -0,0 +1,179 @@
+# metrics.py
+"""
+Medições por requisição e histogramas agregados no formato texto do Prometheus.
+
+O middleware (base.middleware.RequestMetricsMiddleware) abre um RequestTimings
+no contextvar de cada requisição (views síncronas ou assíncronas); qualquer trecho de código pode somar tempo a
+uma fase com `timed('fase')` (o cliente da NASA usa 'nasa'), sem custo quando
+não há requisição em andamento. Os histogramas ficam em memória, por processo.
+"""
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250)
+
+_current = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    __slots__ = ('phases', 'db_queries')
+
+    def __init__(self):
+        self.phases = {}
+        self.db_queries = 0
+
+    def add(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def server_timing(self, total):
+        """Valor do cabeçalho Server-Timing (durações em ms)."""
+        other = total - sum(self.phases.values())
+        parts = [f'total;dur={total * 1000:.1f}', f'app;dur={max(other, 0) * 1000:.1f}']
+        parts.append(f'db;dur={self.phases.get("db", 0) * 1000:.1f};desc="{self.db_queries} consultas"')
+        for phase, seconds in self.phases.items():
+            if phase != 'db':
+                parts.append(f'{phase};dur={seconds * 1000:.1f}')
+        return ', '.join(parts)
+
+
+def start_request():
+    """Abre as medições da requisição atual. Retorna (timings, token para end_request)."""
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def current_timings():
+    return _current.get()
+
+
+@contextmanager
+def timed(phase):
+    """Soma a duração do bloco à fase `phase` da requisição atual (se houver)."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, perf_counter() - start)
+
+
+def install_db_wrapper(sender=None, connection=None, **kwargs):
+    """
+    Receptor de connection_created: instala db_execute_wrapper na conexão.
+    Fica instalado enquanto a conexão existir, então também mede as consultas
+    que o ORM assíncrono executa em outras threads (o contextvar as acompanha).
+    """
+    if db_execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(db_execute_wrapper)
+
+
+def db_execute_wrapper(execute, sql, params, many, context):
+    """execute_wrapper do Django: conta as consultas e soma o tempo na fase 'db'."""
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.db_queries += 1
+        timings.add('db', perf_counter() - start)
+
+
+def _labels(labels):
+    escape = lambda value: str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+    return ','.join(f'{key}="{escape(value)}"' for key, value in labels)
+
+
+class MetricsRegistry:
+    """Contadores e histogramas cumulativos, serializados no formato texto 0.0.4 do Prometheus."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._help = {}
+
+    def describe(self, name, kind, help_text, buckets=None):
+        self._help[name] = (kind, help_text, buckets)
+
+    def inc(self, name, labels, value=1):
+        key = (name, tuple(labels.items()))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        buckets = self._help[name][2]
+        key = (name, tuple(labels.items()))
+        with self._lock:
+            entry = self._histograms.get(key)
+            if entry is None:
+                entry = self._histograms[key] = [[0] * len(buckets), 0.0, 0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self):
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self._histograms.items())
+
+        lines = []
+        for name, (kind, help_text, buckets) in self._help.items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            if kind == 'counter':
+                for (metric, labels), value in counters:
+                    if metric == name:
+                        lines.append(f'{name}{{{_labels(labels)}}} {value}')
+                continue
+            for (metric, labels), (counts, total, count) in histograms:
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, bucket_count in zip(buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{{{_labels(labels + (("le", bound),))}}} {cumulative}')
+                lines.append(f'{name}_bucket{{{_labels(labels + (("le", "+Inf"),))}}} {count}')
+                lines.append(f'{name}_sum{{{_labels(labels)}}} {total}')
+                lines.append(f'{name}_count{{{_labels(labels)}}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+registry.describe('http_requests_total', 'counter', 'Requisições atendidas, por view, método e status.')
+registry.describe('http_request_duration_seconds', 'histogram', 'Tempo total da requisição.', DURATION_BUCKETS)
+registry.describe('http_request_db_seconds', 'histogram', 'Tempo gasto em consultas ao banco por requisição.', DURATION_BUCKETS)
+registry.describe('http_request_db_queries', 'histogram', 'Consultas ao banco por requisição.', QUERY_BUCKETS)
+registry.describe('http_request_render_seconds', 'histogram', 'Tempo de serialização/renderização da resposta.', DURATION_BUCKETS)
+registry.describe('http_request_nasa_seconds', 'histogram', 'Tempo gasto em chamadas à API da NASA por requisição.', DURATION_BUCKETS)
+
+
+def record_request(view, method, status_code, total, timings):
+    registry.inc('http_requests_total', {'view': view, 'method': method, 'status': status_code})
+    labels = {'view': view, 'method': method}
+    registry.observe('http_request_duration_seconds', labels, total)
+    registry.observe('http_request_db_seconds', labels, timings.phases.get('db', 0.0))
+    registry.observe('http_request_db_queries', labels, timings.db_queries)
+    if 'render' in timings.phases:
+        registry.observe('http_request_render_seconds', labels, timings.phases['render'])
+    if 'nasa' in timings.phases:
+        registry.observe('http_request_nasa_seconds', labels, timings.phases['nasa'])
@@ -0,0 +1,57 @@
+# middleware.py
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .metrics import end_request, record_request, start_request
+
+
+class RequestMetricsMiddleware:
+    """
+    Mede cada requisição (tempo total, consultas e tempo no banco, renderização
+    da resposta e chamadas à NASA), envia as medidas no cabeçalho Server-Timing
+    e as agrega nos histogramas expostos em /metrics.
+
+    Deve ser o primeiro middleware, para que o tempo total inclua os demais.
+    Funciona nos dois modos (WSGI e ASGI), sem forçar as views assíncronas a
+    rodar em uma thread. A renderização é medida no próprio renderer
+    (api.renderers), que as views dos dois modos usam.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timings, token = start_request()
+        start = perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            end_request(token)
+        return self._finish(request, response, timings, perf_counter() - start)
+
+    async def __acall__(self, request):
+        timings, token = start_request()
+        start = perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_request(token)
+        return self._finish(request, response, timings, perf_counter() - start)
+
+    def _finish(self, request, response, timings, total):
+        match = request.resolver_match
+        view = match.view_name if match else 'unmatched'
+        record_request(view, request.method, response.status_code, total, timings)
+        if settings.SERVER_TIMING_HEADER:
+            response['Server-Timing'] = timings.server_timing(total)
+        return response
+
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.4 on 2026-10-18 17:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0004_delete_item'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='asteroid',
+            name='neo_reference_id',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='asteroid',
+            constraint=models.UniqueConstraint(fields=('imported_date', 'neo_reference_id'), name='unique_asteroid_per_day'),
+        ),
+    ]
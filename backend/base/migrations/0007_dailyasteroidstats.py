@@ -0,0 +1,65 @@
+# Generated by Django 5.2.4 on 2026-10-18 17:51
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Q, Sum
+
+
+def populate_daily_stats(apps, schema_editor):
+    Asteroid = apps.get_model('base', 'Asteroid')
+    DailyAsteroidStats = apps.get_model('base', 'DailyAsteroidStats')
+
+    totals = Asteroid.objects.values('imported_date').annotate(
+        asteroid_count=Count('id'),
+        hazardous_count=Count('id', filter=Q(is_potentially_hazardous_asteroid=True)),
+        sentry_count=Count('id', filter=Q(is_sentry_object=True)),
+        sum_velocity_km_per_second=Sum('relative_velocity_km_per_second'),
+        sum_diameter_min_meters=Sum('estimated_diameter_min_meters'),
+        sum_diameter_max_meters=Sum('estimated_diameter_max_meters'),
+        max_velocity_km_per_second=Max('relative_velocity_km_per_second'),
+        min_velocity_km_per_second=Min('relative_velocity_km_per_second'),
+        max_diameter_meters=Max('estimated_diameter_max_meters'),
+        min_diameter_meters=Min('estimated_diameter_min_meters'),
+    ).order_by('imported_date')
+
+    for row in totals:
+        day = Asteroid.objects.filter(imported_date=row['imported_date'])
+        DailyAsteroidStats.objects.create(
+            **row,
+            max_velocity_name=day.order_by('-relative_velocity_km_per_second', 'id').values_list('name', flat=True)[0],
+            min_velocity_name=day.order_by('relative_velocity_km_per_second', 'id').values_list('name', flat=True)[0],
+            max_diameter_name=day.order_by('-estimated_diameter_max_meters', 'id').values_list('name', flat=True)[0],
+            min_diameter_name=day.order_by('estimated_diameter_min_meters', 'id').values_list('name', flat=True)[0],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0006_importjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyAsteroidStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('imported_date', models.DateField(unique=True)),
+                ('asteroid_count', models.PositiveIntegerField(default=0)),
+                ('hazardous_count', models.PositiveIntegerField(default=0)),
+                ('sentry_count', models.PositiveIntegerField(default=0)),
+                ('sum_velocity_km_per_second', models.FloatField(default=0)),
+                ('sum_diameter_min_meters', models.FloatField(default=0)),
+                ('sum_diameter_max_meters', models.FloatField(default=0)),
+                ('max_velocity_km_per_second', models.FloatField(null=True)),
+                ('max_velocity_name', models.CharField(blank=True, max_length=255)),
+                ('min_velocity_km_per_second', models.FloatField(null=True)),
+                ('min_velocity_name', models.CharField(blank=True, max_length=255)),
+                ('max_diameter_meters', models.FloatField(null=True)),
+                ('max_diameter_name', models.CharField(blank=True, max_length=255)),
+                ('min_diameter_meters', models.FloatField(null=True)),
+                ('min_diameter_name', models.CharField(blank=True, max_length=255)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(populate_daily_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-18 17:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0007_dailyasteroidstats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='asteroid',
+            index=models.Index(fields=['imported_date', 'id'], name='asteroid_date_id_idx'),
+        ),
+    ]
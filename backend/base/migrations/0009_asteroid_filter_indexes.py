@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-18 17:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0008_asteroid_date_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='asteroid',
+            index=models.Index(fields=['relative_velocity_km_per_second', 'id'], name='asteroid_velocity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asteroid',
+            index=models.Index(fields=['estimated_diameter_max_meters', 'id'], name='asteroid_diameter_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asteroid',
+            index=models.Index(fields=['absolute_magnitude_h', 'id'], name='asteroid_magnitude_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asteroid',
+            index=models.Index(condition=models.Q(('is_potentially_hazardous_asteroid', True)), fields=['imported_date', 'id'], name='asteroid_hazardous_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asteroid',
+            index=models.Index(condition=models.Q(('is_sentry_object', True)), fields=['imported_date', 'id'], name='asteroid_sentry_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0009_asteroid_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CloseApproach',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('approach_at', models.DateTimeField()),
+                ('miss_distance_km', models.FloatField()),
+                ('relative_velocity_km_per_second', models.FloatField()),
+                ('orbiting_body', models.CharField(max_length=20)),
+                ('asteroid', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='close_approaches', to='base.asteroid')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['approach_at', 'id'], name='close_approach_time_idx'), models.Index(fields=['miss_distance_km', 'approach_at'], name='close_approach_distance_idx')],
+                'constraints': [models.UniqueConstraint(fields=('asteroid', 'approach_at'), name='unique_close_approach')],
+            },
+        ),
+    ]
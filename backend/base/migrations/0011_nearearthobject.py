@@ -0,0 +1,40 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0010_closeapproach'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NearEarthObject',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('neo_reference_id', models.CharField(blank=True, max_length=20, null=True, unique=True)),
+                ('name', models.CharField(max_length=255)),
+                ('estimated_diameter_min_meters', models.FloatField()),
+                ('estimated_diameter_max_meters', models.FloatField()),
+                ('absolute_magnitude_h', models.FloatField()),
+                ('is_potentially_hazardous_asteroid', models.BooleanField()),
+                ('is_sentry_object', models.BooleanField()),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['estimated_diameter_max_meters'], name='neo_diameter_idx'),
+                    models.Index(fields=['absolute_magnitude_h'], name='neo_magnitude_idx'),
+                    models.Index(condition=models.Q(('is_potentially_hazardous_asteroid', True)), fields=['id'], name='neo_hazardous_idx'),
+                    models.Index(condition=models.Q(('is_sentry_object', True)), fields=['id'], name='neo_sentry_idx'),
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name='asteroid',
+            name='neo',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='observations', to='base.nearearthobject'),
+        ),
+    ]
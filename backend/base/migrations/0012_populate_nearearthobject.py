@@ -0,0 +1,73 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:40
+
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+STATIC_FIELDS = [
+    'name',
+    'estimated_diameter_min_meters',
+    'estimated_diameter_max_meters',
+    'absolute_magnitude_h',
+    'is_potentially_hazardous_asteroid',
+    'is_sentry_object',
+]
+
+BATCH_SIZE = 5000
+
+
+def populate_near_earth_objects(apps, schema_editor):
+    """
+    Cria um NearEarthObject por neo_reference_id (ou por nome, nas linhas
+    anteriores ao neo_reference_id), com as propriedades da observação mais
+    recente, e liga cada observação ao seu objeto.
+    """
+    Asteroid = apps.get_model('base', 'Asteroid')
+    NearEarthObject = apps.get_model('base', 'NearEarthObject')
+
+    rows = (
+        Asteroid.objects
+        .values('neo_reference_id', *STATIC_FIELDS)
+        .order_by('neo_reference_id', 'name', '-imported_date', '-id')
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    batch = []
+    last_key = None
+    for row in rows:
+        key = (row['neo_reference_id'], None if row['neo_reference_id'] else row['name'])
+        if key == last_key:
+            continue
+        last_key = key
+        batch.append(NearEarthObject(**row))
+        if len(batch) >= BATCH_SIZE:
+            NearEarthObject.objects.bulk_create(batch)
+            batch = []
+    NearEarthObject.objects.bulk_create(batch)
+
+    Asteroid.objects.filter(neo_reference_id__isnull=False).update(neo=Subquery(
+        NearEarthObject.objects.filter(neo_reference_id=OuterRef('neo_reference_id')).values('id')[:1]
+    ))
+    Asteroid.objects.filter(neo_reference_id__isnull=True).update(neo=Subquery(
+        NearEarthObject.objects.filter(neo_reference_id__isnull=True, name=OuterRef('name')).values('id')[:1]
+    ))
+
+
+def restore_observation_fields(apps, schema_editor):
+    Asteroid = apps.get_model('base', 'Asteroid')
+    NearEarthObject = apps.get_model('base', 'NearEarthObject')
+
+    neo = NearEarthObject.objects.filter(id=OuterRef('neo_id'))
+    Asteroid.objects.update(**{
+        name: Subquery(neo.values(name)[:1])
+        for name in ['neo_reference_id', *STATIC_FIELDS]
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0011_nearearthobject'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_near_earth_objects, restore_observation_fields),
+    ]
@@ -0,0 +1,121 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Exists, Max, Min, OuterRef, Q, Sum
+
+
+def remove_duplicate_observations(apps, schema_editor):
+    """
+    Antes da unicidade (neo, imported_date): importar o mesmo dia duas vezes
+    deixava linhas repetidas (as sem neo_reference_id escapavam da restrição
+    antiga). Mantém a observação mais recente (maior id) de cada objeto por dia
+    e refaz os agregados diários dos dias afetados.
+    """
+    Asteroid = apps.get_model('base', 'Asteroid')
+    DailyAsteroidStats = apps.get_model('base', 'DailyAsteroidStats')
+
+    newer = Asteroid.objects.filter(neo=OuterRef('neo'), imported_date=OuterRef('imported_date'), id__gt=OuterRef('id'))
+    duplicates = Asteroid.objects.filter(Exists(newer))
+    days = set(duplicates.values_list('imported_date', flat=True))
+    if not days:
+        return
+
+    # Sem gatilhos de FK pendentes na tabela, que o ALTER TABLE seguinte recusaria (PostgreSQL)
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+    duplicates.delete()
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('SET CONSTRAINTS ALL DEFERRED')
+
+    totals = Asteroid.objects.filter(imported_date__in=days).values('imported_date').annotate(
+        asteroid_count=Count('id'),
+        hazardous_count=Count('id', filter=Q(is_potentially_hazardous_asteroid=True)),
+        sentry_count=Count('id', filter=Q(is_sentry_object=True)),
+        sum_velocity_km_per_second=Sum('relative_velocity_km_per_second'),
+        sum_diameter_min_meters=Sum('estimated_diameter_min_meters'),
+        sum_diameter_max_meters=Sum('estimated_diameter_max_meters'),
+        max_velocity_km_per_second=Max('relative_velocity_km_per_second'),
+        min_velocity_km_per_second=Min('relative_velocity_km_per_second'),
+        max_diameter_meters=Max('estimated_diameter_max_meters'),
+        min_diameter_meters=Min('estimated_diameter_min_meters'),
+    ).order_by('imported_date')
+
+    DailyAsteroidStats.objects.filter(imported_date__in=days).delete()
+    for row in totals:
+        day = Asteroid.objects.filter(imported_date=row['imported_date'])
+        DailyAsteroidStats.objects.create(
+            **row,
+            max_velocity_name=day.order_by('-relative_velocity_km_per_second', 'id').values_list('name', flat=True)[0],
+            min_velocity_name=day.order_by('relative_velocity_km_per_second', 'id').values_list('name', flat=True)[0],
+            max_diameter_name=day.order_by('-estimated_diameter_max_meters', 'id').values_list('name', flat=True)[0],
+            min_diameter_name=day.order_by('estimated_diameter_min_meters', 'id').values_list('name', flat=True)[0],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0012_populate_nearearthobject'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_observations, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='asteroid',
+            name='unique_asteroid_per_day',
+        ),
+        migrations.RemoveIndex(
+            model_name='asteroid',
+            name='asteroid_diameter_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='asteroid',
+            name='asteroid_magnitude_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='asteroid',
+            name='asteroid_hazardous_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='asteroid',
+            name='asteroid_sentry_idx',
+        ),
+        migrations.AlterField(
+            model_name='asteroid',
+            name='neo',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='observations', to='base.nearearthobject'),
+        ),
+        migrations.AddConstraint(
+            model_name='asteroid',
+            constraint=models.UniqueConstraint(fields=('neo', 'imported_date'), name='unique_asteroid_per_day'),
+        ),
+        migrations.RemoveField(
+            model_name='asteroid',
+            name='neo_reference_id',
+        ),
+        migrations.RemoveField(
+            model_name='asteroid',
+            name='name',
+        ),
+        migrations.RemoveField(
+            model_name='asteroid',
+            name='estimated_diameter_min_meters',
+        ),
+        migrations.RemoveField(
+            model_name='asteroid',
+            name='estimated_diameter_max_meters',
+        ),
+        migrations.RemoveField(
+            model_name='asteroid',
+            name='absolute_magnitude_h',
+        ),
+        migrations.RemoveField(
+            model_name='asteroid',
+            name='is_potentially_hazardous_asteroid',
+        ),
+        migrations.RemoveField(
+            model_name='asteroid',
+            name='is_sentry_object',
+        ),
+    ]
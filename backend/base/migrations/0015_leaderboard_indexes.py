@@ -0,0 +1,37 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0014_syncstate'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='asteroid',
+            name='asteroid_velocity_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='nearearthobject',
+            name='neo_diameter_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='nearearthobject',
+            name='neo_magnitude_idx',
+        ),
+        migrations.AddIndex(
+            model_name='asteroid',
+            index=models.Index(fields=['relative_velocity_km_per_second', 'id', 'imported_date', 'neo'], name='asteroid_velocity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='nearearthobject',
+            index=models.Index(fields=['estimated_diameter_max_meters', 'id'], name='neo_diameter_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='nearearthobject',
+            index=models.Index(fields=['absolute_magnitude_h', 'id'], name='neo_magnitude_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:19
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def start_running_leases(apps, schema_editor):
+    """Jobs já em execução contam como primeira tentativa, com o lease a partir do início."""
+    ImportJob = apps.get_model('base', 'ImportJob')
+    ImportJob.objects.filter(status='running').update(heartbeat_at=F('started_at'), attempts=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0015_leaderboard_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(start_running_leases, migrations.RunPython.noop),
+    ]
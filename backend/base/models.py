@@ -1,16 +1,211 @@
+from django.conf import settings
 from django.db import models
 from datetime import date
 
 # Create your models here.
-class Asteroid(models.Model):
+class NearEarthObject(models.Model):
+    """
+    Um objeto do feed da NASA e suas propriedades estáticas (atualizadas a
+    cada importação); as observações por dia ficam em Asteroid.
+    """
+    # Identificador do objeto na NASA (nulo apenas em dados anteriores a ele)
+    neo_reference_id = models.CharField(max_length=20, unique=True, null=True, blank=True)
     name = models.CharField(max_length=255)
     estimated_diameter_min_meters = models.FloatField()
     estimated_diameter_max_meters = models.FloatField()
-    relative_velocity_km_per_second = models.FloatField()
     absolute_magnitude_h = models.FloatField()
     is_potentially_hazardous_asteroid = models.BooleanField()
     is_sentry_object = models.BooleanField()
+
+    class Meta:
+        indexes = [
+            # Filtros/ordenações da listagem e rankings (base/leaderboards.py) por
+            # propriedades do objeto; o id desempata na ordem do índice
+            models.Index(fields=['estimated_diameter_max_meters', 'id'], name='neo_diameter_idx'),
+            models.Index(fields=['absolute_magnitude_h', 'id'], name='neo_magnitude_idx'),
+            # Índices parciais: poucos objetos são perigosos/Sentry; também
+            # atendem às contagens de objetos únicos dos indicadores
+            models.Index(fields=['id'], name='neo_hazardous_idx',
+                         condition=models.Q(is_potentially_hazardous_asteroid=True)),
+            models.Index(fields=['id'], name='neo_sentry_idx',
+                         condition=models.Q(is_sentry_object=True)),
+        ]
+
+    def __str__(self):
+        return self.name
+
+# Campos do objeto expostos em cada observação, como se fossem da própria tabela
+NEO_FIELDS = [
+    'neo_reference_id',
+    'name',
+    'estimated_diameter_min_meters',
+    'estimated_diameter_max_meters',
+    'absolute_magnitude_h',
+    'is_potentially_hazardous_asteroid',
+    'is_sentry_object',
+]
+
+# Campos de um asteroide na API (listagem, detalhe e exportação), nesta ordem
+ASTEROID_FIELDS = [
+    'id',
+    'neo_reference_id',
+    'name',
+    'estimated_diameter_min_meters',
+    'estimated_diameter_max_meters',
+    'relative_velocity_km_per_second',
+    'absolute_magnitude_h',
+    'is_potentially_hazardous_asteroid',
+    'is_sentry_object',
+    'imported_date',
+]
+
+class AsteroidManager(models.Manager):
+    """
+    Anota os campos do NearEarthObject em cada observação (name=F('neo__name')
+    etc.), para que filtros, ordenações, values() e agregações continuem
+    usando os mesmos nomes de antes da separação das tabelas.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().annotate(**{name: models.F(f'neo__{name}') for name in NEO_FIELDS})
+
+class Asteroid(models.Model):
+    """Observação de um NearEarthObject em um dia de importação."""
+    neo = models.ForeignKey(NearEarthObject, on_delete=models.CASCADE, related_name='observations')
+    relative_velocity_km_per_second = models.FloatField()
     imported_date = models.DateField(default=date.today)
 
+    objects = AsteroidManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['neo', 'imported_date'], name='unique_asteroid_per_day'),
+        ]
+        indexes = [
+            # Ordem da paginação por cursor da listagem
+            models.Index(fields=['imported_date', 'id'], name='asteroid_date_id_idx'),
+            # Filtros/ordenações da listagem (ordering=... com o id desempatando) e
+            # ranking de velocidade: a data e o objeto no índice cobrem o filtro por
+            # intervalo e o join sem ler a tabela
+            models.Index(fields=['relative_velocity_km_per_second', 'id', 'imported_date', 'neo'],
+                         name='asteroid_velocity_idx'),
+        ]
+
+    def __str__(self):
+        return getattr(self, 'name', None) or self.neo.name
+
+class CloseApproach(models.Model):
+    """Cada aproximação de close_approach_data de um asteroide no feed da NASA."""
+    asteroid = models.ForeignKey(Asteroid, on_delete=models.CASCADE, related_name='close_approaches')
+    approach_at = models.DateTimeField()
+    miss_distance_km = models.FloatField()
+    relative_velocity_km_per_second = models.FloatField()
+    orbiting_body = models.CharField(max_length=20)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['asteroid', 'approach_at'], name='unique_close_approach'),
+        ]
+        indexes = [
+            # Janela de tempo, na ordem da paginação por cursor
+            models.Index(fields=['approach_at', 'id'], name='close_approach_time_idx'),
+            # "Mais próximas que X": seletivo quando a distância é pequena
+            models.Index(fields=['miss_distance_km', 'approach_at'], name='close_approach_distance_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.asteroid} em {self.approach_at:%Y-%m-%d %H:%M} ({self.miss_distance_km:.0f} km)"
+
+class DailyAsteroidStats(models.Model):
+    """
+    Agregados por dia de importação, mantidos pela importação (na mesma
+    transação) e reconstruídos por `manage.py rebuild_daily_stats`.
+    """
+    imported_date = models.DateField(unique=True)
+    asteroid_count = models.PositiveIntegerField(default=0)
+    hazardous_count = models.PositiveIntegerField(default=0)
+    sentry_count = models.PositiveIntegerField(default=0)
+    sum_velocity_km_per_second = models.FloatField(default=0)
+    sum_diameter_min_meters = models.FloatField(default=0)
+    sum_diameter_max_meters = models.FloatField(default=0)
+    max_velocity_km_per_second = models.FloatField(null=True)
+    max_velocity_name = models.CharField(max_length=255, blank=True)
+    min_velocity_km_per_second = models.FloatField(null=True)
+    min_velocity_name = models.CharField(max_length=255, blank=True)
+    max_diameter_meters = models.FloatField(null=True)
+    max_diameter_name = models.CharField(max_length=255, blank=True)
+    min_diameter_meters = models.FloatField(null=True)
+    min_diameter_name = models.CharField(max_length=255, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.imported_date}: {self.asteroid_count} asteroides"
+
+
+class ImportJob(models.Model):
+    """Importação enfileirada por POST /importar/ e executada pelo import_worker."""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pendente'),
+        (RUNNING, 'Em execução'),
+        (SUCCEEDED, 'Concluída'),
+        (FAILED, 'Falhou'),
+    ]
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    start_date = models.DateField()
+    end_date = models.DateField()
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
+    worker = models.CharField(max_length=255, blank=True)
+    days_total = models.PositiveIntegerField(default=0)
+    days_done = models.PositiveIntegerField(default=0)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Renovado a cada janela importada; um job em execução sem sinal por
+    # IMPORT_JOB_LEASE_SECONDS é considerado abandonado (worker morto)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='importjob_status_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"Importação {self.start_date} a {self.end_date} ({self.status})"
+
+
+class SyncState(models.Model):
+    """
+    Marca d'água da sincronização contínua (`manage.py sync_asteroids`): o
+    último dia até o qual o feed foi importado sem lacunas e o resultado do
+    último ciclo.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    watermark = models.DateField(null=True, blank=True)
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    last_success_at = models.DateTimeField(null=True, blank=True)
+    last_result = models.JSONField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    def __str__(self):
+        return f"Sincronização {self.name} até {self.watermark or '-'}"
+
+
+class PrimaryPin(models.Model):
+    """
+    Até quando as leituras ficam fixadas no primário depois de uma importação
+    (base/routers.py). Uma linha só, lida e gravada sempre no primário, para
+    que os processos web vejam as marcas deixadas pelo worker e pela
+    sincronização.
+    """
+    pinned_until = models.DateTimeField()
+
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return f"Leituras no primário até {self.pinned_until:%Y-%m-%d %H:%M:%S}"
@@ -0,0 +1,317 @@
+# nasa.py
+"""
+Cliente do endpoint de feed de Near Earth Objects da NASA.
+
+Todas as importações usam o mesmo NasaClient (get_client()), que mantém:
+- uma sessão HTTP com pool de conexões reaproveitáveis;
+- timeouts de conexão e leitura em todas as chamadas;
+- novas tentativas com backoff exponencial e jitter em 429, 5xx e falhas de rede
+  (respeitando Retry-After quando a NASA informa);
+- um token bucket alimentado pelos cabeçalhos X-RateLimit-Limit/Remaining, que
+  segura as chamadas antes de a cota acabar;
+- contadores de chamadas, novas tentativas, falhas e latência.
+
+AsyncNasaClient faz o mesmo com o httpx (asyncio), para buscar várias janelas
+do feed concorrentemente em uma única thread (base.importer.aimport_range).
+"""
+import asyncio
+import random
+import threading
+import time
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from requests.adapters import HTTPAdapter
+
+from .metrics import timed
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - httpx está no requirements.txt
+    httpx = None
+
+# A API de feed da NASA aceita no máximo 7 dias por requisição
+FEED_MAX_DAYS = 7
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class NasaFeedError(Exception):
+    """Falha ao obter ou interpretar o feed da NASA."""
+
+
+def feed_windows(start_date, end_date, size=FEED_MAX_DAYS):
+    """Divide o intervalo [start_date, end_date] em janelas de até `size` dias."""
+    windows = []
+    current = start_date
+    while current <= end_date:
+        window_end = min(current + timedelta(days=size - 1), end_date)
+        windows.append((current, window_end))
+        current = window_end + timedelta(days=1)
+    return windows
+
+
+class RateLimiter:
+    """
+    Token bucket com capacidade e saldo informados pela própria API
+    (X-RateLimit-Limit por hora e X-RateLimit-Remaining). Enquanto a API não
+    informa nada, não limita. `reserve` tokens nunca são usados, para sobrar
+    cota para outros consumidores da mesma chave; com uma cota que não passa
+    da reserva, a reserva efetiva é limit - 1 (uma chamada por vez, com o
+    bucket cheio). Cota zero é um erro (NasaFeedError), não uma espera sem fim.
+    """
+
+    def __init__(self, reserve=0, period=3600.0, clock=time.monotonic, sleep=time.sleep):
+        self.reserve = reserve
+        self.period = period
+        self.limit = None
+        self.tokens = None
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        if self.limit is not None:
+            self.tokens = min(self.limit, self.tokens + (now - self._updated) * self.limit / self.period)
+        self._updated = now
+
+    def _try_acquire(self):
+        """Consome um token se o saldo estiver acima da reserva. Retorna 0 ou o tempo até a reposição."""
+        with self._lock:
+            self._refill()
+            if self.limit is None:
+                return 0.0
+            if self.limit <= 0:
+                raise NasaFeedError(f"A chave da API da NASA não tem cota (X-RateLimit-Limit: {self.limit}).")
+            reserve = min(self.reserve, self.limit - 1)
+            if self.tokens - 1 >= reserve:
+                self.tokens -= 1
+                return 0.0
+            return (reserve + 1 - self.tokens) * self.period / self.limit
+
+    def acquire(self):
+        """Consome um token, esperando a reposição se o saldo chegou à reserva. Retorna o tempo esperado."""
+        waited = 0.0
+        while wait := self._try_acquire():
+            self._sleep(wait)
+            waited += wait
+        return waited
+
+    async def aacquire(self):
+        """Como acquire(), mas espera sem bloquear o event loop."""
+        waited = 0.0
+        while wait := self._try_acquire():
+            await asyncio.sleep(wait)
+            waited += wait
+        return waited
+
+    def update(self, headers):
+        """Ajusta o bucket com os cabeçalhos de rate limit de uma resposta."""
+        try:
+            limit = int(headers['X-RateLimit-Limit'])
+            remaining = int(headers['X-RateLimit-Remaining'])
+        except (KeyError, TypeError, ValueError):
+            return
+        with self._lock:
+            self._refill()
+            self.limit = limit
+            # As chamadas em andamento já foram descontadas localmente
+            self.tokens = remaining if self.tokens is None else min(self.tokens, remaining)
+
+
+class BaseNasaClient:
+    """Configuração, contadores e backoff comuns aos clientes síncrono e assíncrono."""
+
+    def __init__(self, api_key=None, base_url=None, pool_size=None, timeout=None,
+                 max_retries=None, backoff_base=None, backoff_max=None, rate_limit_reserve=None, rate_limiter=None):
+        self.api_key = api_key if api_key is not None else settings.NASA_API_KEY
+        self.base_url = base_url or settings.NASA_API_URL
+        self.timeout = timeout or (settings.NASA_API_CONNECT_TIMEOUT, settings.NASA_API_READ_TIMEOUT)
+        self.max_retries = settings.NASA_API_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = settings.NASA_API_BACKOFF_BASE if backoff_base is None else backoff_base
+        self.backoff_max = settings.NASA_API_BACKOFF_MAX if backoff_max is None else backoff_max
+        self.rate_limiter = rate_limiter or RateLimiter(
+            reserve=settings.NASA_API_RATE_LIMIT_RESERVE if rate_limit_reserve is None else rate_limit_reserve
+        )
+        self.pool_size = pool_size or settings.NASA_IMPORT_MAX_WORKERS
+
+        self._stats_lock = threading.Lock()
+        self._stats = {'calls': 0, 'requests': 0, 'retries': 0, 'failures': 0,
+                       'latency_ms_total': 0.0, 'latency_ms_max': 0.0, 'throttled_ms_total': 0.0}
+
+    # Métricas
+
+    def _record(self, **increments):
+        with self._stats_lock:
+            for key, value in increments.items():
+                if key == 'latency_ms_max':
+                    self._stats[key] = max(self._stats[key], value)
+                else:
+                    self._stats[key] += value
+
+    def stats(self):
+        """Cópia dos contadores acumulados (chamadas, requisições, novas tentativas, falhas e latências)."""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    # Requisições
+
+    def _backoff(self, attempt, response=None):
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max)
+        # Backoff exponencial com "full jitter"
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _give_up(self, attempt, error):
+        return NasaFeedError(
+            f"Erro ao conectar ou receber dados da API da NASA após {attempt + 1} tentativas: {error}"
+        )
+
+
+class NasaClient(BaseNasaClient):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def close(self):
+        self.session.close()
+
+    def get(self, params):
+        """GET no endpoint com novas tentativas. Retorna o JSON da resposta."""
+        with timed('nasa'):
+            return self._get(params)
+
+    def _get(self, params):
+        params = {**params, 'api_key': self.api_key}
+        start = time.perf_counter()
+        attempt = 0
+        try:
+            while True:
+                throttled = self.rate_limiter.acquire()
+                self._record(requests=1, throttled_ms_total=throttled * 1000)
+                response = None
+                try:
+                    response = self.session.get(self.base_url, params=params, timeout=self.timeout)
+                    self.rate_limiter.update(response.headers)
+                    if response.status_code not in RETRY_STATUS_CODES:
+                        response.raise_for_status()
+                        return response.json()
+                    error = requests.exceptions.HTTPError(f"{response.status_code} {response.reason}", response=response)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    error = e
+                except (requests.exceptions.RequestException, ValueError) as e:
+                    raise NasaFeedError(f"Erro ao conectar ou receber dados da API da NASA: {e}") from e
+
+                if attempt >= self.max_retries:
+                    raise self._give_up(attempt, error) from error
+                time.sleep(self._backoff(attempt, response))
+                attempt += 1
+                self._record(retries=1)
+        except NasaFeedError:
+            self._record(failures=1)
+            raise
+        finally:
+            latency_ms = (time.perf_counter() - start) * 1000
+            self._record(calls=1, latency_ms_total=latency_ms, latency_ms_max=latency_ms)
+
+    def get_feed(self, start_date, end_date):
+        """
+        Busca o feed da NASA para o intervalo informado e retorna o dicionário
+        `near_earth_objects` ({'YYYY-MM-DD': [neo, ...]}).
+        """
+        data = self.get({'start_date': start_date.isoformat(), 'end_date': end_date.isoformat()})
+        return data.get('near_earth_objects', {})
+
+
+class AsyncNasaClient(BaseNasaClient):
+    """
+    Versão assíncrona do NasaClient (httpx.AsyncClient), com as mesmas novas
+    tentativas, cota e contadores. O pool de conexões pertence ao event loop
+    em que o cliente foi criado; use um cliente por execução, com `async with`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        if httpx is None:
+            raise ImproperlyConfigured("AsyncNasaClient requer o pacote httpx.")
+        super().__init__(*args, **kwargs)
+        connect_timeout, read_timeout = self.timeout
+        self.session = httpx.AsyncClient(
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.session.aclose()
+
+    async def get(self, params):
+        """GET no endpoint com novas tentativas. Retorna o JSON da resposta."""
+        with timed('nasa'):
+            return await self._get(params)
+
+    async def _get(self, params):
+        params = {**params, 'api_key': self.api_key}
+        start = time.perf_counter()
+        attempt = 0
+        try:
+            while True:
+                throttled = await self.rate_limiter.aacquire()
+                self._record(requests=1, throttled_ms_total=throttled * 1000)
+                response = None
+                try:
+                    response = await self.session.get(self.base_url, params=params)
+                    self.rate_limiter.update(response.headers)
+                    if response.status_code not in RETRY_STATUS_CODES:
+                        response.raise_for_status()
+                        return response.json()
+                    error = httpx.HTTPStatusError(f"{response.status_code} {response.reason_phrase}",
+                                                  request=response.request, response=response)
+                except httpx.TransportError as e:
+                    error = e
+                except (httpx.HTTPError, ValueError) as e:
+                    raise NasaFeedError(f"Erro ao conectar ou receber dados da API da NASA: {e}") from e
+
+                if attempt >= self.max_retries:
+                    raise self._give_up(attempt, error) from error
+                await asyncio.sleep(self._backoff(attempt, response))
+                attempt += 1
+                self._record(retries=1)
+        except NasaFeedError:
+            self._record(failures=1)
+            raise
+        finally:
+            latency_ms = (time.perf_counter() - start) * 1000
+            self._record(calls=1, latency_ms_total=latency_ms, latency_ms_max=latency_ms)
+
+    async def get_feed(self, start_date, end_date):
+        """Como NasaClient.get_feed()."""
+        data = await self.get({'start_date': start_date.isoformat(), 'end_date': end_date.isoformat()})
+        return data.get('near_earth_objects', {})
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Cliente compartilhado pelo processo (mesmo pool de conexões e mesmo controle de cota)."""
+    global _client
+    with _client_lock:
+        if _client is None or _client.base_url != settings.NASA_API_URL:
+            if _client is not None:
+                _client.close()
+            _client = NasaClient()
+        return _client
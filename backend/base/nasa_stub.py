@@ -0,0 +1,156 @@
+# nasa_stub.py
+"""
+Servidor HTTP local que imita o endpoint de feed da NASA.
+
+Gera payloads determinísticos (mesma data -> mesmos asteroides; o mesmo
+objeto reaparece em dias diferentes do ano), o que permite
+testar a importação sem acessar api.nasa.gov. Também envia os cabeçalhos
+X-RateLimit-* e pode falhar as próximas N requisições (fail_next), para testar
+o cliente (base.nasa), e atrasar as respostas (delay), para simular uma busca travada.
+"""
+import json
+import random
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FEED_PATH = '/neo/rest/v1/feed'
+
+
+def generate_neo(day, index):
+    """Gera um objeto no formato do feed da NASA para o dia e índice informados."""
+    # O mesmo índice no mesmo ano é o mesmo objeto (id, nome e propriedades
+    # físicas iguais); só os dados da aproximação mudam de um dia para outro.
+    rng = random.Random(f"{day.year}-{index}")
+    approach_rng = random.Random(f"{day.isoformat()}-{index}")
+    neo_id = f"{day.year}{index:06d}"
+    diameter_min = rng.uniform(5, 1500)
+    approach_epoch_ms = int((day - date(1970, 1, 1)).total_seconds() * 1000) + approach_rng.randint(0, 86_399_999)
+    return {
+        'id': neo_id,
+        'neo_reference_id': neo_id,
+        'name': f"({day.year} {chr(65 + index % 26)}{index})",
+        'absolute_magnitude_h': round(rng.uniform(14, 32), 2),
+        'estimated_diameter': {
+            'meters': {
+                'estimated_diameter_min': diameter_min,
+                'estimated_diameter_max': diameter_min * 2.236,
+            },
+        },
+        'is_potentially_hazardous_asteroid': rng.random() < 0.1,
+        'close_approach_data': [
+            {
+                'close_approach_date': day.isoformat(),
+                'epoch_date_close_approach': approach_epoch_ms,
+                'relative_velocity': {'kilometers_per_second': f"{approach_rng.uniform(1, 40):.10f}"},
+                'miss_distance': {'kilometers': f"{approach_rng.uniform(1e5, 7.5e7):.6f}"},
+                'orbiting_body': 'Earth',
+            },
+        ],
+        'is_sentry_object': rng.random() < 0.02,
+    }
+
+
+def generate_feed(start_date, end_date, neos_per_day):
+    near_earth_objects = {}
+    day = start_date
+    while day <= end_date:
+        near_earth_objects[day.isoformat()] = [generate_neo(day, i) for i in range(neos_per_day)]
+        day += timedelta(days=1)
+    return {
+        'element_count': neos_per_day * len(near_earth_objects),
+        'near_earth_objects': near_earth_objects,
+    }
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != FEED_PATH:
+            self._send(404, {'error': 'not found'})
+            return
+
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        with self.server.lock:
+            self.server.requests.append(self.path)
+            self.server.rate_limit_remaining = max(self.server.rate_limit_remaining - 1, 0)
+            status_code = self.server.status_code
+            if self.server.failures:
+                status_code = self.server.failures.pop(0)
+        if status_code != 200:
+            self._send(status_code, {'error': 'stub error'})
+            return
+
+        query = parse_qs(url.query)
+        try:
+            start_date = date.fromisoformat(query['start_date'][0])
+            end_date = date.fromisoformat(query.get('end_date', query['start_date'])[0])
+        except (KeyError, ValueError):
+            self._send(400, {'error': 'invalid dates'})
+            return
+        self._send(200, generate_feed(start_date, end_date, self.server.neos_per_day))
+
+    def _send(self, status_code, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('X-RateLimit-Limit', str(self.server.rate_limit))
+        self.send_header('X-RateLimit-Remaining', str(self.server.rate_limit_remaining))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class NasaStubServer:
+    """
+    Uso:
+        with NasaStubServer(neos_per_day=5) as stub:
+            settings.NASA_API_URL = stub.url
+    """
+
+    def __init__(self, neos_per_day=5, status_code=200, rate_limit=1000, delay=0, host='127.0.0.1', port=0):
+        self.httpd = ThreadingHTTPServer((host, port), _FeedHandler)
+        self.httpd.delay = delay
+        self.httpd.neos_per_day = neos_per_day
+        self.httpd.status_code = status_code
+        self.httpd.rate_limit = rate_limit
+        self.httpd.rate_limit_remaining = rate_limit
+        self.httpd.failures = []
+        self.httpd.requests = []
+        self.httpd.lock = threading.Lock()
+        self._thread = None
+
+    def fail_next(self, count, status_code=503):
+        """As próximas `count` requisições ao feed respondem com `status_code`."""
+        with self.httpd.lock:
+            self.httpd.failures.extend([status_code] * count)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{FEED_PATH}"
+
+    @property
+    def requests(self):
+        return self.httpd.requests
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,101 @@
+# rollups.py
+"""
+Manutenção da tabela DailyAsteroidStats (agregados por dia de importação).
+
+Cada atualização usa duas consultas, independente da quantidade de dias: um
+GROUP BY imported_date para contagens e somas e uma consulta com funções de
+janela particionadas por dia para os extremos (valor e nome).
+"""
+from django.db.models import Count, F, Max, Min, Q, Sum, Window
+from django.db.models.functions import FirstValue
+
+from .models import Asteroid, DailyAsteroidStats
+
+VELOCITY = 'relative_velocity_km_per_second'
+DIAMETER_MIN = 'estimated_diameter_min_meters'
+DIAMETER_MAX = 'estimated_diameter_max_meters'
+
+# prefixo do campo em DailyAsteroidStats -> (campo do Asteroid, decrescente)
+EXTREMES = {
+    'max_velocity': (VELOCITY, True),
+    'min_velocity': (VELOCITY, False),
+    'max_diameter': (DIAMETER_MAX, True),
+    'min_diameter': (DIAMETER_MIN, False),
+}
+
+EXTREME_VALUE_FIELDS = {
+    'max_velocity': 'max_velocity_km_per_second',
+    'min_velocity': 'min_velocity_km_per_second',
+    'max_diameter': 'max_diameter_meters',
+    'min_diameter': 'min_diameter_meters',
+}
+
+STATS_UPDATE_FIELDS = [
+    'asteroid_count', 'hazardous_count', 'sentry_count',
+    'sum_velocity_km_per_second', 'sum_diameter_min_meters', 'sum_diameter_max_meters',
+    *EXTREME_VALUE_FIELDS.values(),
+    *(f'{key}_name' for key in EXTREMES),
+    'updated_at',
+]
+
+
+def _daily_extreme_names(asteroids):
+    """Nome do asteroide em cada extremo, por dia, em uma única consulta."""
+    annotations = {}
+    for key, (field, descending) in EXTREMES.items():
+        order_by = [F(field).desc() if descending else F(field).asc(), F('id').asc()]
+        annotations[f'{key}_name'] = Window(FirstValue('name'), partition_by=[F('imported_date')], order_by=order_by)
+    rows = asteroids.annotate(**annotations).values('imported_date', *annotations).distinct()
+    return {row.pop('imported_date'): row for row in rows}
+
+
+def _compute_daily_stats(asteroids):
+    totals = (
+        asteroids
+        .values('imported_date')
+        .annotate(
+            asteroid_count=Count('id'),
+            hazardous_count=Count('id', filter=Q(is_potentially_hazardous_asteroid=True)),
+            sentry_count=Count('id', filter=Q(is_sentry_object=True)),
+            sum_velocity_km_per_second=Sum(VELOCITY),
+            sum_diameter_min_meters=Sum(DIAMETER_MIN),
+            sum_diameter_max_meters=Sum(DIAMETER_MAX),
+            max_velocity_km_per_second=Max(VELOCITY),
+            min_velocity_km_per_second=Min(VELOCITY),
+            max_diameter_meters=Max(DIAMETER_MAX),
+            min_diameter_meters=Min(DIAMETER_MIN),
+        )
+        .order_by('imported_date')
+    )
+    names = _daily_extreme_names(asteroids)
+    return [DailyAsteroidStats(**row, **names[row['imported_date']]) for row in totals]
+
+
+def _save(stats):
+    DailyAsteroidStats.objects.bulk_create(
+        stats,
+        update_conflicts=True,
+        unique_fields=['imported_date'],
+        update_fields=STATS_UPDATE_FIELDS,
+    )
+
+
+def refresh_daily_stats(dates):
+    """
+    Recalcula os agregados dos dias informados. Deve ser chamada na mesma
+    transação que alterou os asteroides desses dias.
+    """
+    dates = list(dates)
+    stats = _compute_daily_stats(Asteroid.objects.filter(imported_date__in=dates))
+    _save(stats)
+    present = {s.imported_date for s in stats}
+    DailyAsteroidStats.objects.filter(imported_date__in=[d for d in dates if d not in present]).delete()
+    return stats
+
+
+def rebuild_daily_stats():
+    """Descarta e reconstrói todos os agregados a partir da tabela de asteroides."""
+    stats = _compute_daily_stats(Asteroid.objects.all())
+    DailyAsteroidStats.objects.all().delete()
+    _save(stats)
+    return stats
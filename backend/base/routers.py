@@ -0,0 +1,123 @@
+# routers.py
+"""
+Roteamento entre o banco primário ('default') e a réplica de leitura
+opcional ('replica', configurada por DATABASE_REPLICA_HOST).
+
+Só vão à réplica as consultas feitas dentro das views marcadas com
+@replica_reads: as leituras pesadas (listagem, detalhes, aproximações,
+indicadores, histogramas, rankings e exportação). Escritas e todo o resto
+(importações, o worker, o registro, a autenticação, o status das
+importações e o admin) usam o primário. Sem a réplica (ou com
+DATABASE_REPLICA_READS desligado, como nos testes), tudo vai ao primário.
+
+As conexões são persistentes (CONN_MAX_AGE, com CONN_HEALTH_CHECKS): o Django
+as recicla ao fim de cada requisição e os comandos em laço (import_worker,
+sync_asteroids) chamam close_stale_connections a cada volta.
+
+Leitura das próprias escritas: cada importação confirmada fixa as leituras no
+primário por REPLICA_PIN_SECONDS (o atraso esperado da réplica), com uma
+marca na tabela PrimaryPin do primário. A marca fica no banco, e não no
+cache, porque o worker e a sincronização rodam em outros processos e o
+LocMemCache padrão não é compartilhado. Assim os indicadores recalculados para
+a nova versão não saem de uma réplica ainda desatualizada e não ficam no cache.
+Cada view @replica_reads custa uma consulta curta ao primário para ler a marca.
+"""
+import functools
+from contextvars import ContextVar
+from datetime import timedelta
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+REPLICA_ALIAS = 'replica'
+
+# Ligada durante uma view @replica_reads; copiada para as threads do sync_to_async
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in connections.settings
+
+
+def replica_enabled():
+    """Se as views @replica_reads podem ler da réplica (configurada e não desligada)."""
+    return settings.DATABASE_REPLICA_READS and replica_configured()
+
+
+def close_stale_connections():
+    """
+    close_old_connections dos processos sem requisições: fecha as conexões
+    velhas (CONN_MAX_AGE) ou com erro, exceto as que estão em uma transação
+    de quem chamou.
+    """
+    for conn in connections.all(initialized_only=True):
+        if not conn.in_atomic_block:
+            conn.close_if_unusable_or_obsolete()
+
+
+def _pins():
+    from .models import PrimaryPin
+    return PrimaryPin.objects.using(DEFAULT_DB_ALIAS)
+
+
+def pin_primary(seconds=None):
+    """Envia as leituras ao primário pelos próximos `seconds` segundos (padrão: REPLICA_PIN_SECONDS)."""
+    if not replica_enabled():
+        return
+    seconds = settings.REPLICA_PIN_SECONDS if seconds is None else seconds
+    # Upsert da única linha: importações simultâneas não disputam a criação
+    pin = _pins().model(pk=1, pinned_until=timezone.now() + timedelta(seconds=seconds))
+    _pins().bulk_create([pin], update_conflicts=True, unique_fields=['id'], update_fields=['pinned_until'])
+
+
+def primary_pinned():
+    return _pins().filter(pinned_until__gt=timezone.now()).exists()
+
+
+async def aprimary_pinned():
+    return await _pins().filter(pinned_until__gt=timezone.now()).aexists()
+
+
+def replica_reads(view):
+    """
+    Executa a view (síncrona ou assíncrona) com as leituras na réplica, se
+    houver uma e as leituras não estiverem fixadas no primário. Use abaixo de
+    @api_view/async_api_view: a autenticação continua lendo do primário.
+    """
+    if iscoroutinefunction(view):
+        @functools.wraps(view)
+        async def async_wrapper(*args, **kwargs):
+            token = _replica_reads.set(replica_enabled() and not await aprimary_pinned())
+            try:
+                return await view(*args, **kwargs)
+            finally:
+                _replica_reads.reset(token)
+        return async_wrapper
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        token = _replica_reads.set(replica_enabled() and not primary_pinned())
+        try:
+            return view(*args, **kwargs)
+        finally:
+            _replica_reads.reset(token)
+    return wrapper
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return REPLICA_ALIAS if _replica_reads.get() else None
+
+    def db_for_write(self, model, **hints):
+        # Explícito: sem isso o Django gravaria um objeto lido da réplica de volta nela
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Os dois aliases têm os mesmos dados
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # A réplica recebe o esquema do primário pela replicação
+        return db != REPLICA_ALIAS
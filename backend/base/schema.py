@@ -0,0 +1,18 @@
+# schema.py
+"""
+Geração do esquema OpenAPI (drf-spectacular), carregada apenas quando o
+esquema é gerado: pelo `manage.py build_schema` (ou `spectacular`) e pela rota
+/api/schema/ quando o arquivo pré-gerado não existe. Os workers que só servem
+a API não importam o gerador nem as extensões.
+"""
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from drf_spectacular.generators import SchemaGenerator as SpectacularSchemaGenerator
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    """Mesmo esquema de segurança (Bearer JWT) do simplejwt na documentação OpenAPI."""
+    target_class = 'base.authentication.CachedJWTAuthentication'
+
+
+class SchemaGenerator(SpectacularSchemaGenerator):
+    """Gerador padrão do drf-spectacular; importar este módulo registra CachedJWTScheme."""
@@ -0,0 +1,129 @@
+# seeding.py
+"""
+Geração de asteroides sintéticos para benchmarks e testes de carga.
+
+Os dados imitam o feed da NASA: cada objeto aparece em 1 a 4 aproximações em
+dias diferentes, os dias mais recentes concentram mais detecções e os
+tamanhos seguem uma distribuição log-normal. Os objetos sintéticos têm
+neo_reference_id com o prefixo SYNTHETIC_PREFIX, o que permite removê-los sem
+tocar nos dados importados.
+"""
+import math
+import random
+from datetime import date, datetime, timedelta, timezone
+
+from django.db import transaction
+
+from .models import Asteroid, CloseApproach, NearEarthObject
+from .rollups import rebuild_daily_stats
+
+SYNTHETIC_PREFIX = 'S'
+
+# Quantidade de aproximações por objeto (peso igual para cada item)
+APPROACHES_PER_OBJECT = (1, 1, 1, 2, 2, 3, 4)
+
+
+def _designation(rng, year):
+    letters = 'ABCDEFGHJKLMNOPQRSTUVWXYZ'
+    return f"({year} {rng.choice(letters)}{rng.choice(letters)}{rng.randint(1, 999)})"
+
+
+def _day_offset(rng, days):
+    # Densidade crescente: dias recentes têm mais detecções (sqrt da uniforme)
+    return min(int(days * math.sqrt(rng.random())), days - 1)
+
+
+def generate_objects(count, start_date, end_date, seed=42):
+    """
+    Gera objetos sintéticos (não salvos) entre start_date e end_date até somar
+    `count` observações. Produz pares (NearEarthObject, [Asteroid, ...]).
+    """
+    rng = random.Random(seed)
+    days = (end_date - start_date).days + 1
+    generated = 0
+    object_index = 0
+    while generated < count:
+        approaches = min(rng.choice(APPROACHES_PER_OBJECT), days, count - generated)
+        offsets = set()
+        while len(offsets) < approaches:
+            offsets.add(_day_offset(rng, days))
+
+        diameter_min = rng.lognormvariate(4, 1.2)
+        neo = NearEarthObject(
+            neo_reference_id=f"{SYNTHETIC_PREFIX}{seed}-{object_index}",
+            name=_designation(rng, start_date.year + _day_offset(rng, days) // 365),
+            estimated_diameter_min_meters=diameter_min,
+            estimated_diameter_max_meters=diameter_min * 2.236,
+            absolute_magnitude_h=rng.uniform(14, 32),
+            is_potentially_hazardous_asteroid=rng.random() < 0.1,
+            is_sentry_object=rng.random() < 0.02,
+        )
+        observations = [
+            Asteroid(relative_velocity_km_per_second=rng.uniform(1, 40), imported_date=start_date + timedelta(days=offset))
+            for offset in offsets
+        ]
+        yield neo, observations
+        generated += approaches
+        object_index += 1
+
+
+def _insert(batch, rng):
+    """Insere o lote de objetos, suas observações e uma aproximação (CloseApproach) para cada observação."""
+    NearEarthObject.objects.bulk_create([neo for neo, _ in batch])
+    asteroids = []
+    for neo, observations in batch:
+        for asteroid in observations:
+            asteroid.neo = neo
+            asteroids.append(asteroid)
+    Asteroid.objects.bulk_create(asteroids)
+    CloseApproach.objects.bulk_create([
+        CloseApproach(
+            asteroid=asteroid,
+            approach_at=datetime.combine(asteroid.imported_date, datetime.min.time(), tzinfo=timezone.utc)
+                        + timedelta(seconds=rng.randrange(86_400)),
+            miss_distance_km=rng.uniform(1e5, 7.5e7),
+            relative_velocity_km_per_second=asteroid.relative_velocity_km_per_second,
+            orbiting_body='Earth',
+        )
+        for asteroid in asteroids
+    ])
+    return len(asteroids)
+
+
+def seed_asteroids(count, days=365, end_date=None, batch_size=5000, seed=42, progress=None):
+    """
+    Insere `count` observações sintéticas (cada uma com uma aproximação) nos
+    `days` dias até end_date (padrão: hoje) e reconstrói os agregados diários.
+    Se informado, `progress(inseridos)` é chamado a cada lote.
+    """
+    end_date = end_date or date.today()
+    start_date = end_date - timedelta(days=days - 1)
+    rng = random.Random(seed + 1)
+    inserted = 0
+    batch = []
+    pending = 0
+    for neo, observations in generate_objects(count, start_date, end_date, seed=seed):
+        batch.append((neo, observations))
+        pending += len(observations)
+        if pending >= batch_size:
+            inserted += _insert(batch, rng)
+            batch = []
+            pending = 0
+            if progress:
+                progress(inserted)
+    if batch:
+        inserted += _insert(batch, rng)
+        if progress:
+            progress(inserted)
+
+    with transaction.atomic():
+        rebuild_daily_stats()
+    return inserted
+
+
+def clear_synthetic():
+    """Remove os objetos sintéticos e suas observações. Retorna a quantidade de observações removidas."""
+    _, deleted = NearEarthObject.objects.filter(neo_reference_id__startswith=SYNTHETIC_PREFIX).delete()
+    with transaction.atomic():
+        rebuild_daily_stats()
+    return deleted.get(Asteroid._meta.label, 0)
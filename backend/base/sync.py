@@ -0,0 +1,163 @@
+# sync.py
+"""
+Sincronização contínua do feed da NASA (`manage.py sync_asteroids`).
+
+Cada ciclo importa, com import_range:
+
+- os últimos NASA_SYNC_REFRESH_DAYS dias (até hoje), buscados de novo na NASA
+  mesmo se estiverem no cache do feed, para pegar as revisões da NASA e o
+  restante do dia corrente;
+- os dias novos, do dia seguinte à marca d'água (SyncState.watermark) até o
+  início desse período;
+- as lacunas: dias entre NASA_SYNC_START_DATE (padrão: a primeira data
+  importada) e a marca d'água sem nenhum asteroide, importados do cache do
+  feed quando possível.
+
+Cada ciclo importa no máximo NASA_IMPORT_MAX_DAYS dias, nessa ordem; o resto
+fica para os próximos. A marca d'água avança até o último dia cujo feed foi
+importado, sem pular dias com falha, e é gravada após cada lote, então um ciclo
+interrompido (SIGTERM) continua de onde parou.
+"""
+import traceback
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db.models import Min
+from django.utils import timezone
+
+from .importer import API_STATS_KEYS, date_runs, day_failed, import_range
+from .models import Asteroid, SyncState
+from .nasa import feed_windows
+
+SYNC_NAME = 'nasa-feed'
+
+
+def get_state(name=SYNC_NAME):
+    return SyncState.objects.get_or_create(name=name)[0]
+
+
+def _days(start_date, end_date):
+    return [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+
+
+def missing_days(start_date, end_date):
+    """Dias de [start_date, end_date] sem nenhum asteroide importado."""
+    if start_date is None or start_date > end_date:
+        return []
+    # Sem o join com NearEarthObject do AsteroidManager: basta o índice asteroid_date_id_idx
+    imported = set(
+        Asteroid._base_manager
+        .filter(imported_date__range=(start_date, end_date))
+        .values_list('imported_date', flat=True)
+        .distinct()
+    )
+    return [day for day in _days(start_date, end_date) if day not in imported]
+
+
+def plan_cycle(watermark, today, refresh_days, start_date=None, max_days=None):
+    """
+    Dias a importar em um ciclo, em ordem de prioridade e com no máximo
+    `max_days` no total: {'refresh': [...], 'new': [...], 'gaps': [...]}.
+    'start' é o primeiro dia após a marca d'água.
+    """
+    refresh_from = today - timedelta(days=refresh_days - 1)
+    start = watermark + timedelta(days=1) if watermark else min(start_date or refresh_from, today)
+    first_day = start_date or Asteroid._base_manager.aggregate(first=Min('imported_date'))['first']
+
+    candidates = {
+        'refresh': _days(max(refresh_from, start_date or refresh_from), today),
+        'new': _days(start, min(today, refresh_from - timedelta(days=1))),
+        # As mais recentes primeiro
+        'gaps': missing_days(first_day, min(start, refresh_from) - timedelta(days=1))[::-1],
+    }
+
+    budget = max_days or settings.NASA_IMPORT_MAX_DAYS
+    plan = {'start': start}
+    for key, days in candidates.items():
+        plan[key] = sorted(days[:max(budget, 0)])
+        budget -= len(plan[key])
+    return plan
+
+
+def _batches(days, max_workers):
+    """Sequências contínuas de `days` em lotes de até `max_workers` janelas do feed (uma rodada de requisições)."""
+    for run_start, run_end in date_runs(days):
+        windows = feed_windows(run_start, run_end)
+        for i in range(0, len(windows), max_workers):
+            yield windows[i][0], windows[min(i + max_workers, len(windows)) - 1][1]
+
+
+def run_cycle(today=None, refresh_days=None, start_date=None, max_days=None, max_workers=None, should_stop=None):
+    """
+    Executa um ciclo da sincronização e grava o resultado no SyncState.
+    `should_stop()`, se informado, é consultado entre os lotes: o lote em
+    andamento termina e o ciclo é encerrado.
+
+    Retorna o resumo do ciclo: quantidades de dias (novos, buscados de novo e
+    lacunas), totais importados, dias com erro e a nova marca d'água.
+    """
+    today = today or date.today()
+    refresh_days = settings.NASA_SYNC_REFRESH_DAYS if refresh_days is None else refresh_days
+    start_date = start_date or settings.NASA_SYNC_START_DATE
+    max_workers = max_workers or settings.NASA_IMPORT_MAX_WORKERS
+
+    state = get_state()
+    state.last_run_at = timezone.now()
+    state.save(update_fields=['last_run_at'])
+
+    plan = plan_cycle(state.watermark, today, refresh_days, start_date, max_days)
+    summary = {
+        'new_days': len(plan['new']),
+        'refreshed_days': len(plan['refresh']),
+        'gap_days': len(plan['gaps']),
+        'imported': 0, 'inserted': 0, 'updated': 0, 'skipped': 0,
+        'failed_days': [],
+        'nasa_api': dict.fromkeys(API_STATS_KEYS, 0),
+        'interrupted': False,
+    }
+    imported_days = set()
+    batches = [
+        (batch, refresh)
+        for days, refresh in ((plan['refresh'], True), (plan['new'], False), (plan['gaps'], False))
+        for batch in _batches(days, max_workers)
+    ]
+
+    try:
+        for (batch_start, batch_end), refresh in batches:
+            if should_stop and should_stop():
+                summary['interrupted'] = True
+                break
+            result = import_range(batch_start, batch_end, max_workers=max_workers, refresh=refresh)
+            for key in ('imported', 'inserted', 'updated', 'skipped'):
+                summary[key] += result[key]
+            for key, value in result['nasa_api'].items():
+                summary['nasa_api'][key] += value
+            for day, day_result in result['days'].items():
+                if day_failed(day_result):
+                    summary['failed_days'].append(day)
+                else:
+                    imported_days.add(date.fromisoformat(day))
+
+            # Avança sobre os dias seguidos já importados, sem pular um dia com erro
+            watermark = state.watermark or plan['start'] - timedelta(days=1)
+            while watermark + timedelta(days=1) in imported_days:
+                watermark += timedelta(days=1)
+            if watermark >= plan['start']:
+                state.watermark = watermark
+                state.save(update_fields=['watermark'])
+    except Exception:
+        state.last_error = traceback.format_exc()
+        state.save(update_fields=['last_error'])
+        raise
+
+    summary['failed_days'].sort()
+    summary['watermark'] = state.watermark.isoformat() if state.watermark else None
+    state.last_result = summary
+    if summary['failed_days']:
+        state.last_error = f"Dias com erro: {', '.join(summary['failed_days'])}"
+    else:
+        state.last_error = ''
+        if not summary['interrupted']:
+            state.last_success_at = timezone.now()
+    state.save(update_fields=['last_result', 'last_error', 'last_success_at'])
+    return summary
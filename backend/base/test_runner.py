@@ -0,0 +1,23 @@
+# test_runner.py
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """
+    DiscoverRunner com as leituras na réplica desligadas (DATABASE_REPLICA_READS).
+
+    Com DATABASE_REPLICA_HOST definido, o alias 'replica' espelha o banco de
+    teste do primário em outra conexão, que não vê os dados da transação de um
+    TestCase (nem é permitida nele). Os testes de roteamento religam as
+    leituras com override_settings.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._replica_reads_off = override_settings(DATABASE_REPLICA_READS=False)
+        self._replica_reads_off.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._replica_reads_off.disable()
+        super().teardown_test_environment(**kwargs)
@@ -1,3 +1,1656 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from io import StringIO
+from unittest import skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import DEFAULT_DB_ALIAS, connection, connections, router, transaction
+from django.db.models import Max, Min
+from django.db.migrations.executor import MigrationExecutor
+from asgiref.sync import async_to_sync
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api import async_views
+from api.pagination import KeysetPagination
+from api.serializers import AsteroidFilterSerializer, AsteroidSerializer
+from api.urls import api_urlpatterns
+
+from . import views as base_views
+from .authentication import user_cache_key
+from .feed_cache import FeedCache
+from .histograms import MAX_BINS, _histogram_numpy, _selection, compute_histogram
+from .importer import aimport_range, import_day, import_range
+from .indicators import acompute_indicators, compute_indicators
+from .jobs import claim_next_job, enqueue_import, process_next_job, run_job
+from .leaderboards import LEADERBOARD_METRICS
+from .metrics import registry
+from .models import ASTEROID_FIELDS, Asteroid, CloseApproach, DailyAsteroidStats, ImportJob, NearEarthObject, PrimaryPin
+from .rollups import rebuild_daily_stats
+from .routers import REPLICA_ALIAS, pin_primary, primary_pinned, replica_reads
+from .sync import get_state, missing_days, run_cycle
+from .nasa import AsyncNasaClient, NasaClient, NasaFeedError, RateLimiter, feed_windows
+from .nasa_stub import NasaStubServer, generate_neo
+
+
+class FeedWindowsTests(TestCase):
+    def test_splits_range_in_seven_day_windows(self):
+        windows = feed_windows(date(2025, 7, 1), date(2025, 7, 16))
+        self.assertEqual(windows, [
+            (date(2025, 7, 1), date(2025, 7, 7)),
+            (date(2025, 7, 8), date(2025, 7, 14)),
+            (date(2025, 7, 15), date(2025, 7, 16)),
+        ])
+
+    def test_single_day(self):
+        self.assertEqual(feed_windows(date(2025, 7, 1), date(2025, 7, 1)), [(date(2025, 7, 1), date(2025, 7, 1))])
+
+
+class NasaStubMixin:
+    """Aponta a importação para o stub local do feed e para um cache de feed vazio."""
+    neos_per_day = 3
+
+    def setUp(self):
+        super().setUp()
+        self.stub = NasaStubServer(neos_per_day=self.neos_per_day).start()
+        self.addCleanup(self.stub.stop)
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        override = override_settings(
+            NASA_API_URL=self.stub.url, NASA_FEED_CACHE_DIR=self.cache_dir,
+            NASA_API_BACKOFF_BASE=0.001, NASA_API_BACKOFF_MAX=0.01,
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+
+
+class ImportRangeTests(NasaStubMixin, TestCase):
+
+    def test_imports_every_day_of_the_range(self):
+        summary = import_range(date(2025, 7, 1), date(2025, 7, 10), max_workers=2)
+
+        self.assertEqual(len(self.stub.requests), 2)
+        self.assertEqual(summary['imported'], 30)
+        self.assertFalse(summary['has_errors'])
+        self.assertEqual(summary['days']['2025-07-10'], {"inserted": 3, "updated": 0, "skipped": 0, "errors": []})
+        self.assertEqual(Asteroid.objects.filter(imported_date=date(2025, 7, 10)).count(), 3)
+
+    def test_reimport_updates_rows_in_place(self):
+        import_range(date(2025, 7, 1), date(2025, 7, 2))
+        Asteroid.objects.filter(imported_date=date(2025, 7, 1)).update(relative_velocity_km_per_second=0)
+
+        summary = import_range(date(2025, 7, 1), date(2025, 7, 2))
+
+        self.assertEqual((summary['inserted'], summary['updated'], summary['skipped']), (0, 6, 0))
+        self.assertEqual(Asteroid.objects.count(), 6)
+        self.assertFalse(Asteroid.objects.filter(relative_velocity_km_per_second=0).exists())
+
+    def test_invalid_and_repeated_neos_are_skipped(self):
+        neos = [generate_neo(date(2025, 7, 1), i) for i in range(3)]
+        neos.append(dict(neos[0]))
+        del neos[1]['name']
+
+        result = import_day(date(2025, 7, 1), neos)
+
+        self.assertEqual((result['inserted'], result['updated'], result['skipped']), (2, 0, 2))
+        self.assertEqual(len(result['errors']), 1)
+        self.assertEqual(Asteroid.objects.count(), 2)
+
+    def test_feed_errors_are_reported_per_day(self):
+        self.stub.httpd.status_code = 503
+        summary = import_range(date(2025, 7, 1), date(2025, 7, 2))
+
+        self.assertEqual(summary['imported'], 0)
+        self.assertTrue(summary['has_errors'])
+        self.assertEqual(len(summary['days']['2025-07-02']['errors']), 1)
+        self.assertFalse(Asteroid.objects.exists())
+
+    def test_transient_feed_errors_are_retried(self):
+        self.stub.fail_next(1, 503)
+        summary = import_range(date(2025, 7, 1), date(2025, 7, 2))
+
+        self.assertFalse(summary['has_errors'])
+        self.assertEqual(summary['imported'], 6)
+        self.assertEqual((summary['nasa_api']['calls'], summary['nasa_api']['retries']), (1, 1))
+
+    def test_import_command(self):
+        out = StringIO()
+        call_command('import_asteroids', '--start-date', '2025-07-01', '--end-date', '2025-07-02', stdout=out)
+
+        self.assertIn('6 asteroides importados (6 inseridos, 0 atualizados, 0 ignorados)', out.getvalue())
+        self.assertEqual(Asteroid.objects.count(), 6)
+
+
+class NasaClientTests(NasaStubMixin, TestCase):
+
+    def test_retries_429_and_5xx_with_backoff(self):
+        self.stub.fail_next(1, 429)
+        self.stub.fail_next(1, 502)
+        client = NasaClient()
+
+        neos = client.get_feed(date(2025, 7, 1), date(2025, 7, 1))
+
+        self.assertEqual(len(neos['2025-07-01']), 3)
+        stats = client.stats()
+        self.assertEqual((stats['calls'], stats['requests'], stats['retries'], stats['failures']), (1, 3, 2, 0))
+        self.assertGreater(stats['latency_ms_total'], 0)
+
+    def test_gives_up_after_max_retries(self):
+        self.stub.fail_next(5, 503)
+        client = NasaClient(max_retries=2)
+
+        with self.assertRaises(NasaFeedError):
+            client.get_feed(date(2025, 7, 1), date(2025, 7, 1))
+        self.assertEqual(len(self.stub.requests), 3)
+        self.assertEqual(client.stats()['failures'], 1)
+
+    def test_client_errors_are_not_retried(self):
+        self.stub.fail_next(1, 403)
+        client = NasaClient()
+
+        with self.assertRaises(NasaFeedError):
+            client.get_feed(date(2025, 7, 1), date(2025, 7, 1))
+        self.assertEqual(len(self.stub.requests), 1)
+
+    def test_rate_limit_headers_feed_the_token_bucket(self):
+        client = NasaClient(rate_limit_reserve=2)
+        client.get_feed(date(2025, 7, 1), date(2025, 7, 1))
+
+        self.assertEqual(client.rate_limiter.limit, 1000)
+        self.assertAlmostEqual(client.rate_limiter.tokens, 999, delta=1)
+
+    def test_token_bucket_waits_before_quota_runs_out(self):
+        now = [0.0]
+        waits = []
+
+        def sleep(seconds):
+            waits.append(seconds)
+            now[0] += seconds
+
+        limiter = RateLimiter(reserve=5, clock=lambda: now[0], sleep=sleep)
+        limiter.update({'X-RateLimit-Limit': '3600', 'X-RateLimit-Remaining': '7'})
+
+        limiter.acquire()
+        limiter.acquire()
+        self.assertEqual(waits, [])
+        # Com o saldo na reserva, espera a reposição de um token (1 por segundo)
+        self.assertAlmostEqual(limiter.acquire(), 1.0)
+
+    def test_token_bucket_with_quota_below_reserve(self):
+        now = [0.0]
+
+        def sleep(seconds):
+            now[0] += seconds
+
+        # Cota de 3 por hora com reserva 5: usa um token com o bucket cheio, em vez de esperar para sempre
+        limiter = RateLimiter(reserve=5, clock=lambda: now[0], sleep=sleep)
+        limiter.update({'X-RateLimit-Limit': '3', 'X-RateLimit-Remaining': '3'})
+
+        self.assertEqual(limiter.acquire(), 0)
+        self.assertAlmostEqual(limiter.acquire(), 1200.0)
+        self.assertAlmostEqual(now[0], 1200.0)
+
+    def test_zero_quota_fails(self):
+        limiter = RateLimiter(reserve=5, sleep=lambda seconds: self.fail("não deve esperar"))
+        limiter.update({'X-RateLimit-Limit': '0', 'X-RateLimit-Remaining': '0'})
+
+        with self.assertRaises(NasaFeedError):
+            limiter.acquire()
+        with self.assertRaises(NasaFeedError):
+            async_to_sync(limiter.aacquire)()
+
+    def test_zero_quota_from_api_fails_next_call(self):
+        self.stub.httpd.rate_limit = self.stub.httpd.rate_limit_remaining = 0
+        client = NasaClient(rate_limit_reserve=0)
+        client.get_feed(date(2025, 7, 1), date(2025, 7, 1))
+
+        with self.assertRaises(NasaFeedError):
+            client.get_feed(date(2025, 7, 2), date(2025, 7, 2))
+        self.assertEqual(len(self.stub.requests), 1)
+        self.assertEqual(client.stats()['failures'], 1)
+
+
+class FeedCacheTests(NasaStubMixin, TestCase):
+    def test_past_days_are_served_from_cache(self):
+        import_range(date(2025, 7, 1), date(2025, 7, 9))
+        self.assertEqual(len(self.stub.requests), 2)
+
+        summary = import_range(date(2025, 7, 3), date(2025, 7, 12))
+
+        # Só os dias 10 a 12 faltavam no cache
+        self.assertEqual(len(self.stub.requests), 3)
+        self.assertIn('start_date=2025-07-10&end_date=2025-07-12', self.stub.requests[-1])
+        self.assertEqual(summary['updated'], 21)
+        self.assertEqual(summary['inserted'], 9)
+
+    def test_today_expires_after_ttl(self):
+        today = date.today()
+        import_range(today, today)
+        import_range(today, today)
+        self.assertEqual(len(self.stub.requests), 1)
+
+        with self.settings(NASA_FEED_CACHE_TODAY_TTL=0):
+            import_range(today, today)
+        self.assertEqual(len(self.stub.requests), 2)
+
+    def test_offline_replay_uses_only_cache(self):
+        import_range(date(2025, 7, 1), date(2025, 7, 2))
+        Asteroid.objects.all().delete()
+        self.stub.stop()
+
+        summary = import_range(date(2025, 7, 1), date(2025, 7, 3), offline=True)
+
+        self.assertEqual(summary['inserted'], 6)
+        self.assertEqual(len(summary['days']['2025-07-03']['errors']), 1)
+        self.assertEqual(DailyAsteroidStats.objects.count(), 2)
+
+    def test_identical_days_share_one_object_and_eviction(self):
+        cache = FeedCache()
+        cache.put_day(date(2025, 7, 1), [])
+        cache.put_day(date(2025, 7, 2), [])
+        cache.put_window(date(2025, 7, 3), date(2025, 7, 4), {'2025-07-03': [generate_neo(date(2025, 7, 3), 0)]})
+        self.assertEqual(cache.stats()['days'], 4)
+        self.assertEqual(cache.stats()['objects'], 2)
+
+        out = StringIO()
+        call_command('feed_cache', '--max-size', '10', stdout=out)
+
+        self.assertEqual(cache.stats()['objects'], 1)
+        self.assertLessEqual(cache.stats()['bytes'], 10)
+        self.assertIsNotNone(cache.get_day(date(2025, 7, 4)))
+        self.assertIsNone(cache.get_day(date(2025, 7, 3)))
+
+        call_command('feed_cache', '--clear', stdout=out)
+        self.assertEqual(cache.stats(), {'days': 0, 'objects': 0, 'bytes': 0})
+
+
+class ImportJobTests(NasaStubMixin, TestCase):
+    neos_per_day = 2
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user(username='nasa', password='nasa'))
+
+    def test_post_enqueues_job_and_worker_runs_it(self):
+        response = self.client.post('/importar/', {'start_date': '2025-07-01', 'end_date': '2025-07-03'}, format='json')
+
+        self.assertEqual(response.status_code, 202)
+        job_id = response.data['job_id']
+        self.assertFalse(Asteroid.objects.exists())
+        self.assertEqual(self.client.get(f'/importar/{job_id}/').data['status'], ImportJob.PENDING)
+
+        self.assertEqual(process_next_job().pk, job_id)
+        self.assertIsNone(process_next_job())
+
+        data = self.client.get(f'/importar/{job_id}/').data
+        self.assertEqual(data['status'], ImportJob.SUCCEEDED)
+        self.assertEqual((data['days_total'], data['days_done']), (3, 3))
+        self.assertEqual(data['result']['inserted'], 6)
+        self.assertIsNotNone(data['duration_seconds'])
+        self.assertEqual(Asteroid.objects.count(), 6)
+
+    def test_invalid_range_is_rejected(self):
+        response = self.client.post('/importar/', {'start_date': '2025-07-03', 'end_date': '2025-07-01'}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ImportJob.objects.exists())
+
+    def test_worker_command_drains_queue(self):
+        enqueue_import(date(2025, 7, 1), date(2025, 7, 1))
+        enqueue_import(date(2025, 7, 2), date(2025, 7, 2))
+
+        call_command('import_worker', '--once', stdout=StringIO())
+
+        self.assertEqual(ImportJob.objects.filter(status=ImportJob.SUCCEEDED).count(), 2)
+        self.assertEqual(Asteroid.objects.count(), 4)
+
+    def test_unknown_job_returns_404(self):
+        self.assertEqual(self.client.get('/importar/999/').status_code, 404)
+
+    def test_abandoned_job_is_reclaimed(self):
+        job = enqueue_import(date(2025, 7, 1), date(2025, 7, 1))
+        self.assertEqual(claim_next_job('morto:1').pk, job.pk)
+        # Lease ainda válido: ninguém mais pega o job
+        self.assertIsNone(claim_next_job('vivo:2'))
+
+        ImportJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+        reclaimed = claim_next_job('vivo:2')
+        self.assertEqual((reclaimed.pk, reclaimed.worker, reclaimed.attempts), (job.pk, 'vivo:2', 2))
+
+        run_job(reclaimed)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.SUCCEEDED)
+        self.assertEqual(Asteroid.objects.count(), 2)
+
+    @override_settings(IMPORT_JOB_MAX_ATTEMPTS=1)
+    def test_abandoned_job_fails_after_max_attempts(self):
+        job = enqueue_import(date(2025, 7, 1), date(2025, 7, 1))
+        claim_next_job('morto:1')
+        ImportJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+
+        self.assertIsNone(claim_next_job('vivo:2'))
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.FAILED)
+        self.assertIn('morto:1', job.error)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_stale_attempt_does_not_overwrite_reclaimed_job(self):
+        job = enqueue_import(date(2025, 7, 1), date(2025, 7, 1))
+        stale = claim_next_job('morto:1')
+        ImportJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+        claim_next_job('vivo:2')
+
+        run_job(stale)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.worker), (ImportJob.RUNNING, 'vivo:2'))
+
+
+@skipUnless(connection.vendor == 'postgresql', "O SQLite em memória dos testes não aceita escritas de várias threads.")
+class ImportJobHeartbeatTests(NasaStubMixin, TransactionTestCase):
+    """O heartbeat roda em outra thread (outra conexão), por isso TransactionTestCase."""
+
+    @override_settings(IMPORT_JOB_LEASE_SECONDS=0.6)
+    def test_stalled_fetch_keeps_lease(self):
+        self.stub.httpd.delay = 2
+        job = enqueue_import(date(2025, 7, 1), date(2025, 7, 1))
+        claimed = claim_next_job('vivo:1')
+
+        def work():
+            try:
+                run_job(claimed)
+            finally:
+                connections.close_all()
+
+        worker = threading.Thread(target=work)
+        worker.start()
+        try:
+            # Duas vezes o lease com a busca ainda travada: o job continua deste worker
+            time.sleep(1.2)
+            self.assertIsNone(claim_next_job('outro:2'))
+        finally:
+            worker.join()
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.worker, job.attempts), (ImportJob.SUCCEEDED, 'vivo:1', 1))
+        self.assertEqual(len(self.stub.requests), 1)
+
+
+def seed_days(days, neos_per_day):
+    """Importa asteroides gerados pelo stub diretamente, sem passar pela rede."""
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        for offset in range(days):
+            day = date(2025, 7, 1) + timedelta(days=offset)
+            import_day(day, [generate_neo(day, i) for i in range(neos_per_day)])
+
+
+class IndicatorsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user(username='nasa', password='nasa'))
+
+    def test_empty_table(self):
+        response = self.client.get('/indicadores/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_asteroids'], 0)
+
+    def test_matches_brute_force_computation(self):
+        seed_days(3, 4)
+        rows = list(Asteroid.objects.all())
+        fastest = max(rows, key=lambda a: a.relative_velocity_km_per_second)
+        smallest = min(rows, key=lambda a: a.estimated_diameter_min_meters)
+        avg_velocity = sum(a.relative_velocity_km_per_second for a in rows) / len(rows)
+
+        data = self.client.get('/indicadores/').data
+
+        self.assertEqual(data['total_asteroids'], 12)
+        self.assertEqual(data['unique_asteroids_by_name'], len({a.name for a in rows}))
+        self.assertEqual(data['unique_potentially_hazardous_asteroids'],
+                         len({a.name for a in rows if a.is_potentially_hazardous_asteroid}))
+        self.assertEqual(data['avg_asteroids_per_day'], 4)
+        self.assertEqual(data['avg_velocity_km_per_second'], round(avg_velocity, 2))
+        self.assertEqual(data['max_velocity'], {'velocity_km_s': fastest.relative_velocity_km_per_second, 'name': fastest.name})
+        self.assertEqual(data['min_estimated_diameter'], {'diameter_meters': smallest.estimated_diameter_min_meters, 'name': smallest.name})
+        self.assertEqual(data['asteroids_by_date'], {'2025-07-01': 4, '2025-07-02': 4, '2025-07-03': 4})
+
+    def test_unique_counts_ignore_objects_without_observations(self):
+        seed_days(2, 3)
+        for hazardous in (True, False):
+            NearEarthObject.objects.create(
+                name=f'sem observação {hazardous}', estimated_diameter_min_meters=1, estimated_diameter_max_meters=2,
+                absolute_magnitude_h=20, is_potentially_hazardous_asteroid=hazardous, is_sentry_object=False,
+            )
+        rows = list(Asteroid.objects.all())
+
+        for data in (compute_indicators(), async_to_sync(acompute_indicators)()):
+            self.assertEqual(data['unique_asteroids_by_name'], len({a.name for a in rows}))
+            self.assertEqual(data['unique_potentially_hazardous_asteroids'],
+                             len({a.name for a in rows if a.is_potentially_hazardous_asteroid}))
+
+    def test_query_count_is_constant(self):
+        seed_days(2, 2)
+        with self.assertNumQueries(2):
+            self.client.get('/indicadores/')
+
+        seed_days(10, 20)
+        with self.assertNumQueries(2):
+            self.client.get('/indicadores/')
+
+    def test_conditional_get_skips_database(self):
+        seed_days(2, 3)
+        response = self.client.get('/indicadores/')
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/indicadores/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/indicadores/').status_code, 200)
+
+    def test_import_invalidates_cached_payload(self):
+        seed_days(1, 3)
+        etag = self.client.get('/indicadores/')['ETag']
+
+        seed_days(2, 3)
+        response = self.client.get('/indicadores/', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['total_asteroids'], 6)
+
+
+# Dias (a partir de 2025-07-01) e asteroides por dia, com lacunas
+WINDOW_DAYS = {0: 4, 1: 2, 2: 5, 4: 1, 5: 3, 9: 4, 10: 2}
+
+
+def brute_force_totals(rows, start, end):
+    window = [a for a in rows if start <= a.imported_date <= end]
+    dates = {a.imported_date for a in window}
+    if not window:
+        return {'total_asteroids': 0, 'hazardous_asteroids': 0, 'avg_asteroids_per_day': 0,
+                'avg_velocity_km_per_second': None, 'avg_diameter_meters': None}
+    diameters = [(a.estimated_diameter_min_meters + a.estimated_diameter_max_meters) / 2 for a in window]
+    return {
+        'total_asteroids': len(window),
+        'hazardous_asteroids': sum(a.is_potentially_hazardous_asteroid for a in window),
+        'avg_asteroids_per_day': len(window) / len(dates),
+        'avg_velocity_km_per_second': sum(a.relative_velocity_km_per_second for a in window) / len(window),
+        'avg_diameter_meters': sum(diameters) / len(window),
+    }
+
+
+class IndicatorWindowTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user(username='nasa', password='nasa'))
+        with self.captureOnCommitCallbacks(execute=True):
+            for offset, count in WINDOW_DAYS.items():
+                day = date(2025, 7, 1) + timedelta(days=offset)
+                import_day(day, [generate_neo(day, i) for i in range(count)])
+        self.rows = list(Asteroid.objects.all())
+
+    def assertTotalsEqual(self, data, expected):
+        for key, value in expected.items():
+            if value is None or isinstance(value, int):
+                self.assertEqual(data[key], value, key)
+            else:
+                self.assertAlmostEqual(data[key], value, delta=0.006, msg=key)
+
+    def test_windows_match_brute_force(self):
+        windows = [
+            ('2025-07-01', '2025-07-11'), ('2025-07-02', '2025-07-05'), ('2025-06-01', '2025-07-03'),
+            ('2025-07-06', '2025-07-09'), ('2025-07-11', '2025-08-30'), ('2025-07-04', '2025-07-04'),
+        ]
+        for start, end in windows:
+            data = self.client.get('/indicadores/', {'start_date': start, 'end_date': end}).data
+            start, end = date.fromisoformat(start), date.fromisoformat(end)
+            window = [a for a in self.rows if start <= a.imported_date <= end]
+            with self.subTest(start=start, end=end):
+                self.assertEqual(data['window'], {'start_date': start, 'end_date': end})
+                self.assertTotalsEqual(data, brute_force_totals(self.rows, start, end))
+                if not window:
+                    self.assertIn('message', data)
+                    continue
+                fastest = max(window, key=lambda a: a.relative_velocity_km_per_second)
+                smallest = min(window, key=lambda a: a.estimated_diameter_min_meters)
+                self.assertEqual(data['max_velocity'], {'velocity_km_s': fastest.relative_velocity_km_per_second, 'name': fastest.name})
+                self.assertEqual(data['min_estimated_diameter'], {'diameter_meters': smallest.estimated_diameter_min_meters, 'name': smallest.name})
+                by_date = {}
+                for a in sorted(window, key=lambda a: a.imported_date):
+                    by_date[a.imported_date.isoformat()] = by_date.get(a.imported_date.isoformat(), 0) + 1
+                self.assertEqual(data['asteroids_by_date'], by_date)
+
+    def test_open_window_and_last_days(self):
+        data = self.client.get('/indicadores/', {'start_date': '2025-07-05'}).data
+        self.assertEqual(data['window'], {'start_date': date(2025, 7, 5), 'end_date': date.today()})
+        self.assertEqual(data['total_asteroids'], 10)
+
+        data = self.client.get('/indicadores/', {'end_date': '2025-07-02'}).data
+        self.assertEqual(data['window']['start_date'], date(2025, 7, 1))
+        self.assertEqual(data['total_asteroids'], 6)
+
+        data = self.client.get('/indicadores/', {'days': 30}).data
+        self.assertEqual(data['window'], {'start_date': date.today() - timedelta(days=29), 'end_date': date.today()})
+
+    def test_any_window_reuses_prefix_sums(self):
+        with self.assertNumQueries(1):
+            self.client.get('/indicadores/', {'start_date': '2025-07-01', 'end_date': '2025-07-03'})
+        with self.assertNumQueries(0):
+            self.client.get('/indicadores/', {'start_date': '2025-07-02', 'end_date': '2025-07-10'})
+            self.client.get('/indicadores/serie/', {'start_date': '2025-07-01', 'end_date': '2025-07-11'})
+
+    def test_rolling_series_matches_brute_force(self):
+        for window in (1, 3, 7):
+            data = self.client.get('/indicadores/serie/', {
+                'start_date': '2025-06-29', 'end_date': '2025-07-13', 'window': window,
+            }).data
+            self.assertEqual(len(data['results']), 15)
+            for point in data['results']:
+                day = point['date']
+                with self.subTest(window=window, day=day):
+                    self.assertEqual(point['asteroid_count'], sum(a.imported_date == day for a in self.rows))
+                    self.assertTotalsEqual(point, brute_force_totals(self.rows, day - timedelta(days=window - 1), day))
+
+    def test_series_defaults_and_validation(self):
+        data = self.client.get('/indicadores/serie/').data
+        self.assertEqual((data['window'], data['end_date']), (7, date.today()))
+        self.assertEqual(len(data['results']), 90)
+
+        invalid = [
+            ('/indicadores/', {'days': 7, 'start_date': '2025-07-01'}),
+            ('/indicadores/', {'start_date': '2025-07-02', 'end_date': '2025-07-01'}),
+            ('/indicadores/', {'days': 0}),
+            ('/indicadores/serie/', {'window': 0}),
+            ('/indicadores/serie/', {'start_date': '2000-01-01', 'end_date': '2025-01-01'}),
+        ]
+        for url, params in invalid:
+            with self.subTest(url=url, params=params):
+                self.assertEqual(self.client.get(url, params).status_code, 400)
+
+
+def brute_force_percentile(values, q):
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+class HistogramTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user(username='nasa', password='nasa'))
+        seed_days(10, 8)
+
+    def test_matches_brute_force_binning(self):
+        response = self.client.get('/indicadores/histograma/', {'field': 'relative_velocity_km_per_second', 'bins': 7})
+        self.assertEqual(response.status_code, 200, response.data)
+        data = response.json()
+
+        values = list(Asteroid.objects.values_list('relative_velocity_km_per_second', flat=True))
+        low, high = min(values), max(values)
+        width = (high - low) / 7
+        expected = [0] * 7
+        for value in values:
+            expected[min(int((value - low) / width), 6)] += 1
+
+        self.assertEqual(data['count'], 80)
+        self.assertEqual([bucket['count'] for bucket in data['buckets']], expected)
+        self.assertAlmostEqual(data['buckets'][0]['lower'], low)
+        self.assertAlmostEqual(data['buckets'][-1]['upper'], high)
+        for q in (50, 90, 95, 99):
+            self.assertAlmostEqual(data['percentiles'][f'p{q}'], brute_force_percentile(values, q))
+        # Só as faixas: algumas centenas de bytes
+        self.assertLess(len(response.content), 1500)
+
+    def test_width_and_filters(self):
+        response = self.client.get('/indicadores/histograma/', {
+            'field': 'absolute_magnitude_h', 'width': 2, 'min_value': 14, 'hazardous': 'false',
+            'start_date': '2025-07-03', 'end_date': '2025-07-06',
+        })
+        data = response.json()
+
+        values = list(Asteroid.objects.filter(
+            is_potentially_hazardous_asteroid=False, imported_date__range=(date(2025, 7, 3), date(2025, 7, 6)),
+        ).values_list('absolute_magnitude_h', flat=True))
+        self.assertEqual(data['count'], len(values))
+        self.assertEqual(data['bucket_width'], 2)
+        for bucket in data['buckets']:
+            self.assertEqual(bucket['count'], sum(bucket['lower'] <= v < bucket['upper'] for v in values))
+
+    def test_backends_agree_on_out_of_range_values(self):
+        # Um valor exatamente no fim da última faixa e outros além dela (faixas limitadas a MAX_BINS)
+        field = 'absolute_magnitude_h'
+        NearEarthObject.objects.filter(pk=NearEarthObject.objects.order_by('pk')[0].pk).update(absolute_magnitude_h=14)
+        low = 14
+        width = 0.01
+        NearEarthObject.objects.filter(pk=NearEarthObject.objects.order_by('pk')[1].pk).update(
+            absolute_magnitude_h=low + MAX_BINS * width)
+        values = list(Asteroid.objects.values_list(field, flat=True))
+
+        for params in ({'bins': 7}, {'width': 2, 'low': 14, 'high': 20}, {'width': width, 'low': low}):
+            data = compute_histogram(Asteroid.objects.all(), field, **params)
+            numpy_data = _histogram_numpy(
+                _selection(Asteroid.objects.all(), field, params.get('low'), params.get('high')), field,
+                params.get('bins'), params.get('width'), params.get('low'), params.get('high'),
+            )
+            counts = [bucket['count'] for bucket in data['buckets']]
+            self.assertEqual(counts, [bucket['count'] for bucket in numpy_data['buckets']], params)
+            self.assertEqual(data['count'], numpy_data['count'])
+
+            top = data['buckets'][-1]['upper']
+            expected = sum(data['buckets'][0]['lower'] <= v <= top for v in values)
+            self.assertEqual(sum(counts), expected, params)
+        # Limitado a MAX_BINS: o que passa do fim fica fora das faixas, mas conta no total
+        self.assertLess(sum(counts), data['count'])
+
+    def test_invalid_params(self):
+        for params in ({'field': 'name'}, {'bins': 5, 'width': 1}, {'bins': 0}, {'width': 0},
+                       {'min_value': 10, 'max_value': 1}):
+            self.assertEqual(self.client.get('/indicadores/histograma/', params).status_code, 400, params)
+
+    def test_empty_selection(self):
+        data = self.client.get('/indicadores/histograma/', {'start_date': '2030-01-01'}).json()
+        self.assertEqual((data['count'], data['buckets']), (0, []))
+
+
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user(username='nasa', password='nasa'))
+        # O stub repete os mesmos 8 objetos em todos os dias
+        seed_days(10, 8)
+
+    def brute_force(self, metric, descending, distinct, start, end):
+        field = LEADERBOARD_METRICS[metric]
+        rows = [row for row in Asteroid.objects.values('id', 'neo_id', 'imported_date', field)
+                if start <= row['imported_date'] <= end]
+        if metric == 'velocity':
+            rows.sort(key=lambda row: (row[field], row['id']), reverse=descending)
+        else:
+            rows.sort(key=lambda row: (row[field], row['neo_id'], row['id']), reverse=descending)
+        if not distinct:
+            return [row['id'] for row in rows]
+        # Um por objeto: o primeiro na velocidade; o mais recente no diâmetro e na magnitude
+        picked = {}
+        for row in rows:
+            current = picked.get(row['neo_id'])
+            if current is None or (metric != 'velocity' and row['imported_date'] > current['imported_date']):
+                picked[row['neo_id']] = row
+        return [row['id'] for row in picked.values()]
+
+    def test_matches_brute_force_ranking(self):
+        start, end = date(2025, 7, 3), date(2025, 7, 8)
+        for metric in LEADERBOARD_METRICS:
+            for order in ('desc', 'asc'):
+                for distinct in (False, True):
+                    params = {'metric': metric, 'order': order, 'k': 5, 'distinct': distinct,
+                              'start_date': start.isoformat(), 'end_date': end.isoformat()}
+                    with self.subTest(**params):
+                        response = self.client.get('/indicadores/ranking/', params)
+                        self.assertEqual(response.status_code, 200, response.data)
+                        results = response.json()['results']
+                        expected = self.brute_force(metric, order == 'desc', distinct, start, end)[:5]
+                        self.assertEqual([row['id'] for row in results], expected)
+                        self.assertEqual([row['rank'] for row in results], [1, 2, 3, 4, 5])
+                        self.assertEqual(results[0]['value'], results[0][LEADERBOARD_METRICS[metric]])
+
+    def test_distinct_lists_each_object_once(self):
+        data = self.client.get('/indicadores/ranking/', {'metric': 'diameter', 'k': 20, 'distinct': 'true'}).json()
+
+        self.assertEqual(len(data['results']), 8)
+        self.assertEqual(len({row['neo_reference_id'] for row in data['results']}), 8)
+        self.assertEqual({row['imported_date'] for row in data['results']}, {'2025-07-10'})
+
+    def test_filters_and_invalid_parameters(self):
+        data = self.client.get('/indicadores/ranking/', {'metric': 'velocity', 'hazardous': 'false', 'k': 100}).json()
+        self.assertEqual(len(data['results']), Asteroid.objects.filter(is_potentially_hazardous_asteroid=False).count())
+
+        for params in ({}, {'metric': 'speed'}, {'metric': 'velocity', 'k': 0}, {'metric': 'velocity', 'k': 101},
+                       {'metric': 'velocity', 'order': 'up'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get('/indicadores/ranking/', params).status_code, 400)
+
+
+class DailyStatsTests(TestCase):
+    def assertStatsMatchRebuild(self):
+        maintained = list(DailyAsteroidStats.objects.order_by('imported_date').values())
+        with transaction.atomic():
+            rebuild_daily_stats()
+        rebuilt = list(DailyAsteroidStats.objects.order_by('imported_date').values())
+        # Somas em ponto flutuante dependem da ordem das linhas no banco
+        normalize = lambda value: round(value, 6) if isinstance(value, float) else value
+        strip = lambda rows: [{k: normalize(v) for k, v in row.items() if k not in ('id', 'updated_at')} for row in rows]
+        self.assertEqual(strip(maintained), strip(rebuilt))
+
+    def test_import_keeps_rollup_in_sync(self):
+        seed_days(3, 5)
+
+        stats = DailyAsteroidStats.objects.get(imported_date=date(2025, 7, 2))
+        day = Asteroid.objects.filter(imported_date=date(2025, 7, 2))
+        fastest = day.order_by('-relative_velocity_km_per_second').first()
+        self.assertEqual(stats.asteroid_count, 5)
+        self.assertEqual(stats.hazardous_count, day.filter(is_potentially_hazardous_asteroid=True).count())
+        self.assertEqual((stats.max_velocity_km_per_second, stats.max_velocity_name),
+                         (fastest.relative_velocity_km_per_second, fastest.name))
+        self.assertAlmostEqual(stats.sum_diameter_max_meters, sum(a.estimated_diameter_max_meters for a in day))
+        self.assertStatsMatchRebuild()
+
+    def test_reimport_does_not_double_count(self):
+        seed_days(2, 3)
+        seed_days(2, 4)
+
+        self.assertEqual(DailyAsteroidStats.objects.get(imported_date=date(2025, 7, 1)).asteroid_count, 4)
+        self.assertStatsMatchRebuild()
+
+    def test_rebuild_command(self):
+        seed_days(2, 3)
+        DailyAsteroidStats.objects.all().delete()
+
+        call_command('rebuild_daily_stats', stdout=StringIO())
+
+        self.assertEqual(DailyAsteroidStats.objects.count(), 2)
+        self.assertEqual(sum(DailyAsteroidStats.objects.values_list('asteroid_count', flat=True)), 6)
+
+
+class SeedAsteroidsTests(TestCase):
+    def test_seeds_synthetic_rows_over_the_date_range(self):
+        out = StringIO()
+        call_command('seed_asteroids', '2000', '--days', '30', '--batch-size', '500', '--force', stdout=out)
+
+        self.assertIn('2000 asteroides sintéticos inseridos em 30 dias.', out.getvalue())
+        self.assertEqual(Asteroid.objects.count(), 2000)
+        dates = Asteroid.objects.aggregate(first=Min('imported_date'), last=Max('imported_date'))
+        self.assertGreaterEqual(dates['first'], date.today() - timedelta(days=29))
+        self.assertLessEqual(dates['last'], date.today())
+        # Objetos repetidos em dias diferentes, como no feed da NASA
+        self.assertLess(Asteroid.objects.values('neo_reference_id').distinct().count(), 2000)
+        self.assertEqual(sum(DailyAsteroidStats.objects.values_list('asteroid_count', flat=True)), 2000)
+
+    def test_count_outside_recommended_range_is_rejected(self):
+        with self.assertRaises(CommandError):
+            call_command('seed_asteroids', '100', stdout=StringIO())
+
+    def test_clear_removes_only_synthetic_rows(self):
+        seed_days(1, 2)
+        call_command('seed_asteroids', '50', '--force', stdout=StringIO())
+
+        call_command('seed_asteroids', '10', '--force', '--clear', '--seed', '7', stdout=StringIO())
+
+        self.assertEqual(Asteroid.objects.count(), 12)
+
+
+class AsteroidListTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user(username='nasa', password='nasa'))
+        seed_days(3, 5)
+
+    def test_walks_all_pages_forward_and_back(self):
+        expected = list(Asteroid.objects.order_by('imported_date', 'id').values_list('id', flat=True))
+
+        pages = []
+        url = '/?page_size=4'
+        while url:
+            data = self.client.get(url).data
+            pages.append([row['id'] for row in data['results']])
+            url = data['next']
+        self.assertEqual([len(page) for page in pages], [4, 4, 4, 3])
+        self.assertEqual(sum(pages, []), expected)
+
+        back = self.client.get(url or data['previous']).data
+        self.assertEqual([row['id'] for row in back['results']], pages[-2])
+        first = self.client.get(self.client.get(back['previous']).data['previous']).data
+        self.assertEqual([row['id'] for row in first['results']], pages[0])
+        self.assertIsNone(first['previous'])
+
+    def test_filter_and_field_selection(self):
+        data = self.client.get('/', {'imported_date': '2025-07-02', 'fields': 'id,name'}).data
+
+        self.assertEqual(len(data['results']), 5)
+        self.assertEqual(set(data['results'][0]), {'id', 'name'})
+        self.assertIsNone(data['next'])
+
+    def test_fast_path_matches_model_serializer(self):
+        asteroids = Asteroid.objects.order_by('imported_date', 'id')
+        expected = json.loads(JSONRenderer().render(AsteroidSerializer(asteroids, many=True).data))
+
+        listed = json.loads(self.client.get('/', {'page_size': 100}).content)['results']
+        detail = json.loads(self.client.get(f'/asteroide/{asteroids[0].id}/').content)
+
+        self.assertEqual(listed, expected)
+        self.assertEqual({k: v for k, v in detail.items() if k != 'close_approaches'}, expected[0])
+        self.assertEqual(self.client.get('/asteroide/0/').status_code, 404)
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get('/', {'fields': 'id,password'}).status_code, 400)
+        self.assertEqual(self.client.get('/', {'page_size': 0}).status_code, 400)
+        self.assertEqual(self.client.get('/', {'cursor': 'not-a-cursor'}).status_code, 404)
+
+
+class AsteroidBatchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user(username='nasa', password='nasa'))
+        seed_days(2, 5)
+        self.ids = list(Asteroid.objects.order_by('-id').values_list('id', flat=True))
+
+    def test_returns_requested_order_and_missing_ids(self):
+        requested = [self.ids[3], 999999, self.ids[0], self.ids[3], self.ids[7]]
+
+        with self.assertNumQueries(2):
+            data = self.client.get('/asteroides/', {'ids': ','.join(map(str, requested))}).json()
+
+        self.assertEqual([row['id'] for row in data['results']], [self.ids[3], self.ids[0], self.ids[7]])
+        self.assertEqual(data['missing_ids'], [999999])
+        self.assertEqual(data['results'][1], self.client.get(f'/asteroide/{self.ids[0]}/').json())
+
+    def test_post_body_and_repeated_query_parameter(self):
+        expected = self.client.get('/asteroides/', {'ids': f'{self.ids[1]},{self.ids[2]}'}).json()
+
+        self.assertEqual(self.client.post('/asteroides/', {'ids': self.ids[1:3]}, format='json').json(), expected)
+        self.assertEqual(self.client.get(f'/asteroides/?ids={self.ids[1]}&ids={self.ids[2]}').json(), expected)
+
+    @override_settings(ASTEROID_BATCH_MAX_IDS=3)
+    def test_invalid_ids(self):
+        for params in ({}, {'ids': ''}, {'ids': '1,x'}, {'ids': '0'}, {'ids': '1,2,3,4'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get('/asteroides/', params).status_code, 400)
+        self.assertEqual(self.client.post('/asteroides/', {'ids': 5}, format='json').status_code, 400)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user(username='nasa', password='nasa'))
+        seed_days(3, 4)
+
+    def test_ndjson_export(self):
+        with self.settings(EXPORT_CHUNK_SIZE=5):
+            response = self.client.get('/exportar/', {'start_date': '2025-07-02'})
+            lines = b''.join(response.streaming_content).decode().splitlines()
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual(len(rows), 8)
+        self.assertEqual(rows[0]['imported_date'], '2025-07-02')
+        self.assertEqual([row['id'] for row in rows],
+                         list(Asteroid.objects.filter(imported_date__gte=date(2025, 7, 2)).order_by('imported_date', 'id').values_list('id', flat=True)))
+
+    def test_csv_export(self):
+        response = self.client.get('/exportar/', {'output_format': 'csv', 'imported_date': '2025-07-01'})
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0]['imported_date'], '2025-07-01')
+        self.assertEqual(rows[0]['name'], Asteroid.objects.get(pk=rows[0]['id']).name)
+
+    def test_invalid_format(self):
+        self.assertEqual(self.client.get('/exportar/', {'output_format': 'xml'}).status_code, 400)
+
+
+class AsteroidFilterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user(username='nasa', password='nasa'))
+        seed_days(4, 10)
+
+    def ids(self, params):
+        response = self.client.get('/', {'page_size': 1000, **params})
+        self.assertEqual(response.status_code, 200, response.data)
+        return [row['id'] for row in response.data['results']]
+
+    def test_filters_match_queryset(self):
+        expected = (
+            Asteroid.objects
+            .filter(imported_date__range=(date(2025, 7, 2), date(2025, 7, 3)),
+                    relative_velocity_km_per_second__gte=10, absolute_magnitude_h__lte=28)
+            .order_by('-relative_velocity_km_per_second', '-id')
+            .values_list('id', flat=True)
+        )
+        ids = self.ids({'start_date': '2025-07-02', 'end_date': '2025-07-03', 'min_velocity': 10,
+                        'max_magnitude': 28, 'ordering': '-relative_velocity_km_per_second'})
+        self.assertEqual(ids, list(expected))
+
+        hazardous = set(Asteroid.objects.filter(is_potentially_hazardous_asteroid=True).values_list('id', flat=True))
+        self.assertEqual(set(self.ids({'hazardous': 'true'})), hazardous)
+        self.assertFalse(set(self.ids({'hazardous': 'false'})) & hazardous)
+
+    def test_keyset_pages_follow_custom_ordering(self):
+        expected = list(Asteroid.objects.order_by('estimated_diameter_max_meters', 'id').values_list('id', flat=True))
+        ids, url = [], '/?ordering=estimated_diameter_max_meters&page_size=7'
+        while url:
+            data = self.client.get(url).data
+            ids += [row['id'] for row in data['results']]
+            url = data['next']
+        self.assertEqual(ids, expected)
+
+        # Um cursor não pode ser reaproveitado com outra ordenação
+        cursor = self.client.get('/', {'page_size': 7}).data['next'].split('cursor=')[1]
+        self.assertEqual(self.client.get('/', {'cursor': cursor, 'ordering': '-imported_date'}).status_code, 404)
+
+    def test_invalid_filters(self):
+        self.assertEqual(self.client.get('/', {'min_velocity': 'fast'}).status_code, 400)
+        self.assertEqual(self.client.get('/', {'min_velocity': 20, 'max_velocity': 10}).status_code, 400)
+        self.assertEqual(self.client.get('/', {'ordering': 'name'}).status_code, 400)
+
+
+class CloseApproachTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user(username='nasa', password='nasa'))
+
+    def _neo_with_approaches(self):
+        neo = generate_neo(date(2025, 7, 1), 0)
+        first = neo['close_approach_data'][0]
+        neo['close_approach_data'].append({
+            **first,
+            'epoch_date_close_approach': first['epoch_date_close_approach'] + 86_400_000 * 365,
+            'miss_distance': {'kilometers': '12345.5'},
+            'orbiting_body': 'Mars',
+        })
+        return neo
+
+    def test_import_keeps_every_approach(self):
+        neo = self._neo_with_approaches()
+        import_day(date(2025, 7, 1), [neo])
+        import_day(date(2025, 7, 1), [neo])
+
+        asteroid = Asteroid.objects.get()
+        approaches = list(asteroid.close_approaches.order_by('approach_at'))
+        self.assertEqual(len(approaches), 2)
+        self.assertEqual((approaches[1].miss_distance_km, approaches[1].orbiting_body), (12345.5, 'Mars'))
+        self.assertEqual(int(approaches[0].approach_at.timestamp() * 1000),
+                         neo['close_approach_data'][0]['epoch_date_close_approach'])
+
+    def test_detail_includes_approaches(self):
+        import_day(date(2025, 7, 1), [self._neo_with_approaches()])
+        asteroid = Asteroid.objects.get()
+
+        with self.assertNumQueries(2):
+            detail = self.client.get(f'/asteroide/{asteroid.id}/').json()
+        self.assertEqual(len(detail['close_approaches']), 2)
+        self.assertEqual(detail['name'], asteroid.name)
+
+    def test_window_and_distance_filter(self):
+        seed_days(5, 6)
+        approaches = CloseApproach.objects.filter(
+            approach_at__gte='2025-07-02T00:00:00Z', approach_at__lt='2025-07-04T00:00:00Z',
+            miss_distance_km__lt=4e7,
+        ).order_by('approach_at', 'id')
+
+        with self.assertNumQueries(1):
+            data = self.client.get('/aproximacoes/', {
+                'start': '2025-07-02', 'end': '2025-07-04', 'max_distance_km': 4e7, 'page_size': 3,
+            }).json()
+        self.assertEqual(set(data['results'][0]['asteroid']),
+                         {'id', 'neo_reference_id', 'name', 'estimated_diameter_max_meters', 'is_potentially_hazardous_asteroid'})
+        ids = [row['id'] for row in data['results']]
+        url = data['next']
+        while url:
+            data = self.client.get(url).json()
+            ids += [row['id'] for row in data['results']]
+            url = data['next']
+
+        self.assertGreater(len(ids), 3)
+        self.assertEqual(ids, [approach.id for approach in approaches])
+
+    def test_hazardous_filter(self):
+        seed_days(5, 6)
+        NearEarthObject.objects.filter(pk__in=NearEarthObject.objects.order_by('pk')[:2]).update(
+            is_potentially_hazardous_asteroid=True)
+        window = {'start': '2025-07-01', 'end': '2025-07-05', 'page_size': 100}
+        approaches = CloseApproach.objects.filter(approach_at__gte='2025-07-01T00:00:00Z', approach_at__lt='2025-07-05T00:00:00Z')
+
+        for hazardous in (True, False):
+            response = self.client.get('/aproximacoes/', {**window, 'hazardous': str(hazardous).lower()})
+            self.assertEqual(response.status_code, 200)
+            results = response.json()['results']
+            expected = approaches.filter(asteroid__neo__is_potentially_hazardous_asteroid=hazardous).count()
+            self.assertGreater(expected, 0)
+            self.assertEqual(len(results), expected)
+            self.assertTrue(all(row['asteroid']['is_potentially_hazardous_asteroid'] is hazardous for row in results))
+
+    def test_invalid_window(self):
+        self.assertEqual(self.client.get('/aproximacoes/', {'start': '2025-07-02'}).status_code, 400)
+        self.assertEqual(self.client.get('/aproximacoes/', {'start': '2025-07-02', 'end': '2025-07-01'}).status_code, 400)
+
+
+class NearEarthObjectTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user(username='nasa', password='nasa'))
+
+    def test_observations_share_one_object(self):
+        seed_days(3, 4)
+
+        self.assertEqual(NearEarthObject.objects.count(), 4)
+        self.assertEqual(Asteroid.objects.count(), 12)
+        neo = NearEarthObject.objects.get(neo_reference_id=generate_neo(date(2025, 7, 1), 0)['id'])
+        self.assertEqual(sorted(neo.observations.values_list('imported_date', flat=True)),
+                         [date(2025, 7, 1), date(2025, 7, 2), date(2025, 7, 3)])
+
+        row = self.client.get('/', {'fields': ','.join(ASTEROID_FIELDS)}).json()['results'][0]
+        self.assertEqual(list(row), ASTEROID_FIELDS)
+        self.assertEqual(row['name'], NearEarthObject.objects.get(observations=row['id']).name)
+
+
+class NearEarthObjectMigrationTests(TransactionTestCase):
+    """A migração de dados agrupa as linhas antigas por neo_reference_id (ou nome)."""
+    before = [('base', '0010_closeapproach')]
+    after = [('base', '0013_slim_asteroid')]
+
+    def tearDown(self):
+        MigrationExecutor(connection).migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_groups_rows_and_keeps_latest_properties(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        OldAsteroid = executor.loader.project_state(self.before).apps.get_model('base', 'Asteroid')
+        common = dict(estimated_diameter_min_meters=10, estimated_diameter_max_meters=22,
+                      relative_velocity_km_per_second=5, absolute_magnitude_h=20,
+                      is_potentially_hazardous_asteroid=False, is_sentry_object=False)
+        OldAsteroid.objects.bulk_create([
+            OldAsteroid(neo_reference_id='1', name='(2025 A1)', imported_date=date(2025, 7, 1), **common),
+            OldAsteroid(neo_reference_id='1', name='(2025 A1)', imported_date=date(2025, 7, 2),
+                        **{**common, 'is_potentially_hazardous_asteroid': True}),
+            OldAsteroid(neo_reference_id='2', name='(2025 B2)', imported_date=date(2025, 7, 1), **common),
+            OldAsteroid(neo_reference_id=None, name='(1990 C3)', imported_date=date(2025, 7, 1), **common),
+            OldAsteroid(neo_reference_id=None, name='(1990 C3)', imported_date=date(2025, 7, 2), **common),
+        ])
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        apps = executor.loader.project_state(self.after).apps
+        NewObject = apps.get_model('base', 'NearEarthObject')
+        NewAsteroid = apps.get_model('base', 'Asteroid')
+
+        self.assertEqual(NewObject.objects.count(), 3)
+        self.assertEqual(NewAsteroid.objects.count(), 5)
+        first = NewObject.objects.get(neo_reference_id='1')
+        self.assertTrue(first.is_potentially_hazardous_asteroid)
+        self.assertEqual(NewAsteroid.objects.filter(neo=first).count(), 2)
+        self.assertEqual(NewAsteroid.objects.filter(neo__name='(1990 C3)').count(), 2)
+
+    def test_removes_duplicate_legacy_rows(self):
+        # Antes do neo_reference_id, importar o mesmo dia duas vezes repetia as linhas
+        legacy = [('base', '0004_delete_item')]
+        executor = MigrationExecutor(connection)
+        executor.migrate(legacy)
+        OldAsteroid = executor.loader.project_state(legacy).apps.get_model('base', 'Asteroid')
+        common = dict(name='(1990 C3)', imported_date=date(2025, 7, 1), estimated_diameter_min_meters=10,
+                      estimated_diameter_max_meters=22, absolute_magnitude_h=20,
+                      is_potentially_hazardous_asteroid=False, is_sentry_object=False)
+        OldAsteroid.objects.create(relative_velocity_km_per_second=5, **common)
+        OldAsteroid.objects.create(relative_velocity_km_per_second=7, **common)
+        OldAsteroid.objects.create(relative_velocity_km_per_second=9, **{**common, 'imported_date': date(2025, 7, 2)})
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        apps = executor.loader.project_state(self.after).apps
+        NewAsteroid = apps.get_model('base', 'Asteroid')
+        NewStats = apps.get_model('base', 'DailyAsteroidStats')
+
+        # Fica a linha mais recente de cada dia
+        self.assertEqual(
+            list(NewAsteroid.objects.order_by('imported_date').values_list('imported_date', 'relative_velocity_km_per_second')),
+            [(date(2025, 7, 1), 7), (date(2025, 7, 2), 9)],
+        )
+        stats = NewStats.objects.get(imported_date=date(2025, 7, 1))
+        self.assertEqual((stats.asteroid_count, stats.sum_velocity_km_per_second), (1, 7))
+        self.assertEqual(stats.min_velocity_km_per_second, 7)
+        self.assertEqual(NewStats.objects.get(imported_date=date(2025, 7, 2)).asteroid_count, 1)
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        registry.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user(username='nasa', password='nasa'))
+
+    def test_server_timing_header(self):
+        seed_days(1, 3)
+        response = self.client.get('/', {'page_size': 2})
+
+        timing = dict(part.split(';', 1) for part in response['Server-Timing'].split(', '))
+        self.assertEqual(set(timing), {'total', 'app', 'db', 'render'})
+        self.assertIn('desc="1 consultas"', timing['db'])
+
+    def test_metrics_endpoint_exposes_histograms(self):
+        self.client.get('/indicadores/')
+        self.client.get('/indicadores/')
+
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('# TYPE http_request_duration_seconds histogram', body)
+        self.assertIn('http_requests_total{view="api.views.getIndicators",method="GET",status="200"} 2', body)
+        self.assertIn('http_request_duration_seconds_count{view="api.views.getIndicators",method="GET"} 2', body)
+        self.assertIn('http_request_db_queries_bucket{view="api.views.getIndicators",method="GET",le="+Inf"} 2', body)
+
+    @override_settings(SERVER_TIMING_HEADER=False)
+    def test_header_can_be_disabled(self):
+        self.assertFalse(self.client.get('/indicadores/').has_header('Server-Timing'))
+
+
+class JWTUserCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username='nasa', password='nasa')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        seed_days(1, 2)
+        self.client.get('/indicadores/')
+
+    def test_cached_user_skips_database(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/indicadores/').status_code, 200)
+
+    @override_settings(JWT_USER_RESOLUTION='database')
+    def test_database_mode_queries_every_request(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get('/indicadores/').status_code, 200)
+
+    def test_deactivation_invalidates_cache(self):
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.client.get('/indicadores/').status_code, 401)
+
+    def test_password_change_invalidates_cache(self):
+        self.user.set_password('outra')
+        self.user.save()
+
+        # A próxima requisição relê o usuário (com a senha nova) do banco
+        with self.assertNumQueries(1):
+            self.client.get('/indicadores/')
+        with self.assertNumQueries(0):
+            self.client.get('/indicadores/')
+
+    @override_settings(JWT_USER_RESOLUTION='stateless')
+    def test_stateless_mode(self):
+        cache.delete(user_cache_key(self.user.pk))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/indicadores/').status_code, 200)
+
+        response = self.client.post('/importar/', {'start_date': '2025-07-01', 'end_date': '2025-07-01'}, format='json')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(ImportJob.objects.get().requested_by, self.user)
+
+
+class AsyncURLConf:
+    """Rotas da API com as views assíncronas (como sob ASGI)."""
+    urlpatterns = api_urlpatterns(async_views)
+
+
+class AsyncViewsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username='nasa', password='nasa')
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.user)}'}
+        seed_days(3, 5)
+
+    def test_responses_match_sync_views(self):
+        asteroid = Asteroid.objects.order_by('id').first()
+        urls = [
+            '/?page_size=4&ordering=-relative_velocity_km_per_second',
+            '/?hazardous=false&fields=id,name',
+            '/?min_velocity=-1',
+            f'/asteroide/{asteroid.id}/',
+            '/asteroide/999999/',
+            f'/asteroides/?ids={asteroid.id},999999,{asteroid.id + 1}',
+            '/asteroides/?ids=x',
+            '/aproximacoes/?start=2025-07-01&end=2025-07-03&page_size=4',
+            '/indicadores/',
+            '/indicadores/?start_date=2025-07-02&end_date=2025-07-03',
+            '/indicadores/?days=0',
+            '/importar/999/',
+        ]
+        for url in urls:
+            expected = self.client.get(url, **self.auth)
+            with override_settings(ROOT_URLCONF=AsyncURLConf):
+                response = self.client.get(url, **self.auth)
+                # Segue o cursor pelo caminho assíncrono também
+                next_url = response.json().get('next') if response.status_code == 200 else None
+                following = self.client.get(next_url, **self.auth).json() if next_url else None
+            with self.subTest(url=url):
+                self.assertEqual(response.status_code, expected.status_code)
+                self.assertEqual(response.json(), expected.json())
+                if following is not None:
+                    self.assertEqual(following, self.client.get(next_url, **self.auth).json())
+
+    def test_server_timing_phases_match_sync_views(self):
+        def phases(response):
+            return {part.split(';', 1)[0] for part in response['Server-Timing'].split(', ')}
+
+        for url in ['/?page_size=4', '/aproximacoes/?start=2025-07-01&end=2025-07-03', '/indicadores/', '/importar/999/']:
+            expected = phases(self.client.get(url, **self.auth))
+            with override_settings(ROOT_URLCONF=AsyncURLConf):
+                response = self.client.get(url, **self.auth)
+            with self.subTest(url=url):
+                self.assertIn('render', expected)
+                self.assertEqual(phases(response), expected)
+
+    @override_settings(ROOT_URLCONF=AsyncURLConf)
+    def test_authentication_and_methods(self):
+        response = self.client.get('/indicadores/')
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('Bearer', response['WWW-Authenticate'])
+        self.assertEqual(self.client.get('/indicadores/', HTTP_AUTHORIZATION='Bearer x').status_code, 401)
+        self.assertEqual(self.client.post('/indicadores/', **self.auth).status_code, 405)
+
+    @override_settings(ROOT_URLCONF=AsyncURLConf)
+    def test_import_is_enqueued(self):
+        response = self.client.post('/importar/', {'start_date': '2025-07-01', 'end_date': '2025-07-02'},
+                                    content_type='application/json', **self.auth)
+
+        self.assertEqual(response.status_code, 202)
+        job = ImportJob.objects.get(pk=response.json()['job_id'])
+        self.assertEqual((job.days_total, job.requested_by), (2, self.user))
+        invalid = self.client.post('/importar/', {'start_date': '2025-07-02', 'end_date': '2025-07-01'},
+                                   content_type='application/json', **self.auth)
+        self.assertEqual(invalid.status_code, 400)
+
+    def test_batch_post_matches_sync_view(self):
+        body = {'ids': list(Asteroid.objects.order_by('-id').values_list('id', flat=True)[:4])}
+        expected = self.client.post('/asteroides/', body, content_type='application/json', **self.auth).json()
+
+        with override_settings(ROOT_URLCONF=AsyncURLConf):
+            response = self.client.post('/asteroides/', body, content_type='application/json', **self.auth)
+
+        self.assertEqual(response.json(), expected)
+        self.assertEqual(len(expected['results']), 4)
+
+    @override_settings(ROOT_URLCONF=AsyncURLConf)
+    async def test_asgi_handler(self):
+        response = await self.async_client.get('/indicadores/', headers={'Authorization': self.auth['HTTP_AUTHORIZATION']})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total_asteroids'], 15)
+        # As consultas do ORM assíncrono (em outra thread) também são contadas
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertNotIn('"0 consultas"', response['Server-Timing'])
+
+
+class AsyncImportTests(NasaStubMixin, TestCase):
+    def test_matches_sync_import(self):
+        summary = async_to_sync(aimport_range)(date(2025, 7, 1), date(2025, 7, 10), max_workers=2)
+
+        self.assertEqual(len(self.stub.requests), 2)
+        self.assertEqual(summary['nasa_api']['calls'], 2)
+        # De novo, agora pelo cache do feed e pelo caminho síncrono
+        expected = import_range(date(2025, 7, 1), date(2025, 7, 10))
+        for key in ('imported', 'skipped', 'has_errors'):
+            self.assertEqual(summary[key], expected[key])
+        self.assertEqual(summary['inserted'], expected['updated'])
+        self.assertEqual(Asteroid.objects.count(), 30)
+
+    def test_client_retries(self):
+        self.stub.fail_next(1, 429)
+        self.stub.fail_next(1, 502)
+
+        async def fetch():
+            async with AsyncNasaClient() as client:
+                return await client.get_feed(date(2025, 7, 1), date(2025, 7, 1)), client.stats()
+
+        neos, stats = async_to_sync(fetch)()
+        self.assertEqual(len(neos['2025-07-01']), 3)
+        self.assertEqual((stats['calls'], stats['requests'], stats['retries'], stats['failures']), (1, 3, 2, 0))
+
+    @override_settings(NASA_IMPORT_ASYNC=True)
+    def test_worker_uses_async_import(self):
+        self.stub.fail_next(5, 503)
+        enqueue_import(date(2025, 7, 1), date(2025, 7, 3))
+
+        job = process_next_job('test')
+
+        self.assertEqual(job.status, ImportJob.SUCCEEDED)
+        self.assertTrue(job.result['has_errors'])
+        self.assertEqual(job.days_done, 3)
+
+
+class SyncTests(NasaStubMixin, TestCase):
+    neos_per_day = 2
+
+    def sync(self, today, **kwargs):
+        kwargs.setdefault('refresh_days', 3)
+        kwargs.setdefault('start_date', date(2025, 7, 5))
+        return run_cycle(today=today, **kwargs)
+
+    def test_first_cycle_imports_up_to_today_and_sets_watermark(self):
+        summary = self.sync(date(2025, 7, 10))
+
+        self.assertEqual((summary['new_days'], summary['refreshed_days'], summary['gap_days']), (3, 3, 0))
+        self.assertEqual(summary['inserted'], 12)
+        self.assertEqual(get_state().watermark, date(2025, 7, 10))
+        self.assertIsNotNone(get_state().last_success_at)
+        self.assertEqual(Asteroid.objects.aggregate(first=Min('imported_date'))['first'], date(2025, 7, 5))
+
+    def test_next_cycle_fetches_new_days_and_refetches_recent_ones(self):
+        self.sync(date(2025, 7, 10))
+        self.stub.requests.clear()
+
+        summary = self.sync(date(2025, 7, 12))
+
+        # 10 a 12 buscados de novo na NASA, apesar do cache do feed
+        self.assertEqual(len(self.stub.requests), 1)
+        self.assertIn('start_date=2025-07-10', self.stub.requests[0])
+        self.assertEqual((summary['inserted'], summary['updated']), (4, 2))
+        self.assertEqual(get_state().watermark, date(2025, 7, 12))
+
+    def test_missing_dates_are_backfilled_from_the_feed_cache(self):
+        self.sync(date(2025, 7, 10))
+        Asteroid.objects.filter(imported_date=date(2025, 7, 6)).delete()
+        self.stub.requests.clear()
+
+        summary = self.sync(date(2025, 7, 10), refresh_days=1)
+
+        self.assertEqual(summary['gap_days'], 1)
+        self.assertEqual(Asteroid.objects.filter(imported_date=date(2025, 7, 6)).count(), 2)
+        # Só o dia corrente foi à NASA
+        self.assertEqual(len(self.stub.requests), 1)
+        self.assertEqual(missing_days(date(2025, 7, 5), date(2025, 7, 10)), [])
+
+    def test_failed_days_hold_the_watermark(self):
+        self.sync(date(2025, 7, 10))
+        self.stub.httpd.status_code = 503
+
+        summary = self.sync(date(2025, 7, 12))
+
+        self.assertEqual(summary['failed_days'], ['2025-07-10', '2025-07-11', '2025-07-12'])
+        state = get_state()
+        self.assertEqual(state.watermark, date(2025, 7, 10))
+        self.assertIn('2025-07-11', state.last_error)
+
+    def test_stop_request_ends_cycle_between_batches(self):
+        summary = self.sync(date(2025, 7, 10), should_stop=lambda: True)
+
+        self.assertTrue(summary['interrupted'])
+        self.assertIsNone(get_state().watermark)
+        self.assertFalse(Asteroid.objects.exists())
+
+    def test_sync_command_once(self):
+        out = StringIO()
+        start_date = date.today() - timedelta(days=2)
+        call_command('sync_asteroids', '--once', '--start-date', start_date.isoformat(), '--refresh-days', '1', stdout=out)
+
+        self.assertIn('Sincronização encerrada.', out.getvalue())
+        self.assertEqual(get_state().watermark, date.today())
+        self.assertEqual(Asteroid.objects.values('imported_date').distinct().count(), 3)
+
+
+class ReplicaRouterTests(TestCase):
+    def test_without_replica_everything_uses_primary(self):
+        if REPLICA_ALIAS in settings.DATABASES:
+            self.skipTest("Réplica configurada.")
+        cache.clear()
+
+        self.assertEqual(replica_reads(lambda: router.db_for_read(Asteroid))(), DEFAULT_DB_ALIAS)
+        self.assertEqual(router.db_for_write(Asteroid), DEFAULT_DB_ALIAS)
+        pin_primary()
+        self.assertFalse(PrimaryPin.objects.exists())
+
+    def test_reads_outside_marked_views_use_primary(self):
+        self.assertEqual(router.db_for_read(Asteroid), DEFAULT_DB_ALIAS)
+        self.assertEqual(router.db_for_read(get_user_model()), DEFAULT_DB_ALIAS)
+
+    def test_replica_reads_off_in_tests(self):
+        # Sem fixação no primário: com a réplica configurada, este TestCase passa
+        # porque o executor de testes desliga as leituras nela
+        self.assertFalse(primary_pinned())
+        read = replica_reads(lambda: router.db_for_read(Asteroid))
+        self.assertEqual(read(), DEFAULT_DB_ALIAS)
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.create_user(username='nasa', password='nasa'))
+        self.assertEqual(client.get('/indicadores/').status_code, 200)
+
+        with override_settings(DATABASE_REPLICA_READS=True):
+            self.assertEqual(read(), REPLICA_ALIAS if REPLICA_ALIAS in settings.DATABASES else DEFAULT_DB_ALIAS)
+
+
+@skipUnless(REPLICA_ALIAS in settings.DATABASES, "Sem o alias 'replica' em DATABASES.")
+@override_settings(DATABASE_REPLICA_READS=True)
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    Com um alias 'replica' (localmente, com TEST MIRROR apontando para o
+    'default'; as demais classes usam só o 'default'). TransactionTestCase: a
+    réplica usa outra conexão e só vê dados confirmados.
+    """
+    databases = '__all__'
+
+    def setUp(self):
+        seed_days(2, 3)
+        # Descarta a fixação no primário deixada pelas importações acima
+        PrimaryPin.objects.all().delete()
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username='nasa', password='nasa')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def queries(self, request):
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as primary, \
+                CaptureQueriesContext(connections[REPLICA_ALIAS]) as replica:
+            response = request()
+            if response.streaming:
+                b''.join(response.streaming_content)
+        return response, len(primary), len(replica)
+
+    def test_read_views_use_replica(self):
+        asteroid_id = Asteroid.objects.values_list('id', flat=True).first()
+        urls = [
+            '/?page_size=2', '/exportar/?output_format=csv', f'/asteroide/{asteroid_id}/',
+            f'/asteroides/?ids={asteroid_id}', '/aproximacoes/?start=2025-07-01&end=2025-07-02',
+            '/indicadores/', '/indicadores/serie/', '/indicadores/histograma/?field=relative_velocity_km_per_second',
+            '/indicadores/ranking/?metric=velocity',
+        ]
+        for url in urls:
+            response, primary, replica = self.queries(lambda: self.client.get(url))
+            with self.subTest(url=url):
+                self.assertEqual(response.status_code, 200)
+                # Só a leitura da marca PrimaryPin
+                self.assertEqual(primary, 1)
+                self.assertGreater(replica, 0)
+
+    def test_distinct_leaderboard_cursor_in_replica_transaction(self):
+        in_transaction = []
+
+        def record(execute, sql, params, many, context):
+            if 'base_asteroid' in sql:
+                in_transaction.append(context['connection'].in_atomic_block)
+            return execute(sql, params, many, context)
+
+        with connections[REPLICA_ALIAS].execute_wrapper(record):
+            response = self.client.get('/indicadores/ranking/', {'metric': 'velocity', 'distinct': 'true'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(in_transaction, [True])
+
+    def test_async_read_views_use_replica(self):
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.user)}'}
+        with override_settings(ROOT_URLCONF=AsyncURLConf):
+            # Resolve o usuário do token (no primário) e o guarda no cache
+            self.client.get('/importar/999/', **auth)
+            for url in ['/?page_size=2', '/aproximacoes/?start=2025-07-01&end=2025-07-02', '/indicadores/']:
+                response, primary, replica = self.queries(lambda: self.client.get(url, **auth))
+                with self.subTest(url=url):
+                    self.assertEqual(response.status_code, 200)
+                    # Só a leitura da marca PrimaryPin
+                    self.assertEqual(primary, 1)
+                    self.assertGreater(replica, 0)
+
+    def test_reads_pinned_to_primary_after_import(self):
+        self.client.get('/indicadores/')
+        import_day(date(2025, 7, 3), [generate_neo(date(2025, 7, 3), 0)])
+
+        self.assertTrue(primary_pinned())
+        response, primary, replica = self.queries(lambda: self.client.get('/indicadores/'))
+        self.assertEqual(response.json()['total_asteroids'], 7)
+        self.assertEqual(replica, 0)
+        self.assertGreater(primary, 0)
+
+    def test_pin_is_shared_through_primary(self):
+        # A marca não depende do cache (por processo com o LocMemCache)
+        pin_primary()
+        cache.clear()
+        self.assertTrue(primary_pinned())
+        response, primary, replica = self.queries(lambda: self.client.get('/?page_size=2'))
+        self.assertEqual((response.status_code, replica), (200, 0))
+
+        pin_primary(seconds=-1)
+        self.assertFalse(primary_pinned())
+        self.assertGreater(self.queries(lambda: self.client.get('/?page_size=2'))[2], 0)
+
+    def test_writes_and_job_status_use_primary(self):
+        requests = [
+            lambda: self.client.post('/importar/', {'start_date': '2025-07-01', 'end_date': '2025-07-01'},
+                                     format='json'),
+            lambda: self.client.get(f'/importar/{ImportJob.objects.get().pk}/'),
+            lambda: self.client.post('/register/', {'username': 'outro', 'password': 'Senha-forte-123', 'first_name': 'Outro'},
+                                     format='json'),
+        ]
+        for request in requests:
+            response, primary, replica = self.queries(request)
+            with self.subTest(status=response.status_code):
+                self.assertLess(response.status_code, 300)
+                self.assertGreater(primary, 0)
+                self.assertEqual(replica, 0)
+
+
+class AsteroidQueryPlanTests(TestCase):
+    """Os filtros mais comuns devem usar os índices criados para eles."""
+
+    def setUp(self):
+        seed_days(3, 200)
+        # Os índices parciais só compensam se houver alguma linha; o stub quase não gera objetos Sentry
+        NearEarthObject.objects.filter(id__lte=2).update(is_sentry_object=True)
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                # Com poucas linhas o Postgres prefere seq scan; força o uso de índice se houver um aplicável
+                cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('ANALYZE')
+
+    def assertUsesIndex(self, params, index_name):
+        filters = AsteroidFilterSerializer(data=params)
+        filters.is_valid(raise_exception=True)
+        queryset = filters.filter_queryset(Asteroid.objects.all()).order_by(*filters.get_ordering())[:100]
+        self.assertIn(index_name, queryset.explain())
+
+    def test_common_queries_use_indexes(self):
+        self.assertUsesIndex({'start_date': '2025-07-02', 'end_date': '2025-07-03'}, 'asteroid_date_id_idx')
+        self.assertUsesIndex({'hazardous': True}, 'neo_hazardous_idx')
+        self.assertUsesIndex({'sentry': True}, 'neo_sentry_idx')
+        self.assertUsesIndex({'ordering': '-relative_velocity_km_per_second'}, 'asteroid_velocity_idx')
+        self.assertUsesIndex({'min_diameter': 1000, 'ordering': 'estimated_diameter_max_meters'}, 'neo_diameter_idx')
+        self.assertUsesIndex({'ordering': 'absolute_magnitude_h'}, 'neo_magnitude_idx')
+
+    def test_cursor_page_seeks_ordering_index(self):
+        paginator = KeysetPagination()
+        queryset = Asteroid.objects.order_by('imported_date', 'id')
+        last = queryset.values('imported_date', 'id')[300]
+        page = queryset.filter(paginator._after(queryset, [str(last['imported_date']), last['id']], False))[:50]
+
+        # A busca no índice começa na posição do cursor, em vez de filtrar desde o início
+        plan = page.explain()
+        self.assertIn('asteroid_date_id_idx', plan)
+        if connection.vendor == 'postgresql':
+            self.assertIn('Index Cond: (imported_date >=', plan)
+        else:
+            self.assertIn('asteroid_date_id_idx (imported_date>?)', plan)
+
+    def test_leaderboards_use_indexes(self):
+        fastest = Asteroid.objects.order_by('-relative_velocity_km_per_second', '-id')[:20]
+        self.assertIn('asteroid_velocity_idx', fastest.explain())
+        largest = NearEarthObject.objects.order_by('-estimated_diameter_max_meters', '-id')[:20]
+        self.assertIn('neo_diameter_idx', largest.explain())
+        brightest = Asteroid.objects.order_by('absolute_magnitude_h', 'neo_id', 'id')[:20]
+        self.assertIn('neo_magnitude_idx', brightest.explain())
+
+
+class OpenApiSchemaTests(TestCase):
+    def setUp(self):
+        base_views._prebuilt_schemas.clear()
+        self.schema_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.schema_dir)
+
+    def build(self):
+        call_command('build_schema', '--output-dir', self.schema_dir, '--fail-on-warn', stdout=StringIO())
+        return override_settings(OPENAPI_SCHEMA_DIR=self.schema_dir)
+
+    def test_serves_prebuilt_schema_with_cache_headers(self):
+        with self.build():
+            response = self.client.get('/api/schema/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/vnd.oai.openapi')
+        self.assertEqual(response['Cache-Control'], f'public, max-age={settings.OPENAPI_SCHEMA_MAX_AGE}')
+        with open(f'{self.schema_dir}/openapi.yaml', 'rb') as schema_file:
+            self.assertEqual(response.content, schema_file.read())
+
+    def test_json_format(self):
+        with self.build():
+            response = self.client.get('/api/schema/', {'format': 'json'})
+
+        self.assertEqual(response['Content-Type'], 'application/vnd.oai.openapi+json')
+        schema = json.loads(response.content)
+        self.assertIn('/indicadores/serie/', schema['paths'])
+        self.assertIn('jwtAuth', schema['components']['securitySchemes'])
+
+    def test_if_none_match_returns_not_modified(self):
+        with self.build():
+            etag = self.client.get('/api/schema/')['ETag']
+            response = self.client.get('/api/schema/', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_schema_built_after_startup_is_picked_up(self):
+        with override_settings(OPENAPI_SCHEMA_DIR=self.schema_dir):
+            self.assertFalse(self.client.get('/api/schema/').has_header('ETag'))
+            call_command('build_schema', '--output-dir', self.schema_dir, stdout=StringIO())
+            self.assertTrue(self.client.get('/api/schema/').has_header('ETag'))
+
+    def test_generates_schema_without_prebuilt_file(self):
+        with override_settings(OPENAPI_SCHEMA_DIR=self.schema_dir):
+            response = self.client.get('/api/schema/')
+            self.assertEqual(response.status_code, 200)
+            self.assertIn(b'/indicadores/serie/', response.content)
+            self.assertEqual(self.client.get('/api/schema/swagger-ui/').status_code, 200)
+
+    def test_urlconf_skips_heavy_imports(self):
+        # Processo novo: carregar as rotas não importa numpy, o cliente da NASA nem o gerador do esquema
+        script = (
+            "import sys, django; django.setup()\n"
+            "from django.urls import get_resolver; get_resolver().resolve('/')\n"
+            "print(' '.join(sorted(sys.modules)))"
+        )
+        output = subprocess.run(
+            [sys.executable, '-c', script], cwd=settings.BASE_DIR, check=True, capture_output=True, text=True,
+        ).stdout
+        modules = set(output.split())
+        self.assertIn('api.views', modules)
+        for name in ('numpy', 'httpx', 'base.importer', 'base.nasa', 'drf_spectacular.generators'):
+            self.assertNotIn(name, modules)
@@ -1,3 +1,85 @@
-from django.shortcuts import render
+import functools
+import hashlib
+from pathlib import Path
 
-# Create your views here.
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+
+from .metrics import registry
+
+# formato -> (arquivo em OPENAPI_SCHEMA_DIR, content type), como no SpectacularAPIView
+SCHEMA_FILES = {
+    'yaml': ('openapi.yaml', 'application/vnd.oai.openapi'),
+    'json': ('openapi.json', 'application/vnd.oai.openapi+json'),
+}
+
+
+def metrics(request):
+    """Histogramas das requisições deste processo, no formato texto do Prometheus."""
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+# (diretório, formato) -> (conteúdo, ETag, data) dos esquemas já lidos
+_prebuilt_schemas = {}
+
+
+def _prebuilt_schema(schema_dir, name):
+    """
+    (conteúdo, ETag, data) do esquema gerado por build_schema, lido uma vez
+    por processo; None se ainda não existir. Só a leitura bem-sucedida fica
+    guardada: um esquema gerado depois da partida é servido na requisição seguinte.
+    """
+    key = (schema_dir, name)
+    if key not in _prebuilt_schemas:
+        path = Path(schema_dir) / SCHEMA_FILES[name][0]
+        try:
+            body = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        _prebuilt_schemas[key] = body, f'"{hashlib.sha1(body).hexdigest()}"', int(path.stat().st_mtime)
+    return _prebuilt_schemas[key]
+
+
+def _schema_format(request):
+    # ?format=json|openapi-json|yaml|openapi ou o Accept, como no SpectacularAPIView (padrão: YAML)
+    requested = request.GET.get('format') or request.headers.get('Accept', '')
+    return 'json' if 'json' in requested else 'yaml'
+
+
+@functools.cache
+def _spectacular_view(name):
+    # Importadas na primeira requisição: a documentação não pesa na partida dos workers
+    from drf_spectacular import views
+
+    return getattr(views, name).as_view(**({} if name == 'SpectacularAPIView' else {'url_name': 'schema'}))
+
+
+@require_safe
+def schema(request):
+    """Esquema OpenAPI pré-gerado (manage.py build_schema), com cache HTTP; sem o arquivo, gerado na hora."""
+    name = _schema_format(request)
+    prebuilt = _prebuilt_schema(str(settings.OPENAPI_SCHEMA_DIR), name)
+    if prebuilt is None:
+        return _spectacular_view('SpectacularAPIView')(request)
+
+    body, etag, last_modified = prebuilt
+    response = (
+        get_conditional_response(request, etag=etag, last_modified=last_modified)
+        or HttpResponse(body, content_type=SCHEMA_FILES[name][1])
+    )
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = f'public, max-age={settings.OPENAPI_SCHEMA_MAX_AGE}'
+    response['Vary'] = 'Accept'
+    return response
+
+
+def swagger_ui(request):
+    return _spectacular_view('SpectacularSwaggerView')(request)
+
+
+def redoc(request):
+    return _spectacular_view('SpectacularRedocView')(request)
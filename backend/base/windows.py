@@ -0,0 +1,186 @@
+# windows.py
+"""
+Indicadores de um intervalo de datas (GET /indicadores/?start_date=...&end_date=...
+ou ?days=N) e médias móveis por dia (GET /indicadores/serie/).
+
+Os dois saem de somas de prefixo dos agregados diários (DailyAsteroidStats):
+para cada dia do calendário desde o primeiro dia importado, os totais
+acumulados até a véspera (asteroides, perigosos, somas de velocidade e de
+diâmetro e dias com dados). O total de qualquer intervalo é a diferença de
+duas posições da tabela, sem ler os asteroides, e uma série móvel custa duas
+posições por dia, independente do tamanho da janela.
+
+A tabela é montada com uma consulta aos agregados diários e fica no cache sob
+a versão dos indicadores, então é refeita uma vez por importação. Os extremos
+(máximo e mínimo, com o nome) não se decompõem em prefixos e saem dos
+agregados dos dias do intervalo, que a resposta já lista em asteroids_by_date.
+As contagens de objetos únicos também não se decompõem e ficam apenas nos
+indicadores da base inteira.
+"""
+import bisect
+from datetime import date, timedelta
+from itertools import accumulate
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .indicators import _days_queryset, _entry, _extreme, aindicators_version, indicators_version
+
+# campo do DailyAsteroidStats somado nos prefixos
+PREFIX_FIELDS = (
+    'asteroid_count',
+    'hazardous_count',
+    'sum_velocity_km_per_second',
+    'sum_diameter_min_meters',
+    'sum_diameter_max_meters',
+)
+MAX_ROLLING_WINDOW = 365
+MAX_SERIES_DAYS = 3660
+
+
+class PrefixSums:
+    """Somas de prefixo por dia do calendário, a partir das linhas de _days_queryset()."""
+
+    def __init__(self, days):
+        self.days = days
+        self.dates = [day['imported_date'] for day in days]
+        self.first = self.dates[0] if days else None
+        span = (self.dates[-1] - self.first).days + 1 if days else 0
+
+        per_day = {name: [0] * span for name in (*PREFIX_FIELDS, 'days')}
+        for day in days:
+            position = (day['imported_date'] - self.first).days
+            for name in PREFIX_FIELDS:
+                per_day[name][position] = day[name]
+            per_day['days'][position] = 1
+        # prefix[name][i]: soma de `name` nos i primeiros dias do calendário
+        self.prefix = {name: [0, *accumulate(values)] for name, values in per_day.items()}
+
+    def _position(self, day):
+        return min(max((day - self.first).days, 0), len(self.prefix['days']) - 1)
+
+    def totals(self, start, end):
+        """Somas de [start, end] (e 'days', os dias com dados): duas posições de cada prefixo."""
+        if not self.days or start > end:
+            return dict.fromkeys((*PREFIX_FIELDS, 'days'), 0)
+        low, high = self._position(start), self._position(end + timedelta(days=1))
+        return {name: values[high] - values[low] for name, values in self.prefix.items()}
+
+    def days_between(self, start, end):
+        """Agregados dos dias com dados em [start, end]."""
+        return self.days[bisect.bisect_left(self.dates, start):bisect.bisect_right(self.dates, end)]
+
+
+def _prefix_key(version):
+    return f'indicators:prefix:{version}'
+
+
+def get_prefix_sums():
+    key = _prefix_key(indicators_version())
+    prefix = cache.get(key)
+    if prefix is None:
+        prefix = PrefixSums(list(_days_queryset()))
+        cache.set(key, prefix, settings.INDICATORS_CACHE_TIMEOUT)
+    return prefix
+
+
+async def aget_prefix_sums():
+    key = _prefix_key(await aindicators_version())
+    prefix = await cache.aget(key)
+    if prefix is None:
+        prefix = PrefixSums([day async for day in _days_queryset()])
+        await cache.aset(key, prefix, settings.INDICATORS_CACHE_TIMEOUT)
+    return prefix
+
+
+def _averages(totals):
+    count = totals['asteroid_count']
+    if not count:
+        return {'avg_asteroids_per_day': 0, 'avg_velocity_km_per_second': None, 'avg_diameter_meters': None}
+    avg_diameter = (totals['sum_diameter_min_meters'] + totals['sum_diameter_max_meters']) / 2 / count
+    return {
+        'avg_asteroids_per_day': round(count / totals['days'], 2),
+        'avg_velocity_km_per_second': round(totals['sum_velocity_km_per_second'] / count, 2),
+        'avg_diameter_meters': round(avg_diameter, 2),
+    }
+
+
+def window_indicators(prefix, start=None, end=None):
+    """
+    Indicadores de [start, end] (padrão: do primeiro dia importado até hoje),
+    no formato de compute_indicators, sem as contagens de objetos únicos e
+    com o intervalo em 'window'.
+    """
+    start = start or prefix.first or date.today()
+    end = end or date.today()
+    window = {'start_date': start, 'end_date': end}
+    totals = prefix.totals(start, end)
+    if not totals['asteroid_count']:
+        return {
+            'message': "Nenhum asteroide encontrado no intervalo para gerar indicadores.",
+            'window': window,
+            'total_asteroids': 0,
+            'hazardous_asteroids': 0,
+            **_averages(totals),
+        }
+
+    days = prefix.days_between(start, end)
+    return {
+        'window': window,
+        'total_asteroids': totals['asteroid_count'],
+        'hazardous_asteroids': totals['hazardous_count'],
+        **_averages(totals),
+        "max_velocity": _extreme(days, 'max_velocity_km_per_second', 'max_velocity_name', 'velocity_km_s', max),
+        "min_velocity": _extreme(days, 'min_velocity_km_per_second', 'min_velocity_name', 'velocity_km_s', min),
+        "max_estimated_diameter": _extreme(days, 'max_diameter_meters', 'max_diameter_name', 'diameter_meters', max),
+        "min_estimated_diameter": _extreme(days, 'min_diameter_meters', 'min_diameter_name', 'diameter_meters', min),
+        "asteroids_by_date": {
+            day['imported_date'].strftime('%Y-%m-%d'): day['asteroid_count']
+            for day in days
+        },
+    }
+
+
+def rolling_series(prefix, start, end, window):
+    """
+    Um ponto por dia de [start, end]: os asteroides do dia e os totais e
+    médias dos `window` dias terminados nele (inclusive).
+    """
+    points = []
+    for offset in range((end - start).days + 1):
+        day = start + timedelta(days=offset)
+        totals = prefix.totals(day - timedelta(days=window - 1), day)
+        points.append({
+            'date': day,
+            'asteroid_count': prefix.totals(day, day)['asteroid_count'],
+            'total_asteroids': totals['asteroid_count'],
+            'hazardous_asteroids': totals['hazardous_count'],
+            **_averages(totals),
+        })
+    return points
+
+
+def _window_key(version, start, end):
+    return f'indicators:{version}:{start}:{end}'
+
+
+def get_cached_window_indicators(start=None, end=None):
+    """get_cached_indicators para um intervalo: {'data', 'etag', 'last_modified'}."""
+    version = indicators_version()
+    key = _window_key(version, start, end or date.today())
+    entry = cache.get(key)
+    if entry is None:
+        entry = _entry(window_indicators(get_prefix_sums(), start, end))
+        cache.set(key, entry, settings.INDICATORS_CACHE_TIMEOUT)
+    return entry
+
+
+async def aget_cached_window_indicators(start=None, end=None):
+    """get_cached_window_indicators para as views assíncronas."""
+    version = await aindicators_version()
+    key = _window_key(version, start, end or date.today())
+    entry = await cache.aget(key)
+    if entry is None:
+        entry = _entry(window_indicators(await aget_prefix_sums(), start, end))
+        await cache.aset(key, entry, settings.INDICATORS_CACHE_TIMEOUT)
+    return entry
@@ -0,0 +1,6 @@
+"""
+Benchmarks do backend. Rodam contra o banco configurado em backend.settings
+(use um banco de testes/descartável: alguns scripts inserem dados sintéticos).
+
+    python -m benchmarks.export --rows 200000
+"""
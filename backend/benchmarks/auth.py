@@ -0,0 +1,76 @@
+# auth.py
+"""
+Custo da autenticação JWT por modo de resolução do usuário
+(JWT_USER_RESOLUTION: database, cache, stateless).
+
+Cada modo faz requisições com um token Bearer a GET /indicadores/ com o
+payload já em cache, de modo que as consultas restantes são as da
+autenticação: uma por requisição em 'database' e nenhuma em 'cache'
+(após a primeira) e em 'stateless'.
+
+    python -m benchmarks.auth [--requests 500] [--output auth.json]
+"""
+import argparse
+import time
+
+from .common import auth_headers, percentile, seed_synthetic, setup_django, write_results
+
+MODES = ('database', 'cache', 'stateless')
+WARMUP = 10
+
+
+def run_mode(mode, client, requests):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext, override_settings
+
+    latencies = []
+    queries = []
+    with override_settings(JWT_USER_RESOLUTION=mode):
+        for i in range(-WARMUP, requests):
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = client.get('/indicadores/')
+                elapsed = time.perf_counter() - start
+            assert response.status_code == 200, response.status_code
+            if i >= 0:
+                latencies.append(elapsed * 1000)
+                queries.append(len(captured))
+
+    return {
+        'mode': mode,
+        'requests': requests,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50), 3),
+            'p95': round(percentile(latencies, 95), 3),
+            'mean': round(sum(latencies) / len(latencies), 3),
+        },
+        'queries_per_request': round(sum(queries) / len(queries), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=500, help="Requisições medidas por modo.")
+    parser.add_argument('--output', help="Arquivo JSON para gravar os resultados.")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import Client
+
+    from base.models import Asteroid
+
+    if not Asteroid.objects.exists():
+        seed_synthetic(1000)
+
+    client = Client(**auth_headers())
+    results = [run_mode(mode, client, args.requests) for mode in MODES]
+
+    print(f"{'modo':<12}{'p50 (ms)':>10}{'p95 (ms)':>10}{'consultas':>11}")
+    for r in results:
+        print(f"{r['mode']:<12}{r['latency_ms']['p50']:>10}{r['latency_ms']['p95']:>10}{r['queries_per_request']:>11}")
+    if args.output:
+        write_results(args.output, results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+# common.py
+"""Utilitários compartilhados pelos scripts de benchmark."""
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django():
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+    import django
+    from django.test.utils import setup_test_environment
+
+    django.setup()
+    # Libera o host 'testserver' usado pelo django.test.Client
+    setup_test_environment()
+
+
+def peak_rss_mb():
+    """Pico de memória residente do processo atual (MB)."""
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return maxrss / (1024 * 1024) if sys.platform == 'darwin' else maxrss / 1024
+
+
+def auth_headers(username='benchmark'):
+    """Cabeçalho Authorization com um token JWT de um usuário de benchmark."""
+    from django.contrib.auth import get_user_model
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    user, _ = get_user_model().objects.get_or_create(username=username)
+    return {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(user)}'}
+
+
+def seed_synthetic(count, days=365, batch_size=5000, seed=42):
+    """Insere `count` asteroides sintéticos distribuídos pelos últimos `days` dias."""
+    from base.seeding import seed_asteroids
+
+    return seed_asteroids(count, days=days, batch_size=batch_size, seed=seed)
+
+
+def percentile(samples, q):
+    """Percentil `q` (0-100) por interpolação linear entre as amostras ordenadas."""
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    position = (len(ordered) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def git_revision():
+    """Commit atual do repositório (ou None fora de um checkout git)."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR, check=True, capture_output=True, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_isolated(module, *args):
+    """
+    Executa `python -m module args...` em um processo novo e devolve o JSON
+    impresso na última linha (medidas de memória não se misturam entre casos).
+    """
+    output = subprocess.run(
+        [sys.executable, '-m', module, *args],
+        cwd=BACKEND_DIR, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def write_results(path, results):
+    Path(path).write_text(json.dumps(results, indent=2, default=str))
+
+
+def free_port():
+    """Porta TCP livre em 127.0.0.1, para os servidores iniciados pelos benchmarks."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
@@ -0,0 +1,146 @@
+# concurrency.py
+"""
+Teste de carga: WSGI (gunicorn, workers síncronos com threads) contra ASGI
+(uvicorn, views assíncronas) com o mesmo número de processos.
+
+Para cada servidor e cada nível de concorrência, `C` clientes fazem
+requisições sem pausa durante `--duration` segundos, alternando entre
+GET /, GET /indicadores/ e GET /asteroide/{id}/. Mede a vazão, os percentis
+de latência e os erros (5xx, timeouts e conexões recusadas), o que mostra a
+partir de que concorrência cada modo passa a enfileirar ou recusar.
+
+    python -m benchmarks.concurrency [--workers 1] [--threads 4] [--concurrency 1 8 32 128] [--duration 10] [--output concorrencia.json]
+
+Os servidores usam o mesmo DJANGO_SETTINGS_MODULE (e o mesmo banco) deste processo.
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from .common import BACKEND_DIR, auth_headers, free_port, git_revision, percentile, seed_synthetic, setup_django, write_results
+
+TIMEOUT = 30.0
+
+
+def server_command(mode, port, workers, threads):
+    if mode == 'wsgi':
+        return [sys.executable, '-m', 'gunicorn', 'backend.wsgi', f'--bind=127.0.0.1:{port}',
+                f'--workers={workers}', f'--threads={threads}', '--log-level=warning']
+    return [sys.executable, '-m', 'uvicorn', 'backend.asgi:application', '--host=127.0.0.1', f'--port={port}',
+            f'--workers={workers}', '--log-level=warning']
+
+
+def start_server(mode, workers, threads, headers):
+    import httpx
+
+    port = free_port()
+    env = {**os.environ, 'SERVER_TIMING_HEADER': '0', 'DJANGO_ALLOWED_HOSTS': '127.0.0.1,localhost'}
+    process = subprocess.Popen(server_command(mode, port, workers, threads), cwd=BACKEND_DIR, env=env)
+    url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f'{url}/indicadores/', headers=headers, timeout=5).status_code == 200:
+                return process, url
+        except httpx.TransportError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"O servidor {mode} não respondeu em 30 s.")
+
+
+async def load(url, headers, concurrency, duration, id_range):
+    import httpx
+
+    paths = ['/', '/indicadores/', None]
+    latencies = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, headers=headers, timeout=TIMEOUT, limits=limits) as client:
+        deadline = time.monotonic() + duration
+
+        async def user(index):
+            nonlocal errors
+            rng = random.Random(index)
+            while time.monotonic() < deadline:
+                path = paths[rng.randrange(len(paths))] or f'/asteroide/{rng.randint(*id_range)}/'
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    failed = response.status_code >= 500
+                except httpx.HTTPError:
+                    failed = True
+                latencies.append((time.perf_counter() - start) * 1000)
+                errors += failed
+
+        await asyncio.gather(*(user(i) for i in range(concurrency)))
+
+    return {
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / duration, 1),
+        'latency_ms': {q: round(percentile(latencies, int(q[1:])), 1) for q in ('p50', 'p95', 'p99')},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000, help="Garante pelo menos esta quantidade de asteroides no banco.")
+    parser.add_argument('--workers', type=int, default=1, help="Processos de cada servidor.")
+    parser.add_argument('--threads', type=int, default=4, help="Threads por worker do gunicorn (WSGI).")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32, 128])
+    parser.add_argument('--duration', type=float, default=10.0, help="Segundos de carga por nível.")
+    parser.add_argument('--modes', nargs='+', choices=['wsgi', 'asgi'], default=['wsgi', 'asgi'])
+    parser.add_argument('--output', help="Arquivo JSON para gravar os resultados.")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from django.db.models import Max, Min
+
+    from base.models import Asteroid
+
+    missing = args.rows - Asteroid.objects.count()
+    if missing > 0:
+        print(f"Inserindo {missing} asteroides sintéticos...")
+        seed_synthetic(missing, seed=missing)
+    bounds = Asteroid.objects.aggregate(low=Min('id'), high=Max('id'))
+    id_range = (bounds['low'], bounds['high'])
+    headers = {'Authorization': auth_headers()['HTTP_AUTHORIZATION']}
+    connection.close()
+
+    results = []
+    print(f"{'modo':<6}{'concorrência':>13}{'req/s':>9}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}{'erros':>8}")
+    for mode in args.modes:
+        process, url = start_server(mode, args.workers, args.threads, headers)
+        try:
+            for concurrency in args.concurrency:
+                result = {'mode': mode, **asyncio.run(load(url, headers, concurrency, args.duration, id_range))}
+                results.append(result)
+                latency = result['latency_ms']
+                print(f"{mode:<6}{concurrency:>13}{result['throughput_rps']:>9}{latency['p50']:>10}"
+                      f"{latency['p95']:>10}{latency['p99']:>10}{result['errors']:>8}")
+        finally:
+            process.terminate()
+            process.wait()
+
+    if args.output:
+        write_results(args.output, {
+            'revision': git_revision(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'database': connection.vendor,
+            'workers': args.workers,
+            'threads': args.threads,
+            'duration_s': args.duration,
+            'results': results,
+        })
+
+
+if __name__ == '__main__':
+    main()
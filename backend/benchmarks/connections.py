@@ -0,0 +1,112 @@
+# connections.py
+"""
+Conexões persistentes: latência de GET /asteroide/{id}/ (uma consulta curta,
+em que abrir a conexão pesa mais) com CONN_MAX_AGE=0, que abre e fecha uma
+conexão por requisição, e com conexões reaproveitadas entre requisições
+(CONN_MAX_AGE=60, com e sem CONN_HEALTH_CHECKS).
+
+    python -m benchmarks.connections [--requests 500] [--output conexoes.json]
+
+Pelo django.test.Client, que não recicla as conexões: cada requisição é
+seguida de close_old_connections, como no fim de uma requisição no servidor.
+Conta também as conexões abertas em cada caso.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timezone
+
+from .common import auth_headers, git_revision, percentile, seed_synthetic, setup_django, write_results
+
+WARMUP = 10
+CASES = {
+    'sem persistência (CONN_MAX_AGE=0)': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False},
+    'persistente (CONN_MAX_AGE=60)': {'CONN_MAX_AGE': 60, 'CONN_HEALTH_CHECKS': False},
+    'persistente + health checks': {'CONN_MAX_AGE': 60, 'CONN_HEALTH_CHECKS': True},
+}
+
+
+def _request(client, path):
+    from django.db import close_old_connections
+
+    client.get(path)
+    close_old_connections()
+
+
+def run_case(client, options, requests, id_range):
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    for conn in connections.all():
+        conn.close()
+        conn.settings_dict.update(options)
+
+    opened = 0
+
+    def count(**kwargs):
+        nonlocal opened
+        opened += 1
+
+    rng = random.Random(0)
+    connection_created.connect(count)
+    try:
+        for _ in range(WARMUP):
+            _request(client, f'/asteroide/{rng.randint(*id_range)}/')
+        opened = 0
+        latencies = []
+        for _ in range(requests):
+            path = f'/asteroide/{rng.randint(*id_range)}/'
+            start = time.perf_counter()
+            _request(client, path)
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        connection_created.disconnect(count)
+
+    return {
+        'options': options,
+        'requests': requests,
+        'connections_opened': opened,
+        'latency_ms': {q: round(percentile(latencies, int(q[1:])), 2) for q in ('p50', 'p95', 'p99')},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10_000, help="Garante pelo menos esta quantidade de asteroides no banco.")
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--output', help="Arquivo JSON para gravar os resultados.")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from django.db.models import Max, Min
+    from django.test import Client
+
+    from base.models import Asteroid
+
+    missing = args.rows - Asteroid.objects.count()
+    if missing > 0:
+        print(f"Inserindo {missing} asteroides sintéticos...")
+        seed_synthetic(missing, seed=missing)
+    bounds = Asteroid.objects.aggregate(low=Min('id'), high=Max('id'))
+    id_range = (bounds['low'], bounds['high'])
+    client = Client(**auth_headers())
+
+    results = {}
+    print(f"{'caso':<36}{'conexões':>10}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}")
+    for name, options in CASES.items():
+        result = results[name] = run_case(client, options, args.requests, id_range)
+        latency = result['latency_ms']
+        print(f"{name:<36}{result['connections_opened']:>10}{latency['p50']:>10}{latency['p95']:>10}{latency['p99']:>10}")
+
+    if args.output:
+        write_results(args.output, {
+            'revision': git_revision(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'database': connection.vendor,
+            'results': results,
+        })
+
+
+if __name__ == '__main__':
+    main()
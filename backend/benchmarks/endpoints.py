@@ -0,0 +1,216 @@
+# endpoints.py
+"""
+Latência dos endpoints da API, requisição a requisição, pelo django.test.Client
+(pilha completa do Django e do DRF, sem rede).
+
+Para cada caso, após algumas requisições de aquecimento, mede p50/p95/p99 da
+latência, consultas SQL por requisição e vazão (requisições sequenciais por
+segundo). A importação usa o stub local do feed da NASA (base.nasa_stub) e
+inclui a execução do job pelo worker.
+
+    python -m benchmarks.endpoints --rows 100000 [--requests 200] [--output endpoints.json] [--compare anterior.json]
+
+O JSON gravado traz o commit, o banco e a quantidade de linhas, para comparar
+execuções entre commits.
+"""
+import argparse
+import json
+import platform
+import random
+import shutil
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from .common import auth_headers, git_revision, percentile, seed_synthetic, setup_django, write_results
+
+WARMUP = 10
+
+
+def _get_data(client, rng, i):
+    return client.get('/')
+
+
+def _get_data_filtered(client, rng, i):
+    return client.get('/', {'hazardous': 'true', 'min_diameter': 100, 'ordering': '-relative_velocity_km_per_second'})
+
+
+def _get_asteroid_info(client, rng, i, id_range):
+    return client.get(f'/asteroide/{rng.randint(*id_range)}/')
+
+
+def _get_indicators(client, rng, i):
+    from django.core.cache import cache
+
+    # Sem cache: cada requisição recalcula os indicadores
+    cache.clear()
+    return client.get('/indicadores/')
+
+
+def _get_indicators_cached(client, rng, i):
+    return client.get('/indicadores/')
+
+
+def _get_leaderboard(client, rng, i):
+    from django.core.cache import cache
+
+    # Sem cache; alterna a métrica, a direção e o distinct
+    cache.clear()
+    return client.get('/indicadores/ranking/', {
+        'metric': ('velocity', 'diameter', 'magnitude')[i % 3],
+        'order': rng.choice(['desc', 'asc']),
+        'distinct': rng.choice(['true', 'false']),
+        'k': 20,
+    })
+
+
+def _get_indicators_window(client, rng, i):
+    # Um intervalo diferente por requisição (sem o payload no cache); as somas
+    # de prefixo ficam no cache desde a primeira
+    end = date.today() - timedelta(days=rng.randrange(365))
+    start = end - timedelta(days=rng.choice([7, 30, 90, 365]) - 1)
+    return client.get('/indicadores/', {'start_date': start.isoformat(), 'end_date': end.isoformat()})
+
+
+def _get_rolling_series(client, rng, i):
+    return client.get('/indicadores/serie/', {'days': 365, 'window': rng.choice([7, 30, 90])})
+
+
+def _import_data(client, rng, i):
+    from base.jobs import process_next_job
+
+    # Uma semana diferente por requisição, longe das datas dos dados sintéticos
+    start = date(2000, 1, 1) + timedelta(weeks=i)
+    response = client.post('/importar/', {'start_date': start.isoformat(),
+                                          'end_date': (start + timedelta(days=6)).isoformat()},
+                           content_type='application/json')
+    process_next_job('benchmark')
+    return response
+
+
+CASES = {
+    'getData': _get_data,
+    'getData_filtered': _get_data_filtered,
+    'getAsteroidInfo': _get_asteroid_info,
+    'getIndicators': _get_indicators,
+    'getIndicators_cached': _get_indicators_cached,
+    'getLeaderboard': _get_leaderboard,
+    'getIndicators_window': _get_indicators_window,
+    'getRollingSeries': _get_rolling_series,
+    'importData': _import_data,
+}
+
+# A importação é bem mais lenta; roda com uma fração das requisições
+REQUESTS_FACTOR = {'importData': 0.1}
+
+
+def run_case(name, client, requests):
+    from django.db import connection
+    from django.db.models import Max, Min
+    from django.test.utils import CaptureQueriesContext
+
+    from base.models import Asteroid
+
+    rng = random.Random(name)
+    call = CASES[name]
+    if name == 'getAsteroidInfo':
+        bounds = Asteroid.objects.aggregate(low=Min('id'), high=Max('id'))
+        id_range = (bounds['low'] or 0, bounds['high'] or 0)
+        call = lambda client, rng, i: _get_asteroid_info(client, rng, i, id_range)
+
+    latencies = []
+    queries = []
+    errors = 0
+    for i in range(-WARMUP, requests):
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = call(client, rng, i + WARMUP)
+            elapsed = time.perf_counter() - start
+        if i < 0:
+            continue
+        latencies.append(elapsed * 1000)
+        queries.append(len(captured))
+        errors += response.status_code >= 400
+
+    return {
+        'case': name,
+        'requests': requests,
+        'errors': errors,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50), 2),
+            'p95': round(percentile(latencies, 95), 2),
+            'p99': round(percentile(latencies, 99), 2),
+            'mean': round(sum(latencies) / len(latencies), 2),
+            'max': round(max(latencies), 2),
+        },
+        'queries_per_request': round(sum(queries) / len(queries), 2),
+        'throughput_rps': round(len(latencies) / (sum(latencies) / 1000), 1),
+    }
+
+
+def print_results(results, previous=None):
+    before = {r['case']: r for r in (previous or {}).get('results', [])}
+    header = f"{'caso':<22}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}{'consultas':>11}{'req/s':>9}"
+    print(header + ('   p95 antes' if before else ''))
+    for r in results:
+        latency = r['latency_ms']
+        line = (f"{r['case']:<22}{latency['p50']:>10}{latency['p95']:>10}{latency['p99']:>10}"
+                f"{r['queries_per_request']:>11}{r['throughput_rps']:>9}")
+        if r['case'] in before:
+            old = before[r['case']]['latency_ms']['p95']
+            line += f"   {old} ({(latency['p95'] - old) / old * 100:+.0f}%)" if old else f"   {old}"
+        if r['errors']:
+            line += f"   [{r['errors']} erros]"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000, help="Garante pelo menos esta quantidade de asteroides no banco.")
+    parser.add_argument('--requests', type=int, default=200, help="Requisições medidas por caso.")
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES))
+    parser.add_argument('--output', help="Arquivo JSON para gravar os resultados.")
+    parser.add_argument('--compare', help="JSON de uma execução anterior, para comparar o p95.")
+    args = parser.parse_args()
+
+    setup_django()
+    from django import get_version
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import override_settings
+
+    from base.models import Asteroid
+    from base.nasa_stub import NasaStubServer
+
+    missing = args.rows - Asteroid.objects.count()
+    if missing > 0:
+        print(f"Inserindo {missing} asteroides sintéticos...")
+        seed_synthetic(missing, seed=missing)
+
+    client = Client(**auth_headers())
+    feed_cache_dir = tempfile.mkdtemp()
+    results = []
+    with NasaStubServer(neos_per_day=15) as stub, \
+            override_settings(NASA_API_URL=stub.url, NASA_FEED_CACHE_DIR=feed_cache_dir):
+        for name in args.cases:
+            requests = max(int(args.requests * REQUESTS_FACTOR.get(name, 1)), 5)
+            results.append(run_case(name, client, requests))
+    shutil.rmtree(feed_cache_dir, ignore_errors=True)
+
+    previous = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print_results(results, previous)
+    if args.output:
+        write_results(args.output, {
+            'revision': git_revision(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': get_version(),
+            'rows': Asteroid.objects.count(),
+            'results': results,
+        })
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# export.py
+"""
+Compara a exportação em streaming (GET /exportar/) com a montagem da lista
+inteira por AsteroidSerializer(many=True) e com a listagem paginada (GET /).
+
+Para cada caso, em um processo separado, mede o tempo até o primeiro byte,
+o tempo total e o pico de memória (RSS) acima do processo já inicializado.
+
+    python -m benchmarks.export --rows 200000 [--output export.json]
+"""
+import argparse
+import json
+import time
+
+from .common import auth_headers, peak_rss_mb, run_isolated, seed_synthetic, setup_django, write_results
+
+CASES = ['serializer', 'pages', 'ndjson', 'csv']
+
+
+def measure(case):
+    setup_django()
+    from django.test import Client
+    from rest_framework.renderers import JSONRenderer
+
+    from api.serializers import AsteroidSerializer
+    from base.models import Asteroid
+
+    client = Client(**auth_headers())
+    baseline_rss = peak_rss_mb()
+    start = time.perf_counter()
+    first_byte = None
+    total_bytes = 0
+
+    if case == 'serializer':
+        # Comportamento antigo de GET /: a lista inteira em memória antes do primeiro byte
+        body = JSONRenderer().render(AsteroidSerializer(Asteroid.objects.all(), many=True).data)
+        first_byte = time.perf_counter()
+        total_bytes = len(body)
+    elif case == 'pages':
+        url = '/?page_size=1000'
+        while url:
+            response = client.get(url)
+            if first_byte is None:
+                first_byte = time.perf_counter()
+            total_bytes += len(response.content)
+            url = json.loads(response.content)['next']
+    else:
+        response = client.get('/exportar/', {'output_format': case})
+        for chunk in response.streaming_content:
+            if first_byte is None:
+                first_byte = time.perf_counter()
+            total_bytes += len(chunk)
+
+    end = time.perf_counter()
+    return {
+        'case': case,
+        'ttfb_ms': round(((first_byte or end) - start) * 1000, 1),
+        'total_s': round(end - start, 3),
+        'bytes': total_bytes,
+        'peak_rss_delta_mb': round(peak_rss_mb() - baseline_rss, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000, help="Garante pelo menos esta quantidade de asteroides no banco.")
+    parser.add_argument('--output', help="Arquivo JSON para gravar os resultados.")
+    parser.add_argument('--measure', choices=CASES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure)))
+        return
+
+    setup_django()
+    from base.models import Asteroid
+
+    missing = args.rows - Asteroid.objects.count()
+    if missing > 0:
+        print(f"Inserindo {missing} asteroides sintéticos...")
+        seed_synthetic(missing, seed=missing)
+
+    results = [run_isolated('benchmarks.export', '--measure', case) for case in CASES]
+    print(f"{'caso':<12}{'TTFB (ms)':>12}{'total (s)':>12}{'MB':>10}{'pico RSS (MB)':>16}")
+    for r in results:
+        print(f"{r['case']:<12}{r['ttfb_ms']:>12}{r['total_s']:>12}{r['bytes'] / 1e6:>10.1f}{r['peak_rss_delta_mb']:>16}")
+    if args.output:
+        write_results(args.output, {'rows': max(args.rows, Asteroid.objects.count()), 'results': results})
+
+
+if __name__ == '__main__':
+    main()
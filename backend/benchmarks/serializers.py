@@ -0,0 +1,67 @@
+# serializers.py
+"""
+Microbenchmark do caminho de leitura: AsteroidSerializer (ModelSerializer) +
+JSONRenderer do DRF contra AsteroidValuesSerializer (.values()) +
+FastJSONRenderer, medindo linhas por segundo da consulta até os bytes JSON.
+
+    python -m benchmarks.serializers [--sizes 10000 100000] [--repeat 3] [--output serializers.json]
+"""
+import argparse
+import time
+
+from .common import seed_synthetic, setup_django, write_results
+
+
+def _current(queryset):
+    from rest_framework.renderers import JSONRenderer
+
+    from api.serializers import AsteroidSerializer
+
+    return JSONRenderer().render(AsteroidSerializer(queryset, many=True).data)
+
+
+def _fast(queryset):
+    from api.renderers import FastJSONRenderer
+    from api.serializers import AsteroidValuesSerializer
+
+    return FastJSONRenderer().render(AsteroidValuesSerializer(queryset, many=True).data)
+
+
+PATHS = {'current': _current, 'fast': _fast}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=3, help="Repetições por caso; vale o melhor tempo.")
+    parser.add_argument('--output', help="Arquivo JSON para gravar os resultados.")
+    args = parser.parse_args()
+
+    setup_django()
+    from base.models import Asteroid
+
+    missing = max(args.sizes) - Asteroid.objects.count()
+    if missing > 0:
+        print(f"Inserindo {missing} asteroides sintéticos...")
+        seed_synthetic(missing, seed=missing)
+
+    results = []
+    print(f"{'linhas':>8}  {'caminho':<8}{'melhor (s)':>12}{'linhas/s':>12}")
+    for size in args.sizes:
+        queryset = Asteroid.objects.order_by('id')[:size]
+        for name, render in PATHS.items():
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                render(queryset.all())
+                timings.append(time.perf_counter() - start)
+            best = min(timings)
+            results.append({'rows': size, 'path': name, 'best_s': round(best, 4), 'rows_per_s': round(size / best)})
+            print(f"{size:>8}  {name:<8}{best:>12.4f}{size / best:>12.0f}")
+
+    if args.output:
+        write_results(args.output, results)
+
+
+if __name__ == '__main__':
+    main()
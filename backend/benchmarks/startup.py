@@ -0,0 +1,145 @@
+# startup.py
+"""
+Partida a frio de um processo da aplicação, como um worker novo de um
+autoscaling:
+
+- importação: um processo Python novo executa django.setup() e carrega as
+  rotas (ROOT_URLCONF), como na primeira requisição de um worker. Mede o
+  tempo de cada etapa, o tempo total do processo e os módulos carregados;
+- primeira requisição: um servidor novo (gunicorn, 1 worker, ou uvicorn) é
+  iniciado e GET /indicadores/ é repetido até responder 200. Mede o tempo
+  entre iniciar o processo e a primeira resposta e, em seguida, a latência do
+  primeiro GET /api/schema/ nesse processo.
+
+Cada medida é repetida `--runs` vezes e o resultado é a mediana.
+
+    python -m benchmarks.startup [--runs 5] [--modes wsgi asgi] [--output partida.json] [--compare anterior.json]
+
+Os processos usam o mesmo DJANGO_SETTINGS_MODULE (e o mesmo banco) deste processo.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .common import BACKEND_DIR, auth_headers, free_port, git_revision, setup_django, write_results
+from .concurrency import server_command
+
+TIMEOUT = 60.0
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+setup = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().resolve('/')
+urlconf = time.perf_counter()
+print(json.dumps({'setup_ms': (setup - start) * 1000, 'urlconf_ms': (urlconf - setup) * 1000,
+                  'modules': len(sys.modules)}))
+"""
+
+
+def measure_import():
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, '-c', IMPORT_SCRIPT], cwd=BACKEND_DIR, check=True, capture_output=True, text=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result['process_ms'] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def measure_first_request(mode, headers):
+    import httpx
+
+    port = free_port()
+    url = f'http://127.0.0.1:{port}'
+    env = {**os.environ, 'SERVER_TIMING_HEADER': '0', 'DJANGO_ALLOWED_HOSTS': '127.0.0.1,localhost'}
+    start = time.perf_counter()
+    process = subprocess.Popen(server_command(mode, port, 1, 1), cwd=BACKEND_DIR, env=env)
+    try:
+        with httpx.Client(base_url=url, timeout=TIMEOUT) as client:
+            while True:
+                if time.perf_counter() - start > TIMEOUT:
+                    raise RuntimeError(f"O servidor {mode} não respondeu em {TIMEOUT:.0f} s.")
+                try:
+                    if client.get('/indicadores/', headers=headers).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.005)
+            first_request = time.perf_counter() - start
+
+            schema_start = time.perf_counter()
+            response = client.get('/api/schema/')
+            response.raise_for_status()
+            first_schema = time.perf_counter() - schema_start
+    finally:
+        process.terminate()
+        process.wait()
+    return {'first_request_ms': first_request * 1000, 'first_schema_ms': first_schema * 1000}
+
+
+def _median(samples, key):
+    return round(statistics.median(sample[key] for sample in samples), 1)
+
+
+def print_results(results, previous=None):
+    before = (previous or {}).get('results', {})
+    print(f"{'medida':<28}{'mediana':>12}{'anterior':>12}{'variação':>10}")
+    for name, value in results.items():
+        line = f"{name:<28}{value:>12}"
+        if name in before:
+            change = (value - before[name]) / before[name] * 100 if before[name] else 0
+            line += f"{before[name]:>12}{change:>+9.0f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help="Repetições de cada medida.")
+    parser.add_argument('--modes', nargs='+', choices=['wsgi', 'asgi'], default=['wsgi'])
+    parser.add_argument('--output', help="Arquivo JSON para gravar os resultados.")
+    parser.add_argument('--compare', help="JSON de uma execução anterior, para comparar as medianas.")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+
+    headers = {'Authorization': auth_headers()['HTTP_AUTHORIZATION']}
+    connection.close()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    results = {
+        'import.process_ms': _median(imports, 'process_ms'),
+        'import.setup_ms': _median(imports, 'setup_ms'),
+        'import.urlconf_ms': _median(imports, 'urlconf_ms'),
+        'import.modules': _median(imports, 'modules'),
+    }
+    for mode in args.modes:
+        samples = [measure_first_request(mode, headers) for _ in range(args.runs)]
+        results[f'{mode}.first_request_ms'] = _median(samples, 'first_request_ms')
+        results[f'{mode}.first_schema_ms'] = _median(samples, 'first_schema_ms')
+
+    previous = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print_results(results, previous)
+
+    if args.output:
+        write_results(args.output, {
+            'revision': git_revision(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'database': connection.vendor,
+            'runs': args.runs,
+            'results': results,
+        })
+
+
+if __name__ == '__main__':
+    main()
@@ -11,6 +11,8 @@ const Asteroids = ({ accessToken, setCurrentPage, clearFormStates }) => {
   const [detailLoading, setDetailLoading] = useState(false);
   const [detailError, setDetailError] = useState(null);
   const [filterDate, setFilterDate] = useState('');
+  const [nextPageUrl, setNextPageUrl] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const handleGoBack = () => {
     setCurrentPage('dashboard'); // Volta para ashboard
@@ -33,10 +35,11 @@ const Asteroids = ({ accessToken, setCurrentPage, clearFormStates }) => {
     setError(null);
 
     try {
-      let url = 'http://localhost:8000/';
+      // A listagem é paginada; a lista só precisa de id, nome e velocidade
+      let url = 'http://localhost:8000/?fields=id,name,relative_velocity_km_per_second';
 
       if (filterDate) {
-        url = `http://localhost:8000/?imported_date=${filterDate}`;
+        url = `${url}&imported_date=${filterDate}`;
       }
 
       const response = await fetch(url, {
@@ -48,7 +51,8 @@ const Asteroids = ({ accessToken, setCurrentPage, clearFormStates }) => {
         throw new Error(`Erro HTTP: ${response.status}`);
       }
       const data = await response.json();
-      setAsteroids(data);
+      setAsteroids(data.results);
+      setNextPageUrl(data.next);
     } catch (err) {
       setError(err.message);
     } finally {
@@ -60,6 +64,29 @@ const Asteroids = ({ accessToken, setCurrentPage, clearFormStates }) => {
     fetchAsteroids();
   }, [fetchAsteroids]); 
 
+  // Função para carregar a próxima página da listagem
+  const fetchNextPage = async () => {
+    if (!nextPageUrl) return;
+    setLoadingMore(true);
+    try {
+      const response = await fetch(nextPageUrl, {
+        headers: {
+          'Authorization': `Bearer ${accessToken}`
+        }
+      });
+      if (!response.ok) {
+        throw new Error(`Erro HTTP: ${response.status}`);
+      }
+      const data = await response.json();
+      setAsteroids((current) => [...current, ...data.results]);
+      setNextPageUrl(data.next);
+    } catch (err) {
+      setError(err.message);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   // Função para buscar os detalhes de um asteroide específico
   const fetchAsteroidDetails = async (id) => {
     setDetailLoading(true);
@@ -173,6 +200,14 @@ const Asteroids = ({ accessToken, setCurrentPage, clearFormStates }) => {
         )}
       </div>
 
+      {nextPageUrl && (
+        <div className="asteroids-button-container">
+          <button onClick={fetchNextPage} className="details-button" disabled={loadingMore}>
+            {loadingMore ? 'Carregando...' : 'Carregar mais'}
+          </button>
+        </div>
+      )}
+
       {/* Modal de Detalhes do Asteroide */}
       {isModalOpen && (
         <div className="modal-overlay">
@@ -3,6 +3,8 @@ import axios from 'axios';
 import {
   LineChart,
   Line,
+  BarChart,
+  Bar,
   XAxis,
   YAxis,
   CartesianGrid,
@@ -12,8 +14,13 @@ import {
 } from 'recharts';
 import './Dashboard.css';
 
+// Acompanhamento do job de importação: uma consulta a cada 2 s, por até 10 minutos
+const IMPORT_POLL_INTERVAL_MS = 2000;
+const IMPORT_POLL_MAX_ATTEMPTS = 300;
+
 function Dashboard({ accessToken, setCurrentPage, clearFormStates }) {
   const [indicadoresData, setIndicadoresData] = useState(null);
+  const [velocityHistogram, setVelocityHistogram] = useState(null);
   const [dashboardMessage, setDashboardMessage] = useState('Carregando dados...');
   const [loadingData, setLoadingData] = useState(true);
   const [showDatePopup, setShowDatePopup] = useState(false);
@@ -30,12 +37,28 @@ function Dashboard({ accessToken, setCurrentPage, clearFormStates }) {
     setSelectedDate("");
   };
 
+  // Aguarda o worker terminar o job de importação (no máximo IMPORT_POLL_MAX_ATTEMPTS consultas)
+  const waitForImportJob = async (jobId) => {
+    for (let attempt = 0; attempt < IMPORT_POLL_MAX_ATTEMPTS; attempt++) {
+      const response = await axios.get(`http://localhost:8000/importar/${jobId}/`, {
+        headers: {
+          Authorization: `Bearer ${accessToken}`
+        }
+      });
+      if (response.data.status === 'succeeded' || response.data.status === 'failed') {
+        return response.data;
+      }
+      await new Promise((resolve) => setTimeout(resolve, IMPORT_POLL_INTERVAL_MS));
+    }
+    throw new Error(`A importação ${jobId} não terminou a tempo.`);
+  };
+
   // Função para enviar a data
   const handleConfirmDate = async () => {
     if (!selectedDate) return alert("Por favor, selecione uma data.");
 
     try {
-      await axios.post("http://localhost:8000/importar/", 
+      const response = await axios.post("http://localhost:8000/importar/", 
         {import_date: selectedDate},
         {
           headers: {
@@ -47,8 +70,15 @@ function Dashboard({ accessToken, setCurrentPage, clearFormStates }) {
       alert("Data enviada com sucesso!");
       handleClosePopup();
 
-      // Recarrega os dados depois do POST
+      // Recarrega os dados quando a importação terminar
       setLoadingData(true);
+      setDashboardMessage('Importando dados...');
+      try {
+        await waitForImportJob(response.data.job_id);
+      } catch (error) {
+        console.error("Erro ao acompanhar a importação:", error);
+        alert("A importação ainda não terminou. Os dados serão atualizados na próxima consulta.");
+      }
       await fetchIndicadores();
     } catch (error) {
       console.error("Erro ao enviar a data:", error);
@@ -71,6 +101,15 @@ function Dashboard({ accessToken, setCurrentPage, clearFormStates }) {
       });
       setIndicadoresData(response.data);
       setDashboardMessage('Dados carregados com sucesso!');
+
+      // Distribuição de velocidades: o backend devolve só as faixas
+      const histogram = await axios.get('http://localhost:8000/indicadores/histograma/', {
+        params: { field: 'relative_velocity_km_per_second', bins: 20 },
+        headers: {
+          Authorization: `Bearer ${accessToken}`
+        }
+      });
+      setVelocityHistogram(histogram.data);
     } catch (error) {
       console.error("Erro ao buscar indicadores:", error);
       setDashboardMessage('Erro ao carregar os indicadores. Verifique sua conexão ou token.');
@@ -100,6 +139,12 @@ function Dashboard({ accessToken, setCurrentPage, clearFormStates }) {
       count
     })) : [];
 
+  const velocityHistogramChartData = velocityHistogram?.buckets ?
+    velocityHistogram.buckets.map((bucket) => ({
+      range: `${bucket.lower.toFixed(1)}–${bucket.upper.toFixed(1)}`,
+      count: bucket.count
+    })) : [];
+
   return (
     <div className="dashboard-container"> {/* Container principal para o dashboard */}
       <h1 className="dashboard-title">Dashboard de Indicadores</h1>
@@ -171,6 +216,26 @@ function Dashboard({ accessToken, setCurrentPage, clearFormStates }) {
                     <p>Nenhum dado de asteroide por data para exibir o gráfico.</p>
                   )}
                 </div>
+
+                <div className="chart-panel">
+                  <h2>Distribuição de Velocidades (km/s)</h2>
+                  {velocityHistogramChartData.length > 0 ? (
+                    <ResponsiveContainer width="100%" height={300}>
+                      <BarChart data={velocityHistogramChartData} margin={{ top: 5, right: 30, left: 20, bottom: 5 }}>
+                        <CartesianGrid strokeDasharray="3 3" stroke="#e0e0e0" />
+                        <XAxis dataKey="range" stroke="#333" />
+                        <YAxis stroke="#333" />
+                        <Tooltip
+                          contentStyle={{ backgroundColor: '#fff', border: '1px solid #ccc', borderRadius: '5px' }}
+                          labelStyle={{ color: '#555' }}
+                        />
+                        <Bar dataKey="count" fill="#8884d8" name="Número de Asteroides" />
+                      </BarChart>
+                    </ResponsiveContainer>
+                  ) : (
+                    <p>Nenhum dado de velocidade para exibir o gráfico.</p>
+                  )}
+                </div>
               </>
             ) : (
               // Mensagem de erro se não houver dados e não estiver carregando